@@ -1,6 +1,7 @@
-from app import create_app
+from app import create_app, start_background_services
 
 app = create_app()
+start_background_services(app)
  
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
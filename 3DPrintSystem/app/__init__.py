@@ -2,9 +2,11 @@ from flask import Flask, redirect, url_for
 import os
 from .config import Config
 from .extensions import db, migrate
-from .models import Job, Event
+from .models import Job, Event, DashboardWatermark, IdCounter, ArchivedJob, QueuedTask, DeadLetterTask, TaskLock
 from .routes.dashboard import bp as dashboard_bp
 from .routes.main import bp as main_bp
+from .routes.uploads import bp as uploads_bp
+from .services.upload_service import StreamingUploadRequest
 from .utils.helpers import (
     format_printer_name, 
     format_color_name, 
@@ -15,6 +17,8 @@ from .utils.helpers import (
 
 def create_app():
     app = Flask(__name__)
+    # Stream multipart uploads straight to disk, hashing and size-checking as they arrive
+    app.request_class = StreamingUploadRequest
     
     # Validate configuration before proceeding
     Config.validate_required_config()
@@ -29,6 +33,7 @@ def create_app():
         os.path.join(app.config['APP_STORAGE_ROOT'], 'Printing'),
         os.path.join(app.config['APP_STORAGE_ROOT'], 'Completed'),
         os.path.join(app.config['APP_STORAGE_ROOT'], 'PaidPickedUp'),
+        os.path.join(app.config['APP_STORAGE_ROOT'], 'Archive'),
         os.path.join(app.config['APP_STORAGE_ROOT'], 'thumbnails')
     ]
     
@@ -39,6 +44,13 @@ def create_app():
     db.init_app(app)
     migrate.init_app(app, db)
 
+    # Size the dashboard read cache from config
+    from .services.cache_service import dashboard_cache
+    dashboard_cache.configure(
+        max_entries=app.config['DASHBOARD_CACHE_MAX_ENTRIES'],
+        ttl_seconds=app.config['DASHBOARD_CACHE_TTL_SECONDS']
+    )
+
     # Register template filters (CRITICAL for display formatting)
     app.jinja_env.filters['printer_name'] = format_printer_name
     app.jinja_env.filters['color_name'] = format_color_name  
@@ -49,6 +61,7 @@ def create_app():
     # Register blueprints
     app.register_blueprint(dashboard_bp)
     app.register_blueprint(main_bp)
+    app.register_blueprint(uploads_bp)
 
     # Ensure secret key is set for sessions
     if not app.secret_key:
@@ -66,6 +79,17 @@ def create_app():
         from flask import render_template
         return render_template('errors/404.html'), 404
 
+    @app.errorhandler(413)
+    def too_large_error(error):
+        """Handle uploads over the size limit"""
+        from flask import render_template
+        return render_template(
+            'errors/generic.html',
+            error_code=413,
+            error_title='File Too Large',
+            error_message=error.description
+        ), 413
+
     @app.errorhandler(500)
     def internal_error(error):
         """Handle 500 errors with custom template"""
@@ -73,4 +97,27 @@ def create_app():
         db.session.rollback()
         return render_template('errors/500.html'), 500
 
-    return app 
\ No newline at end of file
+    return app
+
+def start_background_services(app):
+    """
+    Startup work for the server process only (see app.py)
+
+    CLI scripts and task workers run next to a live server and share its
+    storage, so create_app() leaves this out.
+    """
+    # Finish or undo status-directory moves interrupted by a crash
+    from .services.move_journal import recover_moves
+    with app.app_context():
+        try:
+            recover_moves(min_age_seconds=app.config['MOVE_RECOVERY_MIN_AGE_SECONDS'])
+        except Exception as e:
+            app.logger.error(f"Could not recover interrupted file moves: {str(e)}")
+
+    # Compress old picked-up and rejected files in the background (if scheduled)
+    from .services.archive_service import archiver
+    archiver.start(app)
+
+    # Apply retention rules on a schedule (if any are configured)
+    from .services.retention_service import retention_scheduler
+    retention_scheduler.start(app)
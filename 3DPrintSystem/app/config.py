@@ -19,7 +19,60 @@ class Config:
     # File Storage Configuration
     APP_STORAGE_ROOT = os.environ.get('STORAGE_PATH', 'storage')
     UPLOAD_FOLDER = os.path.join(APP_STORAGE_ROOT, 'Uploaded')
-    MAX_CONTENT_LENGTH = 100 * 1024 * 1024  # 100MB max file size
+    MAX_UPLOAD_FILE_BYTES = int(os.environ.get('MAX_UPLOAD_FILE_BYTES', 100 * 1024 * 1024))  # 100MB max file size
+    MAX_CONTENT_LENGTH = MAX_UPLOAD_FILE_BYTES + 1024 * 1024  # File plus room for the form fields
+    
+    # Resumable Uploads (staged under APP_STORAGE_ROOT/.incoming/resumable)
+    RESUMABLE_CHUNK_SIZE = int(os.environ.get('RESUMABLE_CHUNK_SIZE', 8 * 1024 * 1024))  # Suggested to clients
+    RESUMABLE_UPLOAD_TTL_HOURS = int(os.environ.get('RESUMABLE_UPLOAD_TTL_HOURS', 24))
+    
+    # Layout inside each status folder: 'flat', 'hash' (256 shards by file name) or
+    # 'date' (year/month of submission). Run reshard_storage.py after changing it
+    STORAGE_LAYOUT = os.environ.get('STORAGE_LAYOUT', 'flat')
+    
+    # Journaled file moves: the server settles interrupted moves at startup, skipping
+    # entries younger than this so it never undoes a live move by a worker or script
+    MOVE_RECOVERY_MIN_AGE_SECONDS = int(os.environ.get('MOVE_RECOVERY_MIN_AGE_SECONDS', 300))
+    
+    # Background file moves on status changes (0 moves inline right after the commit)
+    FILE_MOVE_WORKERS = int(os.environ.get('FILE_MOVE_WORKERS', 4))
+    
+    # Job metadata on disk: 'manifest' (per-folder manifest rewritten in the
+    # background), 'sidecar' (legacy .metadata.json per upload) or 'off'
+    METADATA_EXPORT = os.environ.get('METADATA_EXPORT', 'manifest')
+    METADATA_EXPORT_INTERVAL_SECONDS = int(os.environ.get('METADATA_EXPORT_INTERVAL_SECONDS', 60))
+    
+    # Archive tier: picked-up and rejected jobs untouched for ARCHIVE_AFTER_DAYS are
+    # compressed ('lzma', or 'zstd' with the zstandard package) in a process pool
+    # sharing the I/O budget. A non-zero interval runs passes in the server process
+    # only; 0 leaves them to archive_storage.py (cron)
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 90))
+    ARCHIVE_CODEC = os.environ.get('ARCHIVE_CODEC', 'lzma')
+    ARCHIVE_WORKERS = int(os.environ.get('ARCHIVE_WORKERS', 2))
+    ARCHIVE_IO_BYTES_PER_SECOND = int(os.environ.get('ARCHIVE_IO_BYTES_PER_SECOND', 20 * 1024 * 1024))
+    ARCHIVE_INTERVAL_SECONDS = int(os.environ.get('ARCHIVE_INTERVAL_SECONDS', 0))
+    
+    # Retention: comma-separated STATUS:action:days rules, where action is purge_files
+    # (delete files, keep the row) or archive_rows (snapshot into job_archive, then
+    # delete the job, its events and files), e.g.
+    # "REJECTED:purge_files:60,PAIDPICKEDUP:archive_rows:365". Empty disables retention.
+    # Scheduled runs happen in the server process only; apply_retention.py runs one now
+    RETENTION_RULES = os.environ.get('RETENTION_RULES', '')
+    RETENTION_INTERVAL_SECONDS = int(os.environ.get('RETENTION_INTERVAL_SECONDS', 24 * 3600))
+    RETENTION_BATCH_SIZE = int(os.environ.get('RETENTION_BATCH_SIZE', 500))
+    
+    # Upload file IDs: each process reserves this many IDs per database round trip
+    FILE_ID_BLOCK_SIZE = int(os.environ.get('FILE_ID_BLOCK_SIZE', 20))
+    
+    # Thumbnail Rendering (process pool; 0 workers disables rendering)
+    THUMBNAIL_WORKERS = int(os.environ.get('THUMBNAIL_WORKERS', 2))
+    THUMBNAIL_SIZE = int(os.environ.get('THUMBNAIL_SIZE', 256))
+    
+    # Printability Checks (thread pool shared by submissions)
+    PRINTABILITY_WORKERS = int(os.environ.get('PRINTABILITY_WORKERS', 4))
+    PRINTABILITY_TIMEOUT_SECONDS = float(os.environ.get('PRINTABILITY_TIMEOUT_SECONDS', 10))
+    # Larger models only get the build-volume check, keeping submissions fast
+    PRINTABILITY_MAX_TRIANGLES = int(os.environ.get('PRINTABILITY_MAX_TRIANGLES', 1_000_000))
     
     # Email Configuration
     MAIL_SERVER = os.environ.get('MAIL_SERVER')
@@ -32,6 +85,22 @@ class Config:
     # Application Configuration
     BASE_URL = os.environ.get('BASE_URL', 'http://localhost:5000')
     
+    # Dashboard Job Listing
+    DASHBOARD_PAGE_SIZE = int(os.environ.get('DASHBOARD_PAGE_SIZE', 50))
+    # Delta sync re-scans this far behind a client's cursor to catch late commits
+    DELTA_SYNC_OVERLAP_SECONDS = int(os.environ.get('DELTA_SYNC_OVERLAP_SECONDS', 30))
+    
+    # Dashboard Read Cache (per process; invalidated on job writes)
+    DASHBOARD_CACHE_TTL_SECONDS = int(os.environ.get('DASHBOARD_CACHE_TTL_SECONDS', 10))
+    DASHBOARD_CACHE_MAX_ENTRIES = int(os.environ.get('DASHBOARD_CACHE_MAX_ENTRIES', 256))
+    
+    # Dashboard Live Updates (Server-Sent Events)
+    SSE_KEEPALIVE_SECONDS = int(os.environ.get('SSE_KEEPALIVE_SECONDS', 15))
+    SSE_MAX_STREAM_SECONDS = int(os.environ.get('SSE_MAX_STREAM_SECONDS', 300))
+    # Each open stream holds one server thread; keep this well under waitress's
+    # --threads (default 4) so submissions are always served. Extra tabs poll instead.
+    SSE_MAX_SUBSCRIBERS = int(os.environ.get('SSE_MAX_SUBSCRIBERS', 2))
+    
     # Staff Authentication
     STAFF_PASSWORD = os.environ.get('STAFF_PASSWORD')
     if not STAFF_PASSWORD:
@@ -41,6 +110,17 @@ class Config:
     CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL')
     CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND')
     
+    # Background work (file moves, manifests, thumbnails): 'inline' runs it in
+    # in-process pools, 'database' queues it in the app database for task_worker.py,
+    # 'celery' sends it to CELERY_BROKER_URL (the default when a broker is set)
+    TASK_QUEUE_BACKEND = os.environ.get('TASK_QUEUE_BACKEND', 'celery' if CELERY_BROKER_URL else 'inline')
+    TASK_WORKER_CONCURRENCY = int(os.environ.get('TASK_WORKER_CONCURRENCY', 4))
+    TASK_POLL_INTERVAL_SECONDS = float(os.environ.get('TASK_POLL_INTERVAL_SECONDS', 1))
+    TASK_MAX_ATTEMPTS = int(os.environ.get('TASK_MAX_ATTEMPTS', 5))
+    TASK_RETRY_BASE_SECONDS = float(os.environ.get('TASK_RETRY_BASE_SECONDS', 10))  # Doubles per failed attempt
+    TASK_RETRY_MAX_SECONDS = float(os.environ.get('TASK_RETRY_MAX_SECONDS', 3600))
+    TASK_LOCK_TIMEOUT_SECONDS = int(os.environ.get('TASK_LOCK_TIMEOUT_SECONDS', 600))  # Then a lost worker's task is requeued
+    
     @classmethod
     def validate_required_config(cls):
         """Validate that all required configuration is present"""
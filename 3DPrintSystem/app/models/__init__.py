@@ -1,2 +1,6 @@
 from .job import Job
-from .event import Event 
\ No newline at end of file
+from .event import Event
+from .watermark import DashboardWatermark
+from .id_counter import IdCounter
+from .archived_job import ArchivedJob
+from .task import QueuedTask, DeadLetterTask, TaskLock
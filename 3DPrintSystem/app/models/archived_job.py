@@ -0,0 +1,19 @@
+from datetime import datetime
+from app.extensions import db
+
+class ArchivedJob(db.Model):
+    """Snapshot of a job (and its events) removed from the live tables by a retention rule"""
+    __tablename__ = 'job_archive'
+
+    id = db.Column(db.String, primary_key=True)  # The archived job's id
+    status = db.Column(db.String(50))
+    student_email = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime)  # When the job was submitted
+    updated_at = db.Column(db.DateTime)  # The job's last change before archiving
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+    data = db.Column(db.JSON, nullable=False)  # Every job column plus its event history
+
+    __table_args__ = (
+        db.Index('ix_job_archive_archived_at', archived_at),
+        db.Index('ix_job_archive_student_email_lower', db.func.lower(student_email)),
+    )
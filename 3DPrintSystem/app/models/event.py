@@ -7,4 +7,9 @@ class Event(db.Model):
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     event_type = db.Column(db.String(50)) # e.g., 'JobCreated', 'StaffApproved', 'EmailSent'
     details = db.Column(db.JSON, nullable=True) # Contextual info
-    triggered_by = db.Column(db.String(50)) # 'student', 'staff', 'system' 
\ No newline at end of file
+    triggered_by = db.Column(db.String(50)) # 'student', 'staff', 'system'
+
+    __table_args__ = (
+        # Per-job event history in chronological order
+        db.Index('ix_event_job_id_timestamp', job_id, timestamp),
+    )
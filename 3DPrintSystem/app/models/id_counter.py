@@ -0,0 +1,8 @@
+from app.extensions import db
+
+class IdCounter(db.Model):
+    """Named monotonic counters; processes reserve blocks of values with one atomic UPDATE"""
+    __tablename__ = 'id_counter'
+
+    name = db.Column(db.String(50), primary_key=True)
+    next_value = db.Column(db.BigInteger, nullable=False)  # First value not yet handed out
@@ -11,6 +11,8 @@ class Job(db.Model):
     display_name = db.Column(db.String(256))  # Standardized name used in dashboard and filenames
     file_path = db.Column(db.String(512))         # Path to authoritative file
     metadata_path = db.Column(db.String(512))     # Path to metadata.json
+    content_hash = db.Column(db.String(64), nullable=True)  # SHA-256 of the model file; key into the blob store
+    mesh_analysis = db.Column(db.JSON, nullable=True)  # Volume, area, bounding box, triangle count, weight estimates
     status = db.Column(db.String(50))
     printer = db.Column(db.String(64))
     color = db.Column(db.String(32))
@@ -29,4 +31,21 @@ class Job(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_updated_by = db.Column(db.String(50), nullable=True)
     notes = db.Column(db.Text, nullable=True)  # Staff/internal notes for this job
-    events = db.relationship('Event', backref='job', lazy=True) # Relationship to Event 
\ No newline at end of file
+    events = db.relationship('Event', backref='job', lazy=True) # Relationship to Event
+
+    __table_args__ = (
+        # Dashboard tabs: filter by status, newest first (keyset on created_at, id)
+        db.Index('ix_job_status_created_at', status, created_at.desc(), id.desc()),
+        # Unreviewed uploads: partial index stays tiny as jobs get reviewed
+        db.Index('ix_job_unreviewed_status', status,
+                 postgresql_where=staff_viewed_at.is_(None),
+                 sqlite_where=staff_viewed_at.is_(None)),
+        # Change tracking: delta sync cursor, ETag version stamp
+        db.Index('ix_job_updated_at', updated_at, id),
+        # Case-insensitive lookups by student email
+        db.Index('ix_job_student_email_lower', db.func.lower(student_email)),
+        # Identical-file lookups
+        db.Index('ix_job_content_hash', content_hash),
+        # Storage reconciliation: match files on disk to jobs by filename
+        db.Index('ix_job_display_name', display_name),
+    )
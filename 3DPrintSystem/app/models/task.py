@@ -0,0 +1,52 @@
+from datetime import datetime
+from app.extensions import db
+
+class QueuedTask(db.Model):
+    """A unit of background work waiting for (or held by) a task worker"""
+    __tablename__ = 'task_queue'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)  # Registered task name, e.g. 'storage.settle_job_file'
+    payload = db.Column(db.JSON, nullable=True)  # Keyword arguments for the task
+    priority = db.Column(db.Integer, nullable=False, default=0)  # Higher runs first
+    status = db.Column(db.String(20), nullable=False, default='queued')  # 'queued' or 'running'
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # Not claimed before this (retry backoff)
+    dedupe_key = db.Column(db.String(200), nullable=True)  # At most one queued task per key
+    locked_by = db.Column(db.String(100), nullable=True)  # Worker running it
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Claims: runnable queued tasks, highest priority first, oldest first
+        db.Index('ix_task_queue_claim', status, priority.desc(), run_at, id),
+        db.Index('ix_task_queue_dedupe_key', dedupe_key, status),
+    )
+
+class DeadLetterTask(db.Model):
+    """A task that failed every attempt (or cannot run), kept for inspection and requeueing"""
+    __tablename__ = 'task_dead_letter'
+
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=True)  # Its id in task_queue (None for Celery tasks)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON, nullable=True)
+    priority = db.Column(db.Integer, nullable=False, default=0)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=True)  # When the task was first queued
+    failed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_task_dead_letter_failed_at', failed_at),
+    )
+
+class TaskLock(db.Model):
+    """Named lock rows; SQLite claimers serialize by writing one (it has no SKIP LOCKED)"""
+    __tablename__ = 'task_lock'
+
+    name = db.Column(db.String(50), primary_key=True)
+    holder = db.Column(db.String(100), nullable=True)
+    acquired_at = db.Column(db.DateTime, nullable=True)
@@ -0,0 +1,11 @@
+from datetime import datetime
+from app.extensions import db
+
+class DashboardWatermark(db.Model):
+    """Single-row change counters for the job table, bumped in the same transaction as each job write"""
+    __tablename__ = 'dashboard_watermark'
+
+    id = db.Column(db.Integer, primary_key=True)  # Always 1
+    version = db.Column(db.BigInteger, nullable=False, default=0)  # Incremented on every job insert/update/delete
+    jobs_created = db.Column(db.BigInteger, nullable=False, default=0)  # Monotonic count of job inserts
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)  # Time of the last job write
@@ -1,9 +1,34 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash, current_app, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, current_app, jsonify, Response, g, send_from_directory
 from app.models.job import Job
-from app.models.event import Event
 from app.extensions import db
+from app.services.cache_service import dashboard_cache
+from app.services.event_bus import dashboard_bus, format_sse
+from app.services.job_service import (
+    JobActionError,
+    parse_bulk_request,
+    bulk_approve,
+    bulk_reject,
+    bulk_mark_reviewed,
+    validate_approval,
+    apply_approval,
+    validate_rejection,
+    apply_rejection,
+    apply_review
+)
+from app.services.file_mover import resolve_file_path
+from app.services.listing_service import DEFAULT_PAGE_SIZE, get_job_page, get_identical_jobs, get_printability_results
+from app.services.metadata_export import build_job_metadata, resolve_metadata_path
+from app.services.mesh_service import MeshAnalysisError, analysis_failure, analyze_mesh, suggested_weight
+from app.services.thumbnail_service import THUMBNAIL_DIR_NAME, get_thumbnail_path, thumbnail_worker
+from app.services.serializers import serialize_job_listing
+from app.services.stats_service import get_dashboard_stats, normalize_status
+from app.services.sync_service import decode_cursor, get_job_changes, get_latest_cursor
+from app.services.watermark_service import get_watermark
+import hashlib
 import os
-from datetime import datetime
+import queue
+import re
+import time
 
 bp = Blueprint('dashboard', __name__, url_prefix='/dashboard')
 
@@ -41,26 +66,22 @@ def logout():
 @login_required
 def index():
     """Main dashboard with status parameter routing"""
-    status = request.args.get('status', 'UPLOADED').upper()
-    valid_statuses = ['UPLOADED', 'PENDING', 'READYTOPRINT', 'PRINTING', 'COMPLETED', 'PAIDPICKEDUP', 'REJECTED']
-    
-    if status not in valid_statuses:
-        status = 'UPLOADED'
+    status = normalize_status(request.args.get('status'))
     
     try:
-        # Get jobs for selected status
-        jobs = Job.query.filter_by(status=status).order_by(Job.created_at.desc()).all()
-        
-        # Calculate statistics for all tabs
-        stats = {
-            'uploaded': Job.query.filter_by(status='UPLOADED').count(),
-            'pending': Job.query.filter_by(status='PENDING').count(),
-            'ready': Job.query.filter_by(status='READYTOPRINT').count(),
-            'printing': Job.query.filter_by(status='PRINTING').count(),
-            'completed': Job.query.filter_by(status='COMPLETED').count(),
-            'paidpickedup': Job.query.filter_by(status='PAIDPICKEDUP').count(),
-            'rejected': Job.query.filter_by(status='REJECTED').count()
-        }
+        # Read the watermark before the data so the page never claims to be newer than it is
+        watermark = _current_watermark()
+        
+        # Sync cursor lets the page's auto-update fetch only later changes
+        sync_cursor = dashboard_cache.get_or_load('latest_cursor', get_latest_cursor)
+        
+        # Get the first page of jobs for selected status; the rest load on scroll
+        jobs, next_page_cursor = _cached_job_page(status, None)
+        identical = _cached_identical_jobs(jobs)
+        printability = _cached_printability(jobs)
+        
+        # Calculate statistics for all tabs (single GROUP BY query)
+        stats = dashboard_cache.get_or_load('stats', get_dashboard_stats)
         
         # Tab configuration
         tabs = {
@@ -75,18 +96,79 @@ def index():
         
         return render_template('staff/dashboard/index.html', 
                              jobs=jobs, 
+                             identical=identical,
+                             printability=printability,
                              stats=stats, 
                              current_status=status,
-                             tabs=tabs)
+                             tabs=tabs,
+                             sync_cursor=sync_cursor,
+                             next_page_cursor=next_page_cursor,
+                             watermark=watermark)
                              
     except Exception as e:
         current_app.logger.error(f"Error loading dashboard: {str(e)}")
         # Graceful degradation - return empty state instead of crash
         return render_template('staff/dashboard/index.html', 
                              jobs=[], 
+                             identical={},
+                             printability={},
                              stats={},
                              current_status=status,
-                             tabs={})
+                             tabs={},
+                             sync_cursor=None,
+                             next_page_cursor=None,
+                             watermark=None)
+
+def _current_watermark():
+    """Watermark for this request, read at most once (and usually from cache)"""
+    if 'dashboard_watermark' not in g:
+        g.dashboard_watermark = dashboard_cache.get_or_load('watermark', get_watermark)
+    return g.dashboard_watermark
+
+@bp.before_request
+def reset_request_watermark():
+    """Forget a watermark read by an earlier request sharing this app context"""
+    g.pop('dashboard_watermark', None)
+
+@bp.after_request
+def add_watermark_header(response):
+    """Expose the change watermark on every staff dashboard response"""
+    if session.get('staff_logged_in'):
+        try:
+            response.headers['X-Dashboard-Watermark'] = str(_current_watermark()['version'])
+        except Exception as e:
+            current_app.logger.warning(f"Could not read dashboard watermark: {str(e)}")
+    return response
+
+def _page_size():
+    return current_app.config.get('DASHBOARD_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+
+def _cached_job_page(status, after):
+    limit = _page_size()
+    return dashboard_cache.get_or_load(
+        ('page', status, after, limit),
+        lambda: get_job_page(status, after=after, limit=limit)
+    )
+
+def _cached_identical_jobs(jobs):
+    """Identical-file matches for listed jobs; any job write invalidates them"""
+    return dashboard_cache.get_or_load(
+        ('identical', tuple(job.id for job in jobs)),
+        lambda: get_identical_jobs(jobs)
+    )
+
+def _cached_printability(jobs):
+    """Submission-time printability results for listed jobs"""
+    return dashboard_cache.get_or_load(
+        ('printability', tuple(job.id for job in jobs)),
+        lambda: get_printability_results(jobs)
+    )
+
+def _stats_etag(status, since, after):
+    """ETag for an api_stats response: dataset version plus the request parameters"""
+    version = _current_watermark()['version']
+    stamp = f"{version}:{status}:{since or ''}:{after or ''}"
+    return hashlib.sha1(stamp.encode('utf-8')).hexdigest()
 
 @bp.route('/api/stats')
 @login_required
@@ -94,53 +176,59 @@ def api_stats():
     """Lightweight JSON API endpoint for auto-updating dashboard"""
     try:
         # Get current status parameter for job listing
-        status = request.args.get('status', 'UPLOADED').upper()
-        valid_statuses = ['UPLOADED', 'PENDING', 'READYTOPRINT', 'PRINTING', 'COMPLETED', 'PAIDPICKEDUP', 'REJECTED']
-        
-        if status not in valid_statuses:
-            status = 'UPLOADED'
-        
-        # Calculate statistics for all tabs
-        stats = {
-            'uploaded': Job.query.filter_by(status='UPLOADED').count(),
-            'pending': Job.query.filter_by(status='PENDING').count(),
-            'ready': Job.query.filter_by(status='READYTOPRINT').count(),
-            'printing': Job.query.filter_by(status='PRINTING').count(),
-            'completed': Job.query.filter_by(status='COMPLETED').count(),
-            'paidpickedup': Job.query.filter_by(status='PAIDPICKEDUP').count(),
-            'rejected': Job.query.filter_by(status='REJECTED').count()
-        }
-        
-        # Get jobs for current status with basic information needed for UI updates
-        jobs = Job.query.filter_by(status=status).order_by(Job.created_at.desc()).all()
+        status = normalize_status(request.args.get('status'))
+        
+        # Conditional GET: skip the queries and JSON encoding if nothing changed
+        etag = _stats_etag(status, request.args.get('since'), request.args.get('after'))
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+        
+        # Calculate statistics for all tabs (single GROUP BY query)
+        stats = dashboard_cache.get_or_load('stats', get_dashboard_stats)
+        
+        # Incremental sync: only send jobs changed since the client's cursor
+        since = decode_cursor(request.args.get('since'))
+        after = decode_cursor(request.args.get('after'))
+        removed_ids = []
+        next_page_cursor = None
+        if since:
+            jobs, removed_ids, cursor = get_job_changes(status, since)
+        else:
+            # Take the cursor before listing so concurrent changes are re-sent, not lost
+            cursor = dashboard_cache.get_or_load('latest_cursor', get_latest_cursor)
+            # 'after' requests the next page below the last job the client has
+            jobs, next_page_cursor = _cached_job_page(status, after)
         
         # Convert jobs to lightweight JSON format
-        jobs_data = []
-        for job in jobs:
-            job_data = {
-                'id': job.id,
-                'student_name': job.student_name,
-                'student_email': job.student_email,
-                'discipline': job.discipline,
-                'class_number': job.class_number,
-                'original_filename': job.original_filename,
-                'display_name': job.display_name,
-                'created_at': job.created_at.isoformat() if job.created_at else None,
-                'printer': job.printer,
-                'color': job.color,
-                'material': job.material,
-                'cost_usd': float(job.cost_usd) if job.cost_usd else None,
-                'staff_viewed_at': job.staff_viewed_at.isoformat() if job.staff_viewed_at else None
-            }
-            jobs_data.append(job_data)
+        jobs_data = [serialize_job_listing(job) for job in jobs]
+        identical = _cached_identical_jobs(jobs)
+        printability = _cached_printability(jobs)
+        for job, job_data in zip(jobs, jobs_data):
+            job_data['identical_to'] = identical.get(job.id)
+            job_data['printability'] = printability.get(job.id)
+            job_data['thumbnail_url'] = (
+                url_for('dashboard.thumbnail', content_hash=job.content_hash) if job.content_hash else None
+            )
+        watermark = _current_watermark()
         
-        return jsonify({
+        response = jsonify({
             'success': True,
             'stats': stats,
             'jobs': jobs_data,
+            'removed_ids': removed_ids,
+            'delta': since is not None,
+            'cursor': cursor,
+            'next_page': next_page_cursor,
             'current_status': status,
-            'timestamp': Job.query.first().created_at.isoformat() if Job.query.first() else None
+            'watermark': watermark,
+            'timestamp': watermark['updated_at']
         })
+        response.set_etag(etag)
+        # Let the browser keep the body but always revalidate before reusing it
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
         
     except Exception as e:
         current_app.logger.error(f"Error loading dashboard stats API: {str(e)}")
@@ -149,6 +237,150 @@ def api_stats():
             'error': 'Failed to load dashboard statistics'
         }), 500 
 
+@bp.route('/api/cache-stats')
+@login_required
+def api_cache_stats():
+    """Hit/miss counters for the dashboard read cache"""
+    return jsonify({
+        'success': True,
+        'cache': dashboard_cache.stats()
+    })
+
+@bp.route('/api/stream')
+@login_required
+def api_stream():
+    """Server-Sent Events channel pushing job and stats changes to the dashboard"""
+    keepalive_seconds = current_app.config.get('SSE_KEEPALIVE_SECONDS', 15)
+    max_stream_seconds = current_app.config.get('SSE_MAX_STREAM_SECONDS', 300)
+
+    # Every open stream holds a server thread; past the cap, clients fall back to polling
+    subscription = dashboard_bus.subscribe(current_app.config.get('SSE_MAX_SUBSCRIBERS', 2))
+    if subscription is None:
+        return jsonify({
+            'success': False,
+            'error': 'Too many live dashboard connections'
+        }), 503
+
+    def generate():
+        try:
+            # Tell EventSource how soon to reconnect once we close the stream
+            yield 'retry: 3000\n\n'
+            # Close periodically so long-lived connections release their worker thread
+            deadline = time.monotonic() + max_stream_seconds
+            while time.monotonic() < deadline:
+                try:
+                    event_type, data = subscription.get(timeout=keepalive_seconds)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+                yield format_sse(event_type, data)
+        finally:
+            dashboard_bus.unsubscribe(subscription)
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    # Also release the slot if the client leaves before the stream is first read
+    response.call_on_close(lambda: dashboard_bus.unsubscribe(subscription))
+    return response
+
+@bp.route('/api/jobs/<job_id>/analysis')
+@login_required
+def job_analysis(job_id):
+    """Mesh measurements and the weight to prefill in the approval modal"""
+    try:
+        job = Job.query.filter_by(id=job_id).first()
+        if not job:
+            return jsonify({
+                'success': False,
+                'error': 'Job not found'
+            }), 404
+        
+        # Jobs submitted before analysis existed are measured on first request
+        if job.mesh_analysis is None and job.file_path:
+            try:
+                job.mesh_analysis = analyze_mesh(resolve_file_path(job))
+                db.session.commit()
+            except MeshAnalysisError as e:
+                # Record the failure so an unreadable model is not re-parsed on every open
+                current_app.logger.warning(f"Mesh analysis failed for job {job_id[:8]}: {str(e)}")
+                job.mesh_analysis = analysis_failure(e)
+                db.session.commit()
+            except OSError as e:
+                # The file may be mid-move; try again next time
+                current_app.logger.warning(f"Mesh analysis failed for job {job_id[:8]}: {str(e)}")
+                db.session.rollback()
+        
+        return jsonify({
+            'success': True,
+            'analysis': job.mesh_analysis,
+            'material': job.material,
+            'suggested_weight_g': suggested_weight(job.mesh_analysis, job.material)
+        })
+        
+    except Exception as e:
+        current_app.logger.error(f"Error loading analysis for job {job_id[:8]}: {str(e)}")
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': 'Failed to load job analysis'
+        }), 500
+
+@bp.route('/api/jobs/<job_id>/metadata')
+@login_required
+def job_metadata(job_id):
+    """A job's submission metadata and where it is exported on disk"""
+    try:
+        job = Job.query.filter_by(id=job_id).first()
+        if not job:
+            return jsonify({
+                'success': False,
+                'error': 'Job not found'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'metadata': build_job_metadata(job),
+            'metadata_path': resolve_metadata_path(job)
+        })
+        
+    except Exception as e:
+        current_app.logger.error(f"Error loading metadata for job {job_id[:8]}: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to load job metadata'
+        }), 500
+
+THUMBNAIL_MAX_AGE = 365 * 24 * 60 * 60
+CONTENT_HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+@bp.route('/thumbnails/<content_hash>.png')
+@login_required
+def thumbnail(content_hash):
+    """Serve a model preview; names are content hashes, so browsers may cache them forever"""
+    if not CONTENT_HASH_PATTERN.match(content_hash):
+        return jsonify({'success': False, 'error': 'Thumbnail not found'}), 404
+    
+    storage_root = current_app.config.get('APP_STORAGE_ROOT', 'storage')
+    if not os.path.exists(get_thumbnail_path(content_hash, storage_root)):
+        # Not rendered yet (or lost): queue it and let the card retry later
+        job = Job.query.filter_by(content_hash=content_hash).first()
+        if job and job.file_path:
+            thumbnail_worker.submit(resolve_file_path(job), content_hash)
+        response = jsonify({'success': False, 'error': 'Thumbnail not ready'})
+        response.status_code = 404
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+    
+    response = send_from_directory(
+        os.path.join(os.path.abspath(storage_root), THUMBNAIL_DIR_NAME),
+        f"{content_hash}.png",
+        mimetype='image/png',
+        max_age=THUMBNAIL_MAX_AGE
+    )
+    response.headers['Cache-Control'] = f'private, max-age={THUMBNAIL_MAX_AGE}, immutable'
+    return response
+
 @bp.route('/api/mark-reviewed/<job_id>', methods=['POST'])
 @login_required
 def mark_job_reviewed(job_id):
@@ -171,9 +403,7 @@ def mark_job_reviewed(job_id):
             request_data = {'action': 'mark_reviewed_legacy'}
         
         # Update the staff_viewed_at timestamp
-        from datetime import datetime
-        job.staff_viewed_at = datetime.utcnow()
-        job.last_updated_by = 'staff'
+        apply_review(job, reviewed=True)
         db.session.commit()
         
         # Log audit trail
@@ -214,8 +444,7 @@ def mark_job_unreviewed(job_id):
             request_data = {'action': 'mark_unreviewed_legacy'}
         
         # Clear the staff_viewed_at timestamp to mark as unreviewed
-        job.staff_viewed_at = None
-        job.last_updated_by = 'staff'
+        apply_review(job, reviewed=False)
         db.session.commit()
         
         # Log audit trail
@@ -245,102 +474,29 @@ def approve_job(job_id):
                 'success': False,
                 'error': 'Job not found'
             }), 404
-            
-        # Validate job can be approved (must be UPLOADED)
-        if job.status != 'UPLOADED':
-            return jsonify({
-                'success': False,
-                'error': f'Job cannot be approved from {job.status} status'
-            }), 400
-        
-        # Get approval data from request
-        approval_data = request.get_json() or {}
-        weight_g = approval_data.get('weight_g')
-        time_hours = approval_data.get('time_hours')
-        material = approval_data.get('material')
-        notes = approval_data.get('notes', '')
-        
-        # Basic validation
-        if not weight_g or not time_hours:
-            return jsonify({
-                'success': False,
-                'error': 'Weight and time are required for approval'
-            }), 400
         
+        # Validate job can be approved (must be UPLOADED) and approval data
         try:
-            weight_g = float(weight_g)
-            time_hours = float(time_hours)
-        except (ValueError, TypeError):
+            approval = validate_approval(job, request.get_json() or {})
+        except JobActionError as e:
             return jsonify({
                 'success': False,
-                'error': 'Weight and time must be valid numbers'
-            }), 400
-        
-        # Calculate cost based on material and weight
-        cost_per_gram = 0.20 if material and 'resin' in material.lower() else 0.10
-        calculated_cost = max(weight_g * cost_per_gram, 3.00)  # $3.00 minimum
-        
-        # Move file from Uploaded to Pending directory
-        try:
-            new_file_path, new_metadata_path = _move_file_between_status_dirs(
-                job.file_path, 'Uploaded', 'Pending'
-            )
-        except Exception as e:
-            current_app.logger.error(f"Failed to move file for job {job_id[:8]}: {str(e)}")
-            return jsonify({
-                'success': False,
-                'error': 'Failed to move job file'
-            }), 500
-        
-        # Update job in database
-        job.status = 'PENDING'
-        job.weight_g = weight_g
-        job.time_hours = time_hours
-        job.material = material or job.material
-        job.cost_usd = calculated_cost
-        job.file_path = new_file_path
-        if new_metadata_path:
-            job.metadata_path = new_metadata_path
-        job.last_updated_by = 'staff'
-        job.staff_viewed_at = datetime.utcnow()  # Mark as reviewed during approval
-        if notes:
-            job.notes = f"{job.notes or ''}\n[APPROVAL] {notes}".strip()
-        
-        # Generate confirmation token for student
-        from app.utils.tokens import generate_confirmation_token
-        token, expiration = generate_confirmation_token(job.id)
-        job.confirm_token = token
-        job.confirm_token_expires = expiration
-        
-        # Create event log
-        approval_event = Event(
-            job_id=job.id,
-            event_type='StaffApproved',
-            details={
-                'weight_g': weight_g,
-                'time_hours': time_hours,
-                'material': material,
-                'cost_usd': float(calculated_cost),
-                'staff_notes': notes
-            },
-            triggered_by='staff'
-        )
-        db.session.add(approval_event)
+                'error': e.message
+            }), e.status_code
         
+        # Update job in database and log the approval event; the file follows
+        # to Pending/ in the background, so storage speed never delays approval
+        job_data = apply_approval(job, approval)
         db.session.commit()
         
         # Log success
-        current_app.logger.info(f"Job {job_id[:8]} approved by staff - Weight: {weight_g}g, Time: {time_hours}h, Cost: ${calculated_cost:.2f}")
+        calculated_cost = approval['cost_usd']
+        current_app.logger.info(f"Job {job_id[:8]} approved by staff - Weight: {approval['weight_g']}g, Time: {approval['time_hours']}h, Cost: ${calculated_cost:.2f}")
         
         return jsonify({
             'success': True,
             'message': f'Job approved successfully. Cost: ${calculated_cost:.2f}',
-            'job_data': {
-                'status': job.status,
-                'cost_usd': float(calculated_cost),
-                'weight_g': weight_g,
-                'time_hours': time_hours
-            }
+            'job_data': job_data
         })
         
     except Exception as e:
@@ -362,64 +518,27 @@ def reject_job(job_id):
                 'success': False,
                 'error': 'Job not found'
             }), 404
-            
-        # Validate job can be rejected (must be UPLOADED)
-        if job.status != 'UPLOADED':
-            return jsonify({
-                'success': False,
-                'error': f'Job cannot be rejected from {job.status} status'
-            }), 400
-        
-        # Get rejection data from request
-        rejection_data = request.get_json() or {}
-        rejection_reasons = rejection_data.get('reasons', [])
-        custom_reason = rejection_data.get('custom_reason', '')
-        notes = rejection_data.get('notes', '')
         
-        # Validate at least one reason is provided
-        if not rejection_reasons and not custom_reason:
+        # Validate job can be rejected (must be UPLOADED) with at least one reason
+        try:
+            rejection = validate_rejection(job, request.get_json() or {})
+        except JobActionError as e:
             return jsonify({
                 'success': False,
-                'error': 'At least one rejection reason must be provided'
-            }), 400
-        
-        # Combine reasons
-        all_reasons = rejection_reasons[:]
-        if custom_reason:
-            all_reasons.append(custom_reason)
-        
-        # Update job in database
-        job.status = 'REJECTED'
-        job.reject_reasons = all_reasons
-        job.last_updated_by = 'staff'
-        job.staff_viewed_at = datetime.utcnow()  # Mark as reviewed during rejection
-        if notes:
-            job.notes = f"{job.notes or ''}\n[REJECTION] {notes}".strip()
-        
-        # Create event log
-        rejection_event = Event(
-            job_id=job.id,
-            event_type='JobRejected',
-            details={
-                'rejection_reasons': all_reasons,
-                'staff_notes': notes
-            },
-            triggered_by='staff'
-        )
-        db.session.add(rejection_event)
+                'error': e.message
+            }), e.status_code
         
+        # Update job in database and log the rejection event
+        job_data = apply_rejection(job, rejection)
         db.session.commit()
         
         # Log success
-        current_app.logger.info(f"Job {job_id[:8]} rejected by staff - Reasons: {', '.join(all_reasons)}")
+        current_app.logger.info(f"Job {job_id[:8]} rejected by staff - Reasons: {', '.join(rejection['reasons'])}")
         
         return jsonify({
             'success': True,
             'message': 'Job rejected successfully',
-            'job_data': {
-                'status': job.status,
-                'reject_reasons': all_reasons
-            }
+            'job_data': job_data
         })
         
     except Exception as e:
@@ -430,32 +549,93 @@ def reject_job(job_id):
             'error': 'Failed to reject job'
         }), 500
 
-def _move_file_between_status_dirs(current_path, from_status, to_status):
-    """Move a file between status directories"""
-    if not current_path or not os.path.exists(current_path):
-        raise FileNotFoundError(f"Source file not found: {current_path}")
-    
-    # Get storage root from config
-    storage_root = current_app.config.get('APP_STORAGE_ROOT', 'storage')
-    
-    # Extract filename
-    filename = os.path.basename(current_path)
-    
-    # Create new path in target directory
-    target_dir = os.path.join(storage_root, to_status)
-    os.makedirs(target_dir, exist_ok=True)
-    
-    new_path = os.path.join(target_dir, filename)
-    
-    # Move the file
-    os.rename(current_path, new_path)
-    
-    # Also move metadata file if it exists
-    metadata_filename = os.path.splitext(filename)[0] + '.metadata.json'
-    current_metadata_path = os.path.join(os.path.dirname(current_path), metadata_filename)
-    new_metadata_path = None
-    if os.path.exists(current_metadata_path):
-        new_metadata_path = os.path.join(target_dir, metadata_filename)
-        os.rename(current_metadata_path, new_metadata_path)
-
-    return new_path, new_metadata_path
+APPROVAL_FIELDS = ('weight_g', 'time_hours', 'material', 'notes')
+REJECTION_FIELDS = ('reasons', 'custom_reason', 'notes')
+
+def _bulk_response(action, results):
+    succeeded = sum(1 for result in results if result['success'])
+    current_app.logger.info(f"Bulk {action} by staff - {succeeded} succeeded, {len(results) - succeeded} failed")
+    return jsonify({
+        'success': True,
+        'results': results,
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded
+    })
+
+@bp.route('/api/bulk/approve', methods=['POST'])
+@login_required
+def bulk_approve_jobs():
+    """Approve many jobs in one request; per-job params override shared ones"""
+    try:
+        payload = request.get_json() or {}
+        try:
+            job_requests = parse_bulk_request(payload)
+        except JobActionError as e:
+            return jsonify({
+                'success': False,
+                'error': e.message
+            }), e.status_code
+        
+        defaults = {field: payload[field] for field in APPROVAL_FIELDS if field in payload}
+        results = bulk_approve(job_requests, defaults)
+        return _bulk_response('approve', results)
+        
+    except Exception as e:
+        current_app.logger.error(f"Error in bulk approve: {str(e)}")
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': 'Failed to approve jobs'
+        }), 500
+
+@bp.route('/api/bulk/reject', methods=['POST'])
+@login_required
+def bulk_reject_jobs():
+    """Reject many jobs in one request; per-job params override shared ones"""
+    try:
+        payload = request.get_json() or {}
+        try:
+            job_requests = parse_bulk_request(payload)
+        except JobActionError as e:
+            return jsonify({
+                'success': False,
+                'error': e.message
+            }), e.status_code
+        
+        defaults = {field: payload[field] for field in REJECTION_FIELDS if field in payload}
+        results = bulk_reject(job_requests, defaults)
+        return _bulk_response('reject', results)
+        
+    except Exception as e:
+        current_app.logger.error(f"Error in bulk reject: {str(e)}")
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': 'Failed to reject jobs'
+        }), 500
+
+@bp.route('/api/bulk/mark-reviewed', methods=['POST'])
+@login_required
+def bulk_mark_jobs_reviewed():
+    """Mark many jobs as reviewed (or unreviewed with "reviewed": false) in one request"""
+    try:
+        payload = request.get_json() or {}
+        try:
+            job_requests = parse_bulk_request(payload)
+        except JobActionError as e:
+            return jsonify({
+                'success': False,
+                'error': e.message
+            }), e.status_code
+        
+        reviewed = payload.get('reviewed', True) is not False
+        results = bulk_mark_reviewed(job_requests, reviewed=reviewed)
+        return _bulk_response('mark-reviewed', results)
+        
+    except Exception as e:
+        current_app.logger.error(f"Error in bulk mark-reviewed: {str(e)}")
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': 'Failed to update review status'
+        }), 500
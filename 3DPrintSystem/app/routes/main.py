@@ -6,20 +6,28 @@ from datetime import datetime
 from app.extensions import db
 from app.models.job import Job
 from app.models.event import Event
+from app.services.event_bus import queue_job_event
 from app.services.file_service import save_uploaded_file
+from app.services.mesh_service import analysis_failure, analyze_mesh
+from app.services.printability_service import check_printability
+from app.services.thumbnail_service import thumbnail_worker
 from app.utils.form_handler import FormHandler
 from app.utils.validation import validate_required, validate_email, validate_file_required, ValidationError
 
 bp = Blueprint('main', __name__)
 
-def process_submission(form_data):
+def process_submission(form_data, uploaded_file=None):
     """
     Handles the core logic of processing a validated form submission.
     This includes saving the file, creating Job and Event records,
     and committing them to the database.
+
+    uploaded_file defaults to the request's 'file' part; resumable uploads
+    pass their assembled file instead.
     """
     try:
-        uploaded_file = request.files.get('file')
+        if uploaded_file is None:
+            uploaded_file = request.files.get('file')
         
         # Prepare data for file service
         file_service_data = {
@@ -33,12 +41,32 @@ def process_submission(form_data):
             'minChargeConsent': form_data.get('acknowledged_minimum_charge')
         }
 
-        display_name, file_path, metadata_path = save_uploaded_file(uploaded_file, file_service_data)
+        display_name, file_path, metadata_path, content_hash = save_uploaded_file(uploaded_file, file_service_data)
 
         if not display_name:
             # The file service returns the error message in the file_path variable on failure
             raise Exception(f"File upload failed: {file_path}")
 
+        # Measure the model so staff get weight estimates; a bad mesh never blocks a submission
+        try:
+            mesh_analysis = analyze_mesh(file_path)
+        except Exception as e:
+            current_app.logger.warning(f"Mesh analysis failed for {display_name}: {str(e)}")
+            mesh_analysis = analysis_failure(e)
+
+        # Flag geometry staff would otherwise reject by eye; informational only
+        try:
+            printability = check_printability(file_path, form_data.get('printer'))
+        except Exception as e:
+            current_app.logger.warning(f"Printability check failed for {display_name}: {str(e)}")
+            printability = None
+
+        # Render the dashboard preview in the background; only enqueues, never waits
+        try:
+            thumbnail_worker.submit(file_path, content_hash)
+        except Exception as e:
+            current_app.logger.warning(f"Could not queue thumbnail for {display_name}: {str(e)}")
+
         job_id = str(uuid.uuid4())
         job = Job(
             id=job_id,
@@ -50,6 +78,8 @@ def process_submission(form_data):
             display_name=display_name,
             file_path=file_path,
             metadata_path=metadata_path,
+            content_hash=content_hash,
+            mesh_analysis=mesh_analysis,
             status='UPLOADED',
             printer=form_data['printer'],
             color=form_data['color'],
@@ -72,13 +102,15 @@ def process_submission(form_data):
                 'display_name': display_name,
                 'print_method': form_data['print_method'],
                 'color': form_data['color'],
-                'printer': form_data['printer']
+                'printer': form_data['printer'],
+                'printability': printability
             },
             timestamp=datetime.utcnow()
         )
 
         db.session.add(job)
         db.session.add(event)
+        queue_job_event('job_created', job)
         
         current_app.logger.info(f"New job created: {job_id[:8]} by {form_data['student_email']}")
         
@@ -0,0 +1,152 @@
+from flask import Blueprint, request, url_for, current_app, jsonify
+from app.extensions import db
+from app.routes.main import process_submission
+from app.services.resumable_upload_service import (
+    UploadStateError,
+    create_upload,
+    load_upload,
+    append_chunk,
+    open_completed_upload,
+    delete_upload,
+    lock_upload
+)
+from app.utils.validation import ValidationError, validate_email
+
+bp = Blueprint('uploads', __name__, url_prefix='/upload')
+
+# Submission fields finalize expects, with display names for error messages
+SUBMISSION_FIELDS = {
+    'student_name': 'Student Name',
+    'student_email': 'Student Email',
+    'discipline': 'Discipline',
+    'class_number': 'Class Number',
+    'print_method': 'Print Method',
+    'color': 'Color',
+    'printer': 'Printer',
+    'acknowledged_minimum_charge': 'Minimum Charge Consent'
+}
+
+def _state_error(e):
+    body = {'success': False, 'error': e.message}
+    if e.offset is not None:
+        body['offset'] = e.offset
+    return jsonify(body), e.status_code
+
+def _validate_submission(data):
+    """Check the submission fields sent with finalize; returns the cleaned form data"""
+    errors = {}
+    form_data = {}
+    for field, display_name in SUBMISSION_FIELDS.items():
+        value = (data.get(field) or '').strip()
+        if not value:
+            errors[field] = f"{display_name} is required"
+            continue
+        form_data[field] = value
+    if 'student_email' in form_data:
+        try:
+            validate_email(form_data['student_email'], 'Student Email')
+        except ValidationError as e:
+            errors['student_email'] = str(e)
+    if form_data.get('acknowledged_minimum_charge', 'yes') != 'yes':
+        errors['acknowledged_minimum_charge'] = 'You must acknowledge the minimum charge policy.'
+    if errors:
+        raise ValidationError('Validation failed', errors)
+    return form_data
+
+@bp.route('/init', methods=['POST'])
+def init_upload():
+    """Start a resumable upload: {filename, size} -> upload_id and chunk size"""
+    try:
+        data = request.get_json(silent=True) or {}
+        upload = create_upload(data.get('filename'), data.get('size'))
+        current_app.logger.info(f"Resumable upload {upload['upload_id'][:8]} started for {upload['filename']} ({upload['size']} bytes)")
+        return jsonify({
+            'success': True,
+            'chunk_size': current_app.config['RESUMABLE_CHUNK_SIZE'],
+            **upload
+        }), 201
+    except UploadStateError as e:
+        return _state_error(e)
+    except Exception as e:
+        current_app.logger.error(f"Error starting resumable upload: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to start upload'
+        }), 500
+
+@bp.route('/<upload_id>', methods=['GET'])
+def upload_status(upload_id):
+    """Report how many bytes have been received so a client can resume"""
+    try:
+        return jsonify({'success': True, **load_upload(upload_id)})
+    except UploadStateError as e:
+        return _state_error(e)
+
+@bp.route('/<upload_id>', methods=['PUT'])
+def upload_chunk(upload_id):
+    """Append the raw request body at ?offset= (or the Upload-Offset header)"""
+    try:
+        offset = request.args.get('offset', request.headers.get('Upload-Offset'))
+        upload = append_chunk(upload_id, offset, request.stream)
+        return jsonify({'success': True, **upload})
+    except UploadStateError as e:
+        return _state_error(e)
+    except Exception as e:
+        current_app.logger.error(f"Error receiving chunk for upload {upload_id[:8]}: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to store chunk'
+        }), 500
+
+@bp.route('/<upload_id>', methods=['DELETE'])
+def cancel_upload(upload_id):
+    """Abandon an upload and free its staging space"""
+    try:
+        load_upload(upload_id)
+        delete_upload(upload_id)
+        return jsonify({'success': True})
+    except UploadStateError as e:
+        return _state_error(e)
+
+@bp.route('/<upload_id>/finalize', methods=['POST'])
+def finalize_upload(upload_id):
+    """Turn a completed upload plus the submission fields into a job"""
+    try:
+        lock = lock_upload(upload_id)
+    except UploadStateError as e:
+        return _state_error(e)
+    # A retried finalize waits for the first, then finds the upload gone
+    with lock:
+        return _finalize_locked(upload_id)
+
+def _finalize_locked(upload_id):
+    try:
+        form_data = _validate_submission(request.get_json(silent=True) or request.form)
+        uploaded_file = open_completed_upload(upload_id)
+    except ValidationError as e:
+        return jsonify({'success': False, 'errors': e.errors}), 400
+    except UploadStateError as e:
+        return _state_error(e)
+
+    try:
+        result = process_submission(form_data, uploaded_file=uploaded_file)
+        if not result['success']:
+            db.session.rollback()
+            return jsonify({'success': False, 'error': result['error']}), 500
+        db.session.commit()
+    except Exception as e:
+        current_app.logger.error(f"Error finalizing upload {upload_id[:8]}: {str(e)}")
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': 'Failed to create job'
+        }), 500
+    finally:
+        uploaded_file.close()
+
+    delete_upload(upload_id)
+    return jsonify({
+        'success': True,
+        'job_id': result['job_id'],
+        'redirect': url_for('main.submit_success', job_id=result['job_id'][:8])
+    })
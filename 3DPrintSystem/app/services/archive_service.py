@@ -0,0 +1,270 @@
+import atexit
+import lzma
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, not_, select, update
+from app.extensions import db
+from app.services.blob_store import release_blob
+from app.models.job import Job
+from app.services.file_service import (
+    ARCHIVE_CODECS,
+    ARCHIVE_DIRECTORY,
+    get_status_directory,
+    zstandard,
+)
+from app.services.move_journal import fsync_directory
+
+# Jobs whose files are almost never read again
+ARCHIVE_STATUSES = ('PAIDPICKEDUP', 'REJECTED')
+ARCHIVE_CHUNK_SIZE = 1024 * 1024
+ARCHIVE_BATCH_SIZE = 100
+COMPRESSION_LEVELS = {'lzma': 6, 'zstd': 19}
+
+def _open_compressed_writer(raw, codec):
+    if codec == 'lzma':
+        return lzma.open(raw, 'wb', preset=COMPRESSION_LEVELS['lzma'])
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("ARCHIVE_CODEC 'zstd' requires the zstandard package")
+        return zstandard.ZstdCompressor(level=COMPRESSION_LEVELS['zstd']).stream_writer(raw, closefd=False)
+    raise ValueError(f"Unknown archive codec: {codec}")
+
+def compress_file(source, destination, codec, bytes_per_second=0, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    Stream-compress source into destination (runs in worker processes)
+
+    Reads are paced to bytes_per_second (0 = unpaced) so archiving never
+    starves uploads and the dashboard of disk bandwidth. The output is
+    written under a temporary name, fsynced and renamed, so destination is
+    either absent or complete. The source is left alone.
+
+    Returns:
+        tuple: (original_bytes, compressed_bytes)
+    """
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    temp_path = f"{destination}.{os.getpid()}.tmp"
+    started = time.monotonic()
+    original_bytes = 0
+    try:
+        with open(source, 'rb') as src, open(temp_path, 'wb') as raw:
+            with _open_compressed_writer(raw, codec) as out:
+                while True:
+                    chunk = src.read(chunk_size)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                    original_bytes += len(chunk)
+                    if bytes_per_second > 0:
+                        ahead = original_bytes / bytes_per_second - (time.monotonic() - started)
+                        if ahead > 0:
+                            time.sleep(ahead)
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temp_path, destination)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    fsync_directory(os.path.dirname(destination))
+    return original_bytes, os.path.getsize(destination)
+
+def get_archive_path(file_path, created_at, codec, storage_root=None):
+    """Where a file goes in the archive tier: same name and shard, plus the codec's suffix"""
+    filename = os.path.basename(file_path)
+    directory = get_status_directory(ARCHIVE_DIRECTORY, filename, created_at, storage_root)
+    return os.path.join(directory, filename + ARCHIVE_CODECS[codec])
+
+class Archiver:
+    """
+    Compresses old picked-up and rejected jobs' files into the archive tier
+
+    Each pass streams eligible jobs (status in ARCHIVE_STATUSES, untouched for
+    ARCHIVE_AFTER_DAYS) in keyset batches and compresses them in a spawn
+    process pool, sharing ARCHIVE_IO_BYTES_PER_SECOND between the workers.
+    A compressed copy replaces file_path only if the job still points at the
+    original and is still archivable; only then is the original deleted. A
+    legacy sidecar moves into the archive alongside its model, and the
+    job's blob is deleted once no other job file links to it.
+
+    With ARCHIVE_WORKERS = 0 files are compressed inline; with
+    ARCHIVE_INTERVAL_SECONDS > 0 passes also run on a background thread.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._max_workers = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _get_executor(self, max_workers):
+        with self._lock:
+            if self._executor is None or self._max_workers != max_workers:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                self._max_workers = max_workers
+            return self._executor
+
+    def run_once(self, storage_root=None, batch_size=ARCHIVE_BATCH_SIZE):
+        """
+        Archive every eligible job now
+
+        Returns:
+            dict: {'archived', 'original_bytes', 'compressed_bytes', 'errors'}
+        """
+        config = current_app.config
+        if storage_root is None:
+            storage_root = config.get('APP_STORAGE_ROOT', 'storage')
+        codec = config.get('ARCHIVE_CODEC', 'lzma')
+        if codec not in ARCHIVE_CODECS:
+            raise ValueError(f"Unknown archive codec: {codec}")
+        max_workers = config.get('ARCHIVE_WORKERS', 2)
+        per_worker_budget = config.get('ARCHIVE_IO_BYTES_PER_SECOND', 0) / max(1, max_workers)
+        cutoff = datetime.utcnow() - timedelta(days=config.get('ARCHIVE_AFTER_DAYS', 90))
+        summary = {'archived': 0, 'original_bytes': 0, 'compressed_bytes': 0, 'errors': []}
+
+        table = Job.__table__
+        eligible = and_(
+            table.c.status.in_(ARCHIVE_STATUSES),
+            table.c.updated_at < cutoff,
+            table.c.file_path.isnot(None),
+            *[not_(table.c.file_path.like(f"%{suffix}")) for suffix in ARCHIVE_CODECS.values()]
+        )
+        after = ''
+        while True:
+            with db.engine.connect() as connection:
+                rows = connection.execute(
+                    select(table.c.id, table.c.file_path, table.c.metadata_path, table.c.created_at,
+                           table.c.content_hash)
+                    .where(table.c.id > after, eligible)
+                    .order_by(table.c.id).limit(batch_size)
+                ).all()
+            if not rows:
+                return summary
+            after = rows[-1].id
+
+            pending = []
+            for row in rows:
+                destination = get_archive_path(row.file_path, row.created_at, codec, storage_root)
+                future = self._submit(max_workers, row.file_path, destination, codec, per_worker_budget)
+                pending.append((row, destination, future))
+
+            for row, destination, future in pending:
+                try:
+                    sizes = future.result()
+                    if self._swap_in(row, destination, cutoff, storage_root):
+                        summary['archived'] += 1
+                        summary['original_bytes'] += sizes[0]
+                        summary['compressed_bytes'] += sizes[1]
+                except Exception as e:
+                    summary['errors'].append(f"Job {row.id[:8]}: {str(e)}")
+
+    def _submit(self, max_workers, *args):
+        if max_workers > 0:
+            return self._get_executor(max_workers).submit(compress_file, *args)
+        future = Future()
+        try:
+            future.set_result(compress_file(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _swap_in(self, row, destination, cutoff, storage_root):
+        """Point the job at its compressed copy, then drop the original and its blob"""
+        new_metadata_path = row.metadata_path
+        if row.metadata_path and os.path.exists(row.metadata_path):
+            new_metadata_path = os.path.join(os.path.dirname(destination), os.path.basename(row.metadata_path))
+            os.rename(row.metadata_path, new_metadata_path)
+
+        table = Job.__table__
+        try:
+            with db.engine.begin() as connection:
+                result = connection.execute(
+                    update(table)
+                    .where(
+                        table.c.id == row.id,
+                        table.c.file_path == row.file_path,
+                        table.c.status.in_(ARCHIVE_STATUSES),
+                        table.c.updated_at < cutoff
+                    )
+                    .values(
+                        file_path=destination,
+                        metadata_path=new_metadata_path,
+                        updated_at=table.c.updated_at  # Storage plumbing, not a job change
+                    )
+                )
+        except Exception:
+            self._discard(row, destination, new_metadata_path)
+            raise
+        if result.rowcount == 0:
+            self._discard(row, destination, new_metadata_path)  # The job changed while compressing
+            return False
+
+        try:
+            os.remove(row.file_path)
+            fsync_directory(os.path.dirname(row.file_path))
+        except FileNotFoundError:
+            pass
+        # The original was a link into the blob store; free the bytes unless another job shares them
+        if row.content_hash:
+            release_blob(row.content_hash, storage_root)
+        return True
+
+    @staticmethod
+    def _discard(row, destination, new_metadata_path):
+        if new_metadata_path != row.metadata_path and os.path.exists(new_metadata_path):
+            os.rename(new_metadata_path, row.metadata_path)
+        table = Job.__table__
+        with db.engine.connect() as connection:
+            current_path = connection.execute(select(table.c.file_path).where(table.c.id == row.id)).scalar()
+        # Another process may have archived the same job first; its copy is the live one
+        if current_path != destination and os.path.exists(destination):
+            os.remove(destination)
+
+    def start(self, app):
+        """Run a pass every ARCHIVE_INTERVAL_SECONDS on a daemon thread"""
+        interval = app.config.get('ARCHIVE_INTERVAL_SECONDS', 0)
+        if interval <= 0:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(app, interval), name='archiver', daemon=True)
+            self._thread.start()
+
+    def _run(self, app, interval):
+        while not self._stop.wait(interval):
+            with app.app_context():
+                try:
+                    summary = self.run_once()
+                    if summary['archived'] or summary['errors']:
+                        app.logger.info(
+                            f"Archived {summary['archived']} files "
+                            f"({summary['original_bytes']} -> {summary['compressed_bytes']} bytes), "
+                            f"{len(summary['errors'])} errors"
+                        )
+                except Exception as e:
+                    app.logger.error(f"Archive pass failed: {str(e)}")
+                finally:
+                    db.session.remove()
+
+    def shutdown(self, wait=True):
+        self._stop.set()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=not wait)
+                self._executor = None
+
+# Shared per-process archiver
+archiver = Archiver()
+atexit.register(archiver.shutdown, wait=False)
@@ -0,0 +1,87 @@
+import os
+from flask import current_app
+
+BLOB_DIR_NAME = 'blobs'
+
+def get_blob_path(content_hash, storage_root=None):
+    """Location of a blob: blobs/ab/cd/<sha256>, fanned out to keep directories small"""
+    if storage_root is None:
+        storage_root = current_app.config.get('APP_STORAGE_ROOT', 'storage')
+    return os.path.join(storage_root, BLOB_DIR_NAME, content_hash[:2], content_hash[2:4], content_hash)
+
+def deduplicate_file(path, content_hash, storage_root=None):
+    """
+    Make path a hard link to the blob holding these bytes
+
+    The first copy of some content becomes the blob by linking it into the
+    store (no data is written). Later identical files are replaced by a link to
+    the existing blob, freeing their own copy. Status directories keep holding
+    ordinary-looking files, so moves and downloads are unchanged.
+
+    Filesystems without hard links keep the plain file; nothing is lost
+    except the saving.
+
+    Returns:
+        bool: True if path now shares an existing blob's storage
+    """
+    blob_path = get_blob_path(content_hash, storage_root)
+    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+    try:
+        if not os.path.exists(blob_path):
+            try:
+                os.link(path, blob_path)
+                return False
+            except FileExistsError:
+                pass  # Another upload of the same bytes won the race; share its blob
+
+        if os.path.samefile(path, blob_path):
+            return True
+        # Link under a temporary name, then swap it over the duplicate in one step
+        temp_link = f"{path}.dedup"
+        os.link(blob_path, temp_link)
+        os.replace(temp_link, path)
+        return True
+    except OSError as e:
+        current_app.logger.warning(f"Could not deduplicate {path}: {e}")
+        return False
+
+def release_blob(content_hash, storage_root=None):
+    """
+    Delete one blob once no job file links to it any more
+
+    Called after a job's file stops sharing the blob's storage (e.g. it was
+    replaced by a compressed copy), so the bytes are freed straight away
+    rather than at the next prune.
+
+    Returns:
+        bool: True if the blob was removed
+    """
+    blob_path = get_blob_path(content_hash, storage_root)
+    try:
+        if os.stat(blob_path).st_nlink > 1:
+            return False
+        os.remove(blob_path)
+    except FileNotFoundError:
+        return False
+    return True
+
+def prune_unreferenced_blobs(storage_root=None):
+    """
+    Delete blobs no longer linked from any status directory
+
+    A blob's only remaining link is the store's own entry once every job file
+    sharing it has been deleted.
+
+    Returns:
+        int: number of blobs removed
+    """
+    if storage_root is None:
+        storage_root = current_app.config.get('APP_STORAGE_ROOT', 'storage')
+    removed = 0
+    for directory, _, filenames in os.walk(os.path.join(storage_root, BLOB_DIR_NAME)):
+        for filename in filenames:
+            blob_path = os.path.join(directory, filename)
+            if os.stat(blob_path).st_nlink <= 1:
+                os.remove(blob_path)
+                removed += 1
+    return removed
@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.job import Job
+
+DIRTY_FLAG_KEY = 'dashboard_cache_dirty'
+
+class TTLCache:
+    """
+    Small thread-safe LRU cache whose entries expire after a fixed TTL
+
+    Loaders run outside the lock, so two threads missing on the same key may
+    both load it; the last one wins. That is cheaper than serializing every
+    dashboard request behind a slow query.
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=10):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, max_entries=None, ttl_seconds=None):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if ttl_seconds is not None:
+                self.ttl_seconds = ttl_seconds
+            self._entries.clear()
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for key, calling loader() on a miss or expiry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = loader()
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return value
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None
+            }
+
+# Dashboard reads: job counts, version stamps, listing pages
+dashboard_cache = TTLCache()
+
+def invalidate_dashboard_cache():
+    """Drop every cached dashboard read; call after writes made outside the ORM"""
+    dashboard_cache.clear()
+
+@event.listens_for(Session, 'after_flush')
+def _mark_job_writes(session, flush_context):
+    if any(isinstance(obj, Job) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info[DIRTY_FLAG_KEY] = True
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_job_writes(session):
+    if session.info.pop(DIRTY_FLAG_KEY, False):
+        invalidate_dashboard_cache()
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_job_writes(session):
+    session.info.pop(DIRTY_FLAG_KEY, None)
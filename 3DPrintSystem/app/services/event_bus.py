@@ -0,0 +1,88 @@
+import json
+import queue
+import threading
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.services.cache_service import invalidate_dashboard_cache
+
+PENDING_EVENTS_KEY = 'pending_dashboard_events'
+
+class EventBus:
+    """
+    Minimal in-process publish/subscribe bus
+
+    Each subscriber gets its own bounded queue. A subscriber that falls behind
+    loses events instead of blocking publishers; the dashboard treats every
+    event as a hint to refresh, so a dropped event only delays an update.
+    Only subscribers in the same process see an event.
+    """
+
+    def __init__(self, max_queue_size=100):
+        self._max_queue_size = max_queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, max_subscribers=None):
+        """
+        Register a new subscriber queue
+
+        Returns:
+            queue.Queue, or None if max_subscribers are already subscribed
+        """
+        subscription = queue.Queue(maxsize=self._max_queue_size)
+        with self._lock:
+            if max_subscribers is not None and len(self._subscribers) >= max_subscribers:
+                return None
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event_type, data=None):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.put_nowait((event_type, data or {}))
+            except queue.Full:
+                pass
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+# Shared bus for staff dashboard live updates
+dashboard_bus = EventBus()
+
+def queue_job_event(event_type, job):
+    """
+    Queue a dashboard event for a job, published once the session commits
+
+    Events queued in a transaction that rolls back are discarded, so the
+    dashboard never hears about changes that did not persist.
+    """
+    pending = db.session.info.setdefault(PENDING_EVENTS_KEY, [])
+    pending.append((event_type, {'job_id': job.id, 'status': job.status}))
+
+def format_sse(event_type, data):
+    """Encode an event in the text/event-stream wire format"""
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+@event.listens_for(Session, 'after_commit')
+def _publish_pending_events(session):
+    pending = session.info.pop(PENDING_EVENTS_KEY, None)
+    if not pending:
+        return
+    # Clients refetch as soon as they hear an event, so drop cached reads first
+    invalidate_dashboard_cache()
+    for event_type, data in pending:
+        dashboard_bus.publish(event_type, data)
+    dashboard_bus.publish('stats_changed')
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_events(session):
+    session.info.pop(PENDING_EVENTS_KEY, None)
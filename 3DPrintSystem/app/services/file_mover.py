@@ -0,0 +1,266 @@
+import atexit
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from flask import current_app, has_app_context
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models.job import Job
+from app.services.file_service import (
+    ARCHIVE_CODECS,
+    ARCHIVE_DIRECTORY,
+    STATUS_DIRECTORIES,
+    get_status_directory,
+    is_archived,
+)
+from app.services.move_journal import begin_move
+from app.tasks.queue import PRIORITY_HIGH, enqueue, uses_task_queue
+
+PENDING_MOVES_KEY = 'pending_file_moves'
+LOCK_STRIPES = 64
+SETTLE_ATTEMPTS = 2  # A move that loses a race re-reads the job once
+SETTLE_BATCH_SIZE = 500
+SETTLE_TASK = 'storage.settle_job_file'
+
+def _same_directory(a, b):
+    return os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+def queue_file_move(job):
+    """
+    Queue a job's file to follow its status, moved once the session commits
+
+    The status change commits without waiting on storage; the background
+    mover then puts the file in the new status folder. Moves queued in a
+    transaction that rolls back are discarded.
+    """
+    db.session.info.setdefault(PENDING_MOVES_KEY, set()).add(job.id)
+
+class FileMover:
+    """
+    Moves job files into their status folders on background threads
+
+    Each move re-reads the job, so duplicate or superseded requests collapse
+    into one move to wherever the job's status points now. Moves for one job
+    are serialized; the move itself is journaled (see move_journal) and the
+    new path is recorded only if file_path is still what the move started
+    from. Until that commit, file_path keeps naming the source; see
+    resolve_file_path() for the short window while the rename is happening.
+
+    With FILE_MOVE_WORKERS = 0 moves run inline right after the commit.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._max_workers = None
+        self._lock = threading.Lock()
+        self._job_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._in_flight = {}  # job_id -> destination of the rename in progress
+        self._futures = set()
+
+    def _get_executor(self, max_workers):
+        with self._lock:
+            if self._executor is None or self._max_workers != max_workers:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='file-mover')
+                self._max_workers = max_workers
+            return self._executor
+
+    def submit(self, job_ids):
+        """Settle each job's file location: on the task queue if there is one, else on this process's threads"""
+        if uses_task_queue():
+            for job_id in job_ids:
+                enqueue(SETTLE_TASK, {'job_id': job_id}, priority=PRIORITY_HIGH, dedupe_key=f"settle:{job_id}")
+            return
+        app = current_app._get_current_object()
+        max_workers = app.config.get('FILE_MOVE_WORKERS', 4)
+        if max_workers <= 0:
+            for job_id in job_ids:
+                self._run(app, job_id)
+            return
+        executor = self._get_executor(max_workers)
+        for job_id in job_ids:
+            future = executor.submit(self._run, app, job_id)
+            with self._lock:
+                self._futures.add(future)
+            future.add_done_callback(self._forget)
+
+    def _forget(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def _run(self, app, job_id):
+        with app.app_context():
+            try:
+                with self._job_locks[hash(job_id) % LOCK_STRIPES]:
+                    self.settle(job_id)
+            except Exception as e:
+                app.logger.error(f"Background move failed for job {job_id[:8]}: {str(e)}")
+
+    def settle(self, job_id, storage_root=None):
+        """
+        Move a job's file into its status folder (and shard) if it is elsewhere
+
+        Uses its own connections, never the caller's session, so it is safe
+        to run from commit hooks and worker threads. If another process moves
+        the file first (the source is gone, or file_path changed under us)
+        the job is re-read and settled from where it is now.
+
+        Returns:
+            str: the new file path, or None if nothing was moved
+        """
+        if storage_root is None:
+            storage_root = current_app.config.get('APP_STORAGE_ROOT', 'storage')
+        for attempt in range(SETTLE_ATTEMPTS):
+            last_attempt = attempt == SETTLE_ATTEMPTS - 1
+            try:
+                moved, new_path = self._settle_once(job_id, storage_root)
+            except FileNotFoundError:
+                if last_attempt:
+                    raise
+                continue
+            if moved or last_attempt:
+                return new_path
+        return None
+
+    def _settle_once(self, job_id, storage_root):
+        """Returns (settled, new_path); settled is False if the row changed mid-move"""
+        table = Job.__table__
+        with db.engine.connect() as connection:
+            row = connection.execute(
+                select(table.c.status, table.c.file_path, table.c.metadata_path, table.c.created_at)
+                .where(table.c.id == job_id)
+            ).first()
+        if not row or not row.file_path:
+            return True, None
+        # Archived files stay in the archive tier whatever the status
+        folder = ARCHIVE_DIRECTORY if is_archived(row.file_path) else STATUS_DIRECTORIES.get(row.status)
+        if not folder:
+            return True, None
+        filename = os.path.basename(row.file_path)
+        current_dir = os.path.dirname(row.file_path)
+        target_dir = get_status_directory(folder, filename, row.created_at, storage_root)
+        if _same_directory(current_dir, target_dir):
+            return True, None
+
+        with self._lock:
+            self._in_flight[job_id] = os.path.join(target_dir, filename)
+        try:
+            move = begin_move(job_id, row.file_path, os.path.basename(current_dir), folder, storage_root,
+                              row.metadata_path, row.created_at)
+            try:
+                with db.engine.begin() as connection:
+                    result = connection.execute(
+                        update(table)
+                        .where(table.c.id == job_id, table.c.file_path == row.file_path)
+                        .values(
+                            file_path=move.new_path,
+                            metadata_path=move.new_metadata_path or row.metadata_path,
+                            updated_at=table.c.updated_at  # Storage plumbing, not a job change
+                        )
+                    )
+            except Exception:
+                move.roll_back()
+                raise
+            if result.rowcount == 0:
+                move.roll_back()  # The row changed underneath us
+                return False, None
+            move.complete()
+            return True, move.new_path
+        finally:
+            with self._lock:
+                self._in_flight.pop(job_id, None)
+
+    def settle_all(self, storage_root=None, workers=4, batch_size=SETTLE_BATCH_SIZE):
+        """
+        Settle every job, e.g. to reshard storage after changing STORAGE_LAYOUT
+
+        Safe while the app is serving: jobs are read in keyset batches, each
+        move is journaled and committed on its own, and a job that changes
+        mid-move is re-read rather than overwritten.
+
+        Returns:
+            dict: {'checked', 'moved', 'errors'}; errors is a list of messages
+        """
+        if storage_root is None:
+            storage_root = current_app.config.get('APP_STORAGE_ROOT', 'storage')
+        app = current_app._get_current_object()
+        table = Job.__table__
+        summary = {'checked': 0, 'moved': 0, 'errors': []}
+
+        def settle_one(job_id):
+            with app.app_context():
+                with self._job_locks[hash(job_id) % LOCK_STRIPES]:
+                    return self.settle(job_id, storage_root)
+
+        after = ''
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='file-settle') as executor:
+            while True:
+                with db.engine.connect() as connection:
+                    job_ids = connection.execute(
+                        select(table.c.id).where(table.c.id > after, table.c.file_path.isnot(None))
+                        .order_by(table.c.id).limit(batch_size)
+                    ).scalars().all()
+                if not job_ids:
+                    return summary
+                after = job_ids[-1]
+                summary['checked'] += len(job_ids)
+                futures = {executor.submit(settle_one, job_id): job_id for job_id in job_ids}
+                for future, job_id in futures.items():
+                    try:
+                        if future.result():
+                            summary['moved'] += 1
+                    except Exception as e:
+                        summary['errors'].append(f"Job {job_id[:8]}: {str(e)}")
+
+    def in_flight_destination(self, job_id):
+        with self._lock:
+            return self._in_flight.get(job_id)
+
+    def wait(self, timeout=None):
+        """Block until queued moves finish (for tests and shutdown)"""
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures, timeout=timeout)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+# Shared per-process mover
+file_mover = FileMover()
+atexit.register(file_mover.shutdown, wait=True)
+
+def resolve_file_path(job):
+    """
+    A path where the job's file can be read right now
+
+    file_path names the source until a background move commits; during the
+    rename itself the file may already be at the destination.
+    """
+    path = job.file_path
+    if not path or os.path.exists(path):
+        return path
+    destination = file_mover.in_flight_destination(job.id)
+    if destination and os.path.exists(destination):
+        return destination
+    # Moved (or archived) and committed since this row was loaded
+    filename = os.path.basename(path)
+    folder = STATUS_DIRECTORIES.get(job.status)
+    candidates = [os.path.join(get_status_directory(folder, filename, job.created_at), filename)] if folder else []
+    archive_dir = get_status_directory(ARCHIVE_DIRECTORY, filename, job.created_at)
+    candidates.extend(os.path.join(archive_dir, filename + suffix) for suffix in ARCHIVE_CODECS.values())
+    return next((candidate for candidate in candidates if os.path.exists(candidate)), path)
+
+@event.listens_for(Session, 'after_commit')
+def _start_pending_moves(session):
+    job_ids = session.info.pop(PENDING_MOVES_KEY, None)
+    if job_ids and has_app_context():
+        file_mover.submit(sorted(job_ids))
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_moves(session):
+    session.info.pop(PENDING_MOVES_KEY, None)
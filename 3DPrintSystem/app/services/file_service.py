@@ -2,59 +2,142 @@ import os
 import re
 import json
 import uuid
+import hashlib
+import lzma
+import time
 from werkzeug.utils import secure_filename
-from flask import current_app
+from flask import current_app, has_app_context
 from datetime import datetime, timezone
+from app.services.blob_store import deduplicate_file
+from app.services.id_allocator import allocate_file_id
+from app.services.upload_service import UploadTooLarge, store_upload
+
+try:
+    import zstandard
+except ImportError:  # Optional: archives use lzma unless zstandard is installed
+    zstandard = None
 
 ALLOWED_EXTENSIONS = {'.stl', '.obj', '.3mf'}
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100 MB
+METADATA_SUFFIX = '.metadata.json'
 
-def _get_last_id_file_path():
-    """Get the path to last_file_id.txt, creating the directory if needed"""
-    # Try to use workspace root relative to this file
-    current_file_dir = os.path.dirname(os.path.abspath(__file__))
-    workspace_root = os.path.join(current_file_dir, '..', '..', '..')
-    workspace_root = os.path.normpath(workspace_root)
-    
-    cursor_dir = os.path.join(workspace_root, '.cursor')
-    
-    # Create .cursor directory if it doesn't exist
-    if not os.path.exists(cursor_dir):
-        os.makedirs(cursor_dir, exist_ok=True)
-    
-    return os.path.join(cursor_dir, 'last_file_id.txt')
+# Folder under APP_STORAGE_ROOT holding each status's files; rejected jobs
+# are never moved, so their files stay where they were uploaded
+STATUS_DIRECTORIES = {
+    'UPLOADED': 'Uploaded',
+    'PENDING': 'Pending',
+    'READYTOPRINT': 'ReadyToPrint',
+    'PRINTING': 'Printing',
+    'COMPLETED': 'Completed',
+    'PAIDPICKEDUP': 'PaidPickedUp',
+    'REJECTED': 'Uploaded',
+}
+
+# Compressed archive tier (see archive_service): codec -> file suffix
+ARCHIVE_DIRECTORY = 'Archive'
+ARCHIVE_CODECS = {'lzma': '.xz', 'zstd': '.zst'}
+
+# STORAGE_LAYOUT values: how files are spread inside each status folder
+LAYOUT_FLAT = 'flat'  # Every file directly in the status folder
+LAYOUT_HASH = 'hash'  # <folder>/<first two hex digits of sha1(display name)>/
+LAYOUT_DATE = 'date'  # <folder>/<year>/<month>/ of the job's submission
+STORAGE_LAYOUTS = (LAYOUT_FLAT, LAYOUT_HASH, LAYOUT_DATE)
+
+def get_storage_layout():
+    if not has_app_context():
+        return LAYOUT_FLAT
+    return current_app.config.get('STORAGE_LAYOUT', LAYOUT_FLAT)
+
+def get_shard_directory(base_dir, filename, created_at=None, layout=None):
+    """
+    The directory a file belongs in under a status folder
+
+    The shard depends only on the file's name (hash) or its job's submission
+    time (date), never on its status, so a file keeps the same shard as it
+    moves between folders. created_at defaults to now, as for a new upload.
+
+    Raises:
+        ValueError: for an unknown layout
+    """
+    layout = layout or get_storage_layout()
+    filename = get_model_filename(filename)  # Archived copies share their original's shard
+    if layout == LAYOUT_FLAT:
+        return base_dir
+    if layout == LAYOUT_HASH:
+        return os.path.join(base_dir, hashlib.sha1(filename.encode('utf-8')).hexdigest()[:2])
+    if layout == LAYOUT_DATE:
+        when = created_at or datetime.utcnow()
+        return os.path.join(base_dir, f"{when.year:04d}", f"{when.month:02d}")
+    raise ValueError(f"Unknown storage layout: {layout}")
+
+def get_status_directory(folder, filename, created_at=None, storage_root=None, layout=None):
+    """The directory a job's file belongs in for a status folder (e.g. 'Pending')"""
+    if storage_root is None:
+        storage_root = current_app.config.get('APP_STORAGE_ROOT', 'storage')
+    return get_shard_directory(os.path.join(storage_root, folder), filename, created_at, layout)
+
+def get_archive_codec(path):
+    """The codec an archived file was compressed with, or None for a plain file"""
+    suffix = os.path.splitext(path or '')[1].lower()
+    return next((codec for codec, codec_suffix in ARCHIVE_CODECS.items() if codec_suffix == suffix), None)
+
+def is_archived(path):
+    return get_archive_codec(path) is not None
+
+def get_model_filename(path):
+    """A stored file's model name, without any archive suffix (e.g. 'cube.stl' for 'cube.stl.xz')"""
+    name = os.path.basename(path or '')
+    return os.path.splitext(name)[0] if is_archived(name) else name
+
+def open_stored_file(path):
+    """
+    Open a job's file for reading as a binary stream
+
+    Archived files are decompressed on the fly as the stream is read, so
+    callers never need to know which tier a file is in.
+
+    Raises:
+        FileNotFoundError: if the file does not exist
+        RuntimeError: for a zstd archive when zstandard is not installed
+    """
+    codec = get_archive_codec(path)
+    if codec == 'lzma':
+        return lzma.open(path, 'rb')
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError(f"Reading {os.path.basename(path)} requires the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    return open(path, 'rb')
+
+def remove_empty_directories(folder_path, min_age_seconds=60):
+    """
+    Remove empty shard directories left behind under a status folder
+
+    Runs bottom-up and never removes folder_path itself or hidden
+    directories. Directories changed in the last min_age_seconds are kept so
+    a concurrent upload never loses the shard it just created.
+
+    Returns:
+        int: number of directories removed
+    """
+    removed = 0
+    cutoff = time.time() - min_age_seconds
+    for directory, subdirectories, filenames in os.walk(folder_path, topdown=False):
+        relative = os.path.relpath(directory, folder_path)
+        if relative == os.curdir or any(part.startswith('.') for part in relative.split(os.sep)):
+            continue
+        try:
+            if os.path.getmtime(directory) <= cutoff:
+                os.rmdir(directory)  # Fails, harmlessly, unless the directory is empty
+                removed += 1
+        except OSError:
+            pass
+    return removed
 
 def _get_next_id():
-    last_id_file = _get_last_id_file_path()
-    
+    """Allocate the short ID used in a new upload's filename ("ERR00" if allocation fails)"""
     try:
-        with open(last_id_file, 'r+') as f:
-            last_id = f.read().strip()
-            if not re.match(r'^[A-Z][0-9]+$', last_id) or last_id == "Z99": # Basic validation
-                current_char_code = ord('A')
-                current_num = 0
-            else:
-                current_char_code = ord(last_id[0])
-                current_num = int(last_id[1:])
-
-            current_num += 1
-            if current_num > 99:
-                current_num = 1
-                current_char_code += 1
-                if current_char_code > ord('Z'):
-                    current_char_code = ord('A')
-                    current_num = 1
-            
-            next_id_str = chr(current_char_code) + str(current_num)
-            f.seek(0)
-            f.write(next_id_str)
-            f.truncate()
-            return next_id_str
-    except FileNotFoundError:
-        # Create the file with initial value
-        with open(last_id_file, 'w') as f:
-            f.write("A1")
-            return "A1"
+        return allocate_file_id()
     except Exception as e:
         current_app.logger.error(f"Error generating next ID: {e}")
         return "ERR00"
@@ -88,22 +171,16 @@ def validate_file(file_storage):
     if not is_allowed_file(file_storage.filename):
         return False, f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
     
-    # Check file size (this requires reading the file, be careful with large files)
-    # file_storage.seek(0, os.SEEK_END)
-    # file_size = file_storage.tell()
-    # file_storage.seek(0) # Reset cursor
-    # if file_size > MAX_FILE_SIZE:
-    #     return False, f"File too large. Maximum size is {MAX_FILE_SIZE // (1024*1024)}MB."
-    # A more robust way to check size without reading whole file into memory if possible with Flask/Werkzeug:
-    # content_length is usually set by the client, can be spoofed.
-    # For true size check before saving, one might need to stream it to a temp location or use a library.
-    # For now, relying on client-side check and a basic server check if available.
-    # Flask's request.content_length can give the size from header.
+    # The size limit is enforced while the body streams in (see upload_service);
+    # a streamed file that got this far is already counted
+    max_size = current_app.config.get('MAX_UPLOAD_FILE_BYTES', MAX_FILE_SIZE)
+    if getattr(file_storage.stream, 'size', 0) > max_size:
+        return False, f"File too large. Maximum size is {max_size // (1024*1024)}MB."
     
     return True, "File is valid."
 
 def create_metadata_file(metadata_content, directory, filename_prefix):
-    metadata_filename = f"{filename_prefix}.metadata.json"
+    metadata_filename = f"{filename_prefix}{METADATA_SUFFIX}"
     metadata_path = os.path.join(directory, metadata_filename)
     try:
         with open(metadata_path, 'w') as f:
@@ -115,9 +192,16 @@ def create_metadata_file(metadata_content, directory, filename_prefix):
         return None
 
 def save_uploaded_file(file_storage, form_data):
+    """
+    Save an upload under its standardized name and write its metadata sidecar
+
+    Returns:
+        tuple: (display_name, file_path, metadata_path, content_hash), or
+        (None, error message, None, None) on failure
+    """
     is_valid, message = validate_file(file_storage)
     if not is_valid:
-        return None, message, None
+        return None, message, None, None
 
     original_filename_secure = secure_filename(file_storage.filename)
     
@@ -129,7 +213,7 @@ def save_uploaded_file(file_storage, form_data):
     # Generate a simple job ID for this submission
     job_id = _get_next_id()
     if job_id == "ERR00":
-        return None, "Failed to generate a unique file ID. Please try again.", None
+        return None, "Failed to generate a unique file ID. Please try again.", None, None
 
     # Use the standardized naming convention from masterplan
     new_model_filename = generate_standardized_filename(
@@ -140,26 +224,43 @@ def save_uploaded_file(file_storage, form_data):
         original_filename=original_filename_secure
     )
     
-    upload_folder = current_app.config.get('UPLOAD_FOLDER', 'storage/Uploaded') 
+    upload_folder = get_shard_directory(
+        current_app.config.get('UPLOAD_FOLDER', 'storage/Uploaded'), new_model_filename
+    )
     if not os.path.exists(upload_folder):
         os.makedirs(upload_folder, exist_ok=True)
         
     model_save_path = os.path.join(upload_folder, new_model_filename)
     
     try:
-        file_storage.save(model_save_path)
+        file_sha256, file_size = store_upload(
+            file_storage, model_save_path,
+            max_bytes=current_app.config.get('MAX_UPLOAD_FILE_BYTES', MAX_FILE_SIZE)
+        )
         current_app.logger.info(f"File {original_filename_secure} saved as {new_model_filename} to {model_save_path}")
+    except UploadTooLarge as e:
+        return None, e.description, None, None
     except Exception as e:
         current_app.logger.error(f"Could not save file {new_model_filename}: {e}")
-        return None, f"Could not save file: {e}", None
+        return None, f"Could not save file: {e}", None, None
+
+    # Identical bytes already on disk (e.g. a resubmission) are shared, not stored again
+    if deduplicate_file(model_save_path, file_sha256):
+        current_app.logger.info(f"File {new_model_filename} is identical to an earlier upload; sharing its storage")
+
+    # Job rows carry the same fields; the per-upload sidecar is only written in
+    # the legacy 'sidecar' export mode (see metadata_export for manifests)
+    if current_app.config.get('METADATA_EXPORT', 'manifest') != 'sidecar':
+        return new_model_filename, model_save_path, None, file_sha256
 
-    # Create metadata content
     # The job_id field in metadata will initially be this file_id. 
     # It can be updated later when a database Job ID is available.
     metadata_content = {
         "temp_job_id": job_id, # Using file_id as a temporary job identifier
         "original_filename": file_storage.filename, # Non-secured, as submitted by user
         "display_name": new_model_filename, # The standardized filename
+        "file_sha256": file_sha256,
+        "file_size_bytes": file_size,
         "student_name": student_name,
         "student_email": form_data.get("studentEmail"),
         "discipline": form_data.get("discipline"),
@@ -182,6 +283,34 @@ def save_uploaded_file(file_storage, form_data):
         # A more robust system might delete the saved model file or mark for review.
         current_app.logger.warning(f"Model file {new_model_filename} saved, but metadata creation failed.")
         # Return None for metadata_path to indicate failure
-        return new_model_filename, model_save_path, None 
+        return new_model_filename, model_save_path, None, file_sha256
         
-    return new_model_filename, model_save_path, metadata_path 
\ No newline at end of file
+    return new_model_filename, model_save_path, metadata_path, file_sha256 
+
+def get_move_targets(current_path, to_status, storage_root=None, metadata_path=None, created_at=None):
+    """
+    Plan a move between status directories: the model plus its recorded sidecar
+
+    Only a sidecar the job actually records (metadata_path) is moved, so jobs
+    without one cost no extra lookups. Both land in the model's shard of the
+    target folder; created_at is the job's submission time (date layout).
+
+    Returns:
+        list: (source, destination) path pairs, the model file first
+
+    Raises:
+        FileNotFoundError: if the model file does not exist
+    """
+    if not current_path or not os.path.exists(current_path):
+        raise FileNotFoundError(f"Source file not found: {current_path}")
+    
+    # Get storage root from config unless the caller already resolved it
+    # (worker threads have no application context)
+    if storage_root is None:
+        storage_root = current_app.config.get('APP_STORAGE_ROOT', 'storage')
+    
+    target_dir = get_status_directory(to_status, os.path.basename(current_path), created_at, storage_root)
+    renames = [(current_path, os.path.join(target_dir, os.path.basename(current_path)))]
+    if metadata_path and os.path.exists(metadata_path):
+        renames.append((metadata_path, os.path.join(target_dir, os.path.basename(metadata_path))))
+    return renames
@@ -0,0 +1,105 @@
+import threading
+from flask import current_app
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models.id_counter import IdCounter
+
+FILE_ID_COUNTER = 'file_id'
+# Start at base-36 "1000" so new IDs are never shorter than 4 characters and
+# cannot collide with the legacy A1-Z99 file IDs
+FILE_ID_START = 36 ** 3
+BASE36_DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+def to_base36(value):
+    """Encode a non-negative integer as an uppercase base-36 string"""
+    digits = []
+    while True:
+        value, remainder = divmod(value, 36)
+        digits.append(BASE36_DIGITS[remainder])
+        if value == 0:
+            return ''.join(reversed(digits))
+
+def reserve_block(name, size, start=1):
+    """
+    Atomically reserve size consecutive values from a named counter
+
+    Runs on its own connection and transaction, independent of the request's
+    session. The UPDATE takes the row lock (the database write lock on
+    SQLite), so concurrent reservations from any thread or process get
+    disjoint blocks.
+
+    Returns:
+        range: the reserved values
+    """
+    table = IdCounter.__table__
+    for _ in range(2):
+        with db.engine.begin() as connection:
+            result = connection.execute(
+                update(table)
+                .where(table.c.name == name)
+                .values(next_value=table.c.next_value + size)
+            )
+            if result.rowcount:
+                end = connection.execute(
+                    select(table.c.next_value).where(table.c.name == name)
+                ).scalar_one()
+                return range(end - size, end)
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(insert(table).values(name=name, next_value=start + size))
+            return range(start, start + size)
+        except IntegrityError:
+            continue  # Another process created the counter first; reserve from it
+    raise RuntimeError(f"Could not reserve values from counter {name}")
+
+class BlockAllocator:
+    """
+    Hands out counter values from blocks reserved in the database
+
+    Threads take values from the process's current block under a short
+    in-memory lock, so most allocations cost no database or filesystem round
+    trip. Values left in a block when the process exits are skipped; IDs stay
+    unique but may have gaps.
+    """
+
+    def __init__(self, name, start=1):
+        self.name = name
+        self.start = start
+        self._lock = threading.Lock()
+        self._engine = None
+        self._values = iter(())
+
+    def allocate(self, count=1, block_size=None):
+        """
+        Return count unused values, reserving new blocks as needed
+
+        Returns:
+            list: allocated integers, ascending
+        """
+        block_size = max(block_size or current_app.config.get('FILE_ID_BLOCK_SIZE', 20), 1)
+        engine = db.engine
+        allocated = []
+        with self._lock:
+            if self._engine is not engine:
+                # Blocks belong to one database; never reuse them against another
+                self._engine = engine
+                self._values = iter(())
+            while len(allocated) < count:
+                value = next(self._values, None)
+                if value is None:
+                    self._values = iter(reserve_block(self.name, max(block_size, count - len(allocated)), self.start))
+                    continue
+                allocated.append(value)
+        return allocated
+
+# Short IDs for uploaded file names
+file_id_allocator = BlockAllocator(FILE_ID_COUNTER, start=FILE_ID_START)
+
+def allocate_file_ids(count):
+    """Allocate count collision-free short file IDs (e.g. '1A2B')"""
+    return [to_base36(value) for value in file_id_allocator.allocate(count)]
+
+def allocate_file_id():
+    """Allocate one collision-free short file ID"""
+    return allocate_file_ids(1)[0]
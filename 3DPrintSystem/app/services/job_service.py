@@ -0,0 +1,293 @@
+from datetime import datetime
+from app.extensions import db
+from app.models.event import Event
+from app.models.job import Job
+from app.services.event_bus import queue_job_event
+from app.services.file_mover import queue_file_move
+from app.utils.tokens import generate_confirmation_token
+
+MINIMUM_CHARGE_USD = 3.00
+MAX_BULK_JOBS = 200
+
+class JobActionError(Exception):
+    """A staff action that cannot be applied to a job"""
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+def calculate_cost(weight_g, material):
+    """Cost in USD for a print: $0.20/g for resin, $0.10/g otherwise, $3.00 minimum"""
+    cost_per_gram = 0.20 if material and 'resin' in material.lower() else 0.10
+    return max(weight_g * cost_per_gram, MINIMUM_CHARGE_USD)
+
+def validate_approval(job, approval_data):
+    """
+    Check that a job can be approved with the given data
+
+    Returns:
+        dict: normalized approval values (weight_g, time_hours, material, notes, cost_usd)
+
+    Raises:
+        JobActionError: if the job is not UPLOADED or the values are missing/invalid
+    """
+    if job.status != 'UPLOADED':
+        raise JobActionError(f'Job cannot be approved from {job.status} status')
+
+    weight_g = approval_data.get('weight_g')
+    time_hours = approval_data.get('time_hours')
+    material = approval_data.get('material')
+
+    if not weight_g or not time_hours:
+        raise JobActionError('Weight and time are required for approval')
+
+    try:
+        weight_g = float(weight_g)
+        time_hours = float(time_hours)
+    except (ValueError, TypeError):
+        raise JobActionError('Weight and time must be valid numbers')
+
+    return {
+        'weight_g': weight_g,
+        'time_hours': time_hours,
+        'material': material,
+        'notes': approval_data.get('notes', ''),
+        'cost_usd': calculate_cost(weight_g, material)
+    }
+
+def apply_approval(job, approval):
+    """
+    Move a validated job to PENDING in the session (caller commits)
+
+    The file follows to Pending/ in the background once the commit lands.
+
+    Returns:
+        dict: job_data for the API response
+    """
+    job.status = 'PENDING'
+    job.weight_g = approval['weight_g']
+    job.time_hours = approval['time_hours']
+    job.material = approval['material'] or job.material
+    job.cost_usd = approval['cost_usd']
+    job.last_updated_by = 'staff'
+    job.staff_viewed_at = datetime.utcnow()  # Mark as reviewed during approval
+    if approval['notes']:
+        job.notes = f"{job.notes or ''}\n[APPROVAL] {approval['notes']}".strip()
+
+    # Generate confirmation token for student
+    token, expiration = generate_confirmation_token(job.id)
+    job.confirm_token = token
+    job.confirm_token_expires = expiration
+
+    db.session.add(Event(
+        job_id=job.id,
+        event_type='StaffApproved',
+        details={
+            'weight_g': approval['weight_g'],
+            'time_hours': approval['time_hours'],
+            'material': approval['material'],
+            'cost_usd': float(approval['cost_usd']),
+            'staff_notes': approval['notes']
+        },
+        triggered_by='staff'
+    ))
+    queue_job_event('job_updated', job)
+    queue_file_move(job)
+
+    return {
+        'status': job.status,
+        'cost_usd': float(approval['cost_usd']),
+        'weight_g': approval['weight_g'],
+        'time_hours': approval['time_hours']
+    }
+
+def validate_rejection(job, rejection_data):
+    """
+    Check that a job can be rejected with the given data
+
+    Returns:
+        dict: normalized rejection values (reasons, notes)
+
+    Raises:
+        JobActionError: if the job is not UPLOADED or no reason was given
+    """
+    if job.status != 'UPLOADED':
+        raise JobActionError(f'Job cannot be rejected from {job.status} status')
+
+    rejection_reasons = rejection_data.get('reasons', [])
+    custom_reason = rejection_data.get('custom_reason', '')
+
+    if not rejection_reasons and not custom_reason:
+        raise JobActionError('At least one rejection reason must be provided')
+
+    all_reasons = rejection_reasons[:]
+    if custom_reason:
+        all_reasons.append(custom_reason)
+
+    return {
+        'reasons': all_reasons,
+        'notes': rejection_data.get('notes', '')
+    }
+
+def apply_rejection(job, rejection):
+    """
+    Move a validated job to REJECTED in the session (caller commits)
+
+    Returns:
+        dict: job_data for the API response
+    """
+    job.status = 'REJECTED'
+    job.reject_reasons = rejection['reasons']
+    job.last_updated_by = 'staff'
+    job.staff_viewed_at = datetime.utcnow()  # Mark as reviewed during rejection
+    if rejection['notes']:
+        job.notes = f"{job.notes or ''}\n[REJECTION] {rejection['notes']}".strip()
+
+    db.session.add(Event(
+        job_id=job.id,
+        event_type='JobRejected',
+        details={
+            'rejection_reasons': rejection['reasons'],
+            'staff_notes': rejection['notes']
+        },
+        triggered_by='staff'
+    ))
+    queue_job_event('job_updated', job)
+
+    return {
+        'status': job.status,
+        'reject_reasons': rejection['reasons']
+    }
+
+def apply_review(job, reviewed=True):
+    """Mark a job reviewed (or unreviewed) in the session (caller commits)"""
+    job.staff_viewed_at = datetime.utcnow() if reviewed else None
+    job.last_updated_by = 'staff'
+    queue_job_event('job_updated', job)
+
+def parse_bulk_request(payload):
+    """
+    Normalize a bulk action payload into an ordered list of (job_id, params)
+
+    Accepts either 'job_ids': [id, ...] or 'jobs': [id or {'id': ..., <per-job params>}, ...].
+    Duplicate ids keep their first occurrence.
+
+    Raises:
+        JobActionError: if the body is not an object, no jobs are given or the batch is too large
+    """
+    if not isinstance(payload, dict):
+        raise JobActionError('Request body must be a JSON object')
+    entries = payload.get('jobs') or payload.get('job_ids') or []
+    if not isinstance(entries, list) or not entries:
+        raise JobActionError('A non-empty list of jobs is required')
+    if len(entries) > MAX_BULK_JOBS:
+        raise JobActionError(f'At most {MAX_BULK_JOBS} jobs can be processed per request')
+
+    job_requests = {}
+    for entry in entries:
+        if isinstance(entry, dict):
+            job_id, params = entry.get('id'), {k: v for k, v in entry.items() if k != 'id'}
+        else:
+            job_id, params = entry, {}
+        if not isinstance(job_id, str) or not job_id:
+            raise JobActionError('Every job entry needs a string id')
+        job_requests.setdefault(job_id, params)
+    return list(job_requests.items())
+
+def _success(job_id, job_data=None):
+    result = {'job_id': job_id, 'success': True}
+    if job_data is not None:
+        result['job_data'] = job_data
+    return result
+
+def _failure(job_id, error, status_code=400):
+    return {'job_id': job_id, 'success': False, 'error': error, 'status_code': status_code}
+
+def _load_jobs(job_requests):
+    job_ids = [job_id for job_id, _ in job_requests]
+    return {job.id: job for job in Job.query.filter(Job.id.in_(job_ids)).all()}
+
+def _commit_bulk(results):
+    """Commit a bulk action once; on failure fail every applied job"""
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        for job_id, result in results.items():
+            if result['success']:
+                results[job_id] = _failure(job_id, 'Failed to save changes', 500)
+
+def bulk_approve(job_requests, defaults):
+    """
+    Approve many jobs in one transaction
+
+    Each job is validated with its own params layered over the shared defaults,
+    then every status change and StaffApproved event is committed together.
+    Files move to Pending/ in the background after the commit.
+
+    Returns:
+        list: per-job result dicts, in request order
+    """
+    jobs = _load_jobs(job_requests)
+    results = {}
+
+    for job_id, params in job_requests:
+        job = jobs.get(job_id)
+        if not job:
+            results[job_id] = _failure(job_id, 'Job not found', 404)
+            continue
+        try:
+            approval = validate_approval(job, {**defaults, **params})
+        except JobActionError as e:
+            results[job_id] = _failure(job_id, e.message, e.status_code)
+            continue
+        results[job_id] = _success(job_id, apply_approval(job, approval))
+
+    _commit_bulk(results)
+    return [results[job_id] for job_id, _ in job_requests]
+
+def bulk_reject(job_requests, defaults):
+    """
+    Reject many jobs in one transaction
+
+    Returns:
+        list: per-job result dicts, in request order
+    """
+    jobs = _load_jobs(job_requests)
+    results = {}
+
+    for job_id, params in job_requests:
+        job = jobs.get(job_id)
+        if not job:
+            results[job_id] = _failure(job_id, 'Job not found', 404)
+            continue
+        try:
+            rejection = validate_rejection(job, {**defaults, **params})
+        except JobActionError as e:
+            results[job_id] = _failure(job_id, e.message, e.status_code)
+            continue
+        results[job_id] = _success(job_id, apply_rejection(job, rejection))
+
+    _commit_bulk(results)
+    return [results[job_id] for job_id, _ in job_requests]
+
+def bulk_mark_reviewed(job_requests, reviewed=True):
+    """
+    Mark many jobs reviewed (or unreviewed) in one transaction
+
+    Returns:
+        list: per-job result dicts, in request order
+    """
+    jobs = _load_jobs(job_requests)
+    results = {}
+
+    for job_id, _ in job_requests:
+        job = jobs.get(job_id)
+        if not job:
+            results[job_id] = _failure(job_id, 'Job not found', 404)
+            continue
+        apply_review(job, reviewed=reviewed)
+        results[job_id] = _success(job_id)
+
+    _commit_bulk(results)
+    return [results[job_id] for job_id, _ in job_requests]
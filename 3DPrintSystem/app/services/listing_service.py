@@ -0,0 +1,99 @@
+from sqlalchemy import or_, and_
+from app.extensions import db
+from app.models.job import Job
+from app.models.event import Event
+from app.services.serializers import job_listing_query
+from app.services.sync_service import encode_cursor
+
+DEFAULT_PAGE_SIZE = 50
+
+def get_job_page(status, after=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Fetch one page of a dashboard tab, newest first
+
+    Uses keyset pagination on (created_at, id) so every page costs the same
+    index range scan no matter how deep into the tab it is.
+
+    Args:
+        status: Job status for the tab
+        after: Decoded cursor (created_at, job_id) of the last job already shown
+        limit: Maximum number of jobs to return
+
+    Returns:
+        tuple: (job listing rows, cursor for the next page or None if this is the last page)
+    """
+    query = job_listing_query().filter(Job.status == status)
+    if after:
+        after_created_at, after_id = after
+        query = query.filter(
+            or_(
+                Job.created_at < after_created_at,
+                and_(Job.created_at == after_created_at, Job.id < after_id)
+            )
+        )
+
+    # Fetch one extra row to learn whether another page exists
+    jobs = query.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit + 1).all()
+    if len(jobs) <= limit:
+        return jobs, None
+
+    jobs = jobs[:limit]
+    last = jobs[-1]
+    return jobs, encode_cursor(last.created_at, last.id)
+
+def get_identical_jobs(rows):
+    """
+    Find, for each listed job, the earliest other job with byte-identical model bytes
+
+    One indexed IN query on content_hash covers a whole page.
+
+    Returns:
+        dict: job_id -> {'id', 'student_name', 'display_name', 'status'} of the matching job
+    """
+    hashes = {row.content_hash for row in rows if row.content_hash}
+    if not hashes:
+        return {}
+
+    matches = db.session.query(
+        Job.id, Job.content_hash, Job.student_name, Job.display_name, Job.status
+    ).filter(Job.content_hash.in_(hashes)).order_by(Job.created_at, Job.id).all()
+
+    by_hash = {}
+    for match in matches:
+        by_hash.setdefault(match.content_hash, []).append(match)
+
+    identical = {}
+    for row in rows:
+        other = next((m for m in by_hash.get(row.content_hash, []) if m.id != row.id), None)
+        if other:
+            identical[row.id] = {
+                'id': other.id,
+                'student_name': other.student_name,
+                'display_name': other.display_name,
+                'status': other.status
+            }
+    return identical
+
+def get_printability_results(rows):
+    """
+    Printability results recorded on each listed job's JobCreated event
+
+    One IN query on the (job_id, timestamp) event index covers a whole page.
+
+    Returns:
+        dict: job_id -> {'passed', 'printer', 'issues', ...}; jobs submitted
+        before the checks existed (or whose check failed) are omitted
+    """
+    job_ids = [row.id for row in rows]
+    if not job_ids:
+        return {}
+
+    events = db.session.query(Event.job_id, Event.details).filter(
+        Event.job_id.in_(job_ids),
+        Event.event_type == 'JobCreated'
+    ).all()
+    return {
+        event.job_id: event.details['printability']
+        for event in events
+        if event.details and event.details.get('printability')
+    }
@@ -0,0 +1,274 @@
+import io
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+import numpy as np
+from app.services.file_service import get_model_filename, is_archived, open_stored_file
+
+# Solid-part densities used for weight estimates; staff can still adjust the
+# prefilled value for infill, supports and wall settings
+MATERIAL_DENSITIES_G_PER_CM3 = {
+    'Filament': 1.24,  # PLA
+    'Resin': 1.12,     # Standard photopolymer resin
+}
+
+BINARY_STL_HEADER_BYTES = 84
+BINARY_STL_DTYPE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attribute', '<u2'),
+])  # 50 bytes per facet, packed
+MEASURE_CHUNK_TRIANGLES = 1 << 16  # ~4.7 MB of float64 vertices per slice
+
+# 3MF files declare their unit on <model>; everything is reported in mm
+THREEMF_UNIT_TO_MM = {
+    'micron': 0.001,
+    'millimeter': 1.0,
+    'centimeter': 10.0,
+    'inch': 25.4,
+    'foot': 304.8,
+    'meter': 1000.0,
+}
+
+STL_VERTEX_PATTERN = re.compile(
+    rb'vertex\s+([-+0-9.eE]+)\s+([-+0-9.eE]+)\s+([-+0-9.eE]+)'
+)
+
+class MeshAnalysisError(Exception):
+    """A model file that cannot be parsed as a triangle mesh"""
+
+def _is_binary_stl(path):
+    size = os.path.getsize(path)
+    if size < BINARY_STL_HEADER_BYTES:
+        return False
+    with open(path, 'rb') as f:
+        f.seek(80)
+        triangle_count = int.from_bytes(f.read(4), 'little')
+    # ASCII files can start with "solid" too, so trust the size arithmetic instead
+    return size == BINARY_STL_HEADER_BYTES + triangle_count * BINARY_STL_DTYPE.itemsize
+
+def load_stl_triangles(path):
+    """
+    Read an STL file as an (n, 3, 3) array of triangle vertices in mm
+
+    Binary files are memory-mapped as a structured array, so the OS pages the
+    facets in on demand and nothing is parsed in Python.
+    """
+    if _is_binary_stl(path):
+        if os.path.getsize(path) == BINARY_STL_HEADER_BYTES:
+            return np.empty((0, 3, 3), dtype=np.float32)
+        facets = np.memmap(path, dtype=BINARY_STL_DTYPE, mode='r', offset=BINARY_STL_HEADER_BYTES)
+        return facets['vertices']
+
+    with open(path, 'rb') as f:
+        return _parse_ascii_stl(f.read())
+
+def _parse_ascii_stl(data):
+    coordinates = STL_VERTEX_PATTERN.findall(data)
+    if len(coordinates) % 3:
+        raise MeshAnalysisError('ASCII STL has an incomplete facet')
+    return np.array(coordinates, dtype=np.float64).reshape(-1, 3, 3)
+
+def _parse_stl_bytes(data):
+    """Parse an STL already in memory (e.g. decompressed from the archive)"""
+    if len(data) >= BINARY_STL_HEADER_BYTES:
+        triangle_count = int.from_bytes(data[80:84], 'little')
+        if len(data) == BINARY_STL_HEADER_BYTES + triangle_count * BINARY_STL_DTYPE.itemsize:
+            return np.frombuffer(data, dtype=BINARY_STL_DTYPE, offset=BINARY_STL_HEADER_BYTES)['vertices']
+    return _parse_ascii_stl(data)
+
+def _obj_index(token, vertex_count):
+    # Face tokens look like v, v/vt, v//vn or v/vt/vn; negative indices count back from the end
+    index = int(token.split('/', 1)[0])
+    return index - 1 if index > 0 else vertex_count + index
+
+def load_obj_triangles(path):
+    """Read an OBJ file as an (n, 3, 3) array; polygons are fan-triangulated"""
+    with open(path, 'r', errors='replace') as f:
+        return _parse_obj_lines(f)
+
+def _parse_obj_lines(lines):
+    vertices = []
+    faces = []
+    for line in lines:
+        if line.startswith('v '):
+            vertices.append(line.split()[1:4])
+        elif line.startswith('f '):
+            indices = [_obj_index(token, len(vertices)) for token in line.split()[1:]]
+            faces.extend((indices[0], indices[i], indices[i + 1]) for i in range(1, len(indices) - 1))
+    if not faces:
+        return np.empty((0, 3, 3), dtype=np.float64)
+    vertex_array = np.array(vertices, dtype=np.float64)
+    return vertex_array[np.array(faces, dtype=np.int64)]
+
+def load_3mf_triangles(path):
+    """
+    Read every mesh in a 3MF package (a path or seekable file) as an (n, 3, 3) array in mm
+
+    The model XML is parsed incrementally straight from the zip member, and
+    each mesh's elements are cleared once read, so large packages are never
+    decompressed to disk or held as a full XML tree. Each mesh object is
+    counted once; build-item transforms and repeated instances are ignored.
+    """
+    try:
+        package = zipfile.ZipFile(path)
+    except zipfile.BadZipFile:
+        raise MeshAnalysisError('3MF file is not a valid zip package')
+
+    with package:
+        model_names = [name for name in package.namelist() if name.lower().endswith('.model')]
+        if not model_names:
+            raise MeshAnalysisError('3MF package has no model part')
+
+        meshes = []
+        for model_name in model_names:
+            scale = 1.0
+            vertices, triangles = [], []
+            with package.open(model_name) as stream:
+                for event, element in ET.iterparse(stream, events=('start', 'end')):
+                    tag = element.tag.rsplit('}', 1)[-1]
+                    if event == 'start':
+                        if tag == 'model':
+                            scale = THREEMF_UNIT_TO_MM.get(element.get('unit', 'millimeter'), 1.0)
+                        continue
+                    if tag == 'vertex':
+                        vertices.append((element.get('x'), element.get('y'), element.get('z')))
+                    elif tag == 'triangle':
+                        triangles.append((element.get('v1'), element.get('v2'), element.get('v3')))
+                    elif tag == 'mesh':
+                        if triangles:
+                            vertex_array = np.array(vertices, dtype=np.float64) * scale
+                            meshes.append(vertex_array[np.array(triangles, dtype=np.int64)])
+                        vertices, triangles = [], []
+                        element.clear()
+
+    if not meshes:
+        return np.empty((0, 3, 3), dtype=np.float64)
+    return np.concatenate(meshes)
+
+def load_archived_triangles(path):
+    """
+    Read an archived model, decompressing it as a stream
+
+    OBJ lines are parsed as they decompress; STL and 3MF need the whole
+    model (3MF is a zip, which must seek), so they are decompressed into
+    memory, never to disk.
+    """
+    ext = os.path.splitext(get_model_filename(path))[1].lower()
+    if ext not in ('.stl', '.obj', '.3mf'):
+        raise MeshAnalysisError(f'Unsupported model format: {ext}')
+    with open_stored_file(path) as stream:
+        if ext == '.obj':
+            return _parse_obj_lines(io.TextIOWrapper(stream, errors='replace'))
+        data = stream.read()
+    if ext == '.stl':
+        return _parse_stl_bytes(data)
+    return load_3mf_triangles(io.BytesIO(data))
+
+def load_triangles(path):
+    """Dispatch on file extension to the matching loader"""
+    if is_archived(path):
+        return load_archived_triangles(path)
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.stl':
+        return load_stl_triangles(path)
+    if ext == '.obj':
+        return load_obj_triangles(path)
+    if ext == '.3mf':
+        return load_3mf_triangles(path)
+    raise MeshAnalysisError(f'Unsupported model format: {ext}')
+
+def _cross(a, b):
+    # Cross product of vectors stored as (x, y, z) component arrays
+    ax, ay, az = a
+    bx, by, bz = b
+    return ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx
+
+def measure_triangles(triangles, chunk_size=MEASURE_CHUNK_TRIANGLES):
+    """
+    Compute mesh measurements from an (n, 3, 3) triangle array in mm
+
+    Volume is the sum of signed tetrahedra formed by each facet and the origin
+    (divergence theorem); it is exact for closed meshes whatever their
+    position. Facets are processed in fixed-size slices accumulated in
+    float64, so a memory-mapped file is read once and peak memory stays
+    bounded however large the mesh is.
+
+    Returns:
+        dict: triangle_count, volume_cm3, surface_area_cm2, bounding_box_mm
+    """
+    triangle_count = len(triangles)
+    if triangle_count == 0:
+        raise MeshAnalysisError('Model contains no triangles')
+
+    signed_volume = 0.0
+    area = 0.0
+    minimum = np.full(3, np.inf)
+    maximum = np.full(3, -np.inf)
+    for start in range(0, triangle_count, chunk_size):
+        # Component-major layout: corners[vertex][axis] is a contiguous 1-D array
+        corners = np.ascontiguousarray(
+            np.asarray(triangles[start:start + chunk_size], dtype=np.float64).transpose(1, 2, 0)
+        )
+        v0, v1, v2 = corners
+        cx, cy, cz = _cross(v1, v2)
+        signed_volume += float(np.dot(v0[0], cx) + np.dot(v0[1], cy) + np.dot(v0[2], cz))
+        nx, ny, nz = _cross(v1 - v0, v2 - v0)
+        area += float(np.sqrt(nx * nx + ny * ny + nz * nz).sum())
+        minimum = np.minimum(minimum, corners.min(axis=(0, 2)))
+        maximum = np.maximum(maximum, corners.max(axis=(0, 2)))
+
+    volume_mm3 = abs(signed_volume) / 6.0
+    size = maximum - minimum
+    return {
+        'triangle_count': int(triangle_count),
+        'volume_cm3': round(float(volume_mm3) / 1000.0, 3),
+        'surface_area_cm2': round(float(area) / 200.0, 3),
+        'bounding_box_mm': {
+            'x': round(float(size[0]), 2),
+            'y': round(float(size[1]), 2),
+            'z': round(float(size[2]), 2),
+        }
+    }
+
+def estimate_weights(volume_cm3):
+    """Solid-part weight in grams for each material"""
+    return {
+        material: round(volume_cm3 * density, 1)
+        for material, density in MATERIAL_DENSITIES_G_PER_CM3.items()
+    }
+
+def analyze_mesh(path):
+    """
+    Parse a model file and measure it
+
+    Returns:
+        dict: triangle_count, volume_cm3, surface_area_cm2, bounding_box_mm
+        ({'x', 'y', 'z'}) and estimated_weight_g ({material: grams})
+
+    Raises:
+        MeshAnalysisError: if the file cannot be read as a mesh
+    """
+    try:
+        triangles = load_triangles(path)
+    except (ValueError, IndexError, ET.ParseError) as e:
+        raise MeshAnalysisError(f'Could not parse model: {e}')
+    analysis = measure_triangles(triangles)
+    analysis['estimated_weight_g'] = estimate_weights(analysis['volume_cm3'])
+    return analysis
+
+def analysis_failure(error):
+    """
+    What to store in Job.mesh_analysis when a model cannot be measured
+
+    Recording the failure means the file is parsed once, not again every
+    time staff open the approval modal.
+    """
+    return {'error': str(error)}
+
+def suggested_weight(analysis, material):
+    """Weight to prefill for a job's material, or None if there is no estimate"""
+    if not analysis or 'error' in analysis:
+        return None
+    return analysis.get('estimated_weight_g', {}).get(material)
@@ -0,0 +1,190 @@
+import json
+import os
+import threading
+from itertools import chain
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models.job import Job
+from app.services.file_service import STATUS_DIRECTORIES
+from app.tasks.queue import PRIORITY_LOW, enqueue, uses_task_queue
+
+# METADATA_EXPORT modes
+EXPORT_MANIFEST = 'manifest'  # Periodic per-folder manifest, written off the request path
+EXPORT_SIDECAR = 'sidecar'    # Legacy: one .metadata.json written with every upload
+EXPORT_OFF = 'off'
+
+MANIFEST_FILENAME = '.metadata-manifest.jsonl'  # Hidden, so folder scans skip it
+EXPORT_BATCH_SIZE = 500
+DIRTY_FOLDERS_KEY = 'dirty_manifest_folders'
+EXPORT_MANIFEST_TASK = 'storage.export_manifest'
+
+def get_export_mode():
+    return current_app.config.get('METADATA_EXPORT', EXPORT_MANIFEST)
+
+def get_manifest_path(folder, storage_root=None):
+    if storage_root is None:
+        storage_root = current_app.config.get('APP_STORAGE_ROOT', 'storage')
+    return os.path.join(storage_root, folder, MANIFEST_FILENAME)
+
+def resolve_metadata_path(job, storage_root=None):
+    """
+    Where a job's metadata lives on disk
+
+    Jobs from before manifests keep their own sidecar; every other job is a
+    line (keyed by job_id) in its status folder's manifest. None if the
+    status has no folder.
+    """
+    if job.metadata_path:
+        return job.metadata_path
+    folder = STATUS_DIRECTORIES.get(job.status)
+    return get_manifest_path(folder, storage_root) if folder else None
+
+def build_job_metadata(job):
+    """The fields the per-upload sidecar used to carry, read from the job row"""
+    return {
+        'job_id': job.id,
+        'original_filename': job.original_filename,
+        'display_name': job.display_name,
+        'file_path': job.file_path,
+        'file_sha256': job.content_hash,
+        'student_name': job.student_name,
+        'student_email': job.student_email,
+        'discipline': job.discipline,
+        'class_number': job.class_number,
+        'print_method': job.material,
+        'color_preference': job.color,
+        'printer_selection': job.printer,
+        'acknowledged_minimum_charge': bool(job.acknowledged_minimum_charge),
+        'submission_timestamp_utc': job.created_at.isoformat() if job.created_at else None,
+        'status': job.status
+    }
+
+def export_manifest(folder, storage_root=None, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Rewrite one status folder's manifest as JSON Lines, one job per line
+
+    Jobs are streamed from the database in batches and the file is replaced
+    atomically, so readers see the old or the new manifest, never a mix.
+
+    Returns:
+        int: number of jobs written
+    """
+    statuses = [status for status, status_folder in STATUS_DIRECTORIES.items() if status_folder == folder]
+    manifest_path = get_manifest_path(folder, storage_root)
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+
+    count = 0
+    query = select(Job).where(Job.status.in_(statuses)).order_by(Job.created_at, Job.id)
+    with open(temp_path, 'w') as f:
+        for job in db.session.execute(query.execution_options(yield_per=batch_size)).scalars():
+            f.write(json.dumps(build_job_metadata(job)) + '\n')
+            count += 1
+    os.replace(temp_path, manifest_path)
+    return count
+
+class MetadataExporter:
+    """
+    Rewrites manifests for folders whose jobs changed, in one background pass
+
+    Commits only mark folders dirty; a daemon thread wakes every
+    METADATA_EXPORT_INTERVAL_SECONDS and exports each dirty folder once, so a
+    burst of uploads and approvals costs one manifest write per folder. With
+    an interval of 0 nothing runs in the background; call flush() instead.
+    With a task queue configured, each dirty folder is instead one delayed,
+    deduplicated export task.
+    """
+
+    def __init__(self):
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def mark_dirty(self, folders):
+        if not folders:
+            return
+        app = current_app._get_current_object()
+        interval = app.config.get('METADATA_EXPORT_INTERVAL_SECONDS', 60)
+        if uses_task_queue():
+            # One delayed export per folder absorbs every change until it runs
+            for folder in sorted(folders):
+                enqueue(EXPORT_MANIFEST_TASK, {'folder': folder}, priority=PRIORITY_LOW,
+                        countdown=interval, dedupe_key=f"manifest:{folder}")
+            return
+        with self._lock:
+            self._dirty.update(folders)
+        if interval > 0:
+            self._ensure_thread(app)
+
+    def _ensure_thread(self, app):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, args=(app,), name='metadata-export', daemon=True)
+                self._thread.start()
+
+    def _run(self, app):
+        interval = app.config.get('METADATA_EXPORT_INTERVAL_SECONDS', 60)
+        while not self._wake.wait(interval):
+            with app.app_context():
+                try:
+                    self.flush()
+                except Exception as e:
+                    app.logger.error(f"Metadata manifest export failed: {str(e)}")
+                finally:
+                    db.session.remove()
+
+    def flush(self, storage_root=None):
+        """
+        Export every dirty folder now
+
+        Returns:
+            dict: folder -> number of jobs written
+        """
+        with self._lock:
+            folders, self._dirty = self._dirty, set()
+        written = {}
+        try:
+            for folder in sorted(folders):
+                written[folder] = export_manifest(folder, storage_root)
+        except Exception:
+            with self._lock:
+                self._dirty.update(set(folders) - set(written))  # Retry on the next pass
+            raise
+        return written
+
+    @property
+    def dirty_folders(self):
+        with self._lock:
+            return set(self._dirty)
+
+# Shared per-process exporter
+metadata_exporter = MetadataExporter()
+
+def export_all_manifests(storage_root=None):
+    """Write every status folder's manifest (e.g. once after switching modes)"""
+    return {folder: export_manifest(folder, storage_root) for folder in sorted(set(STATUS_DIRECTORIES.values()))}
+
+@event.listens_for(Session, 'after_flush')
+def _collect_dirty_folders(session, flush_context):
+    # Inserts and status changes alter manifests; record both the old and new folder
+    folders = session.info.setdefault(DIRTY_FOLDERS_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, Job):
+            continue
+        history = db.inspect(obj).attrs.status.history
+        for status in chain(history.added or (), history.deleted or (), [obj.status]):
+            if status in STATUS_DIRECTORIES:
+                folders.add(STATUS_DIRECTORIES[status])
+
+@event.listens_for(Session, 'after_commit')
+def _mark_manifests_dirty(session):
+    folders = session.info.pop(DIRTY_FOLDERS_KEY, None)
+    if folders and has_app_context() and get_export_mode() == EXPORT_MANIFEST:
+        metadata_exporter.mark_dirty(folders)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_dirty_folders(session):
+    session.info.pop(DIRTY_FOLDERS_KEY, None)
@@ -0,0 +1,193 @@
+import json
+import os
+import time
+import uuid
+from flask import current_app
+from app.extensions import db
+from app.models.job import Job
+from app.services.file_service import get_move_targets
+
+JOURNAL_DIR_NAME = '.journal'
+
+def get_journal_dir(storage_root=None):
+    if storage_root is None:
+        storage_root = current_app.config.get('APP_STORAGE_ROOT', 'storage')
+    return os.path.join(storage_root, JOURNAL_DIR_NAME)
+
+def fsync_directory(path):
+    """Persist a directory's entries (renames, creates) to disk"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # Windows cannot open directories; NTFS journals metadata itself
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _write_entry(path, entry):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(entry, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    fsync_directory(os.path.dirname(path))
+
+def _apply_renames(renames):
+    """Rename each pair that has not happened yet; safe to repeat"""
+    for source, destination in renames:
+        if os.path.exists(source) and not os.path.exists(destination):
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.rename(source, destination)
+    for directory in {os.path.dirname(path) for pair in renames for path in pair}:
+        fsync_directory(directory)
+
+def _reverse(renames):
+    return [(destination, source) for source, destination in reversed(renames)]
+
+class JournaledMove:
+    """
+    A status-directory move whose intent is on disk until the DB commit settles
+
+    Call complete() after the commit succeeds or roll_back() after it fails.
+    If the process dies first, recover_moves() finishes the job on restart.
+    """
+
+    def __init__(self, job_id, renames, journal_path):
+        self.job_id = job_id
+        self.renames = renames
+        self.journal_path = journal_path
+
+    @property
+    def new_path(self):
+        return self.renames[0][1]
+
+    @property
+    def new_metadata_path(self):
+        return self.renames[1][1] if len(self.renames) > 1 else None
+
+    def complete(self):
+        """Forget the move once the new paths are committed"""
+        try:
+            os.remove(self.journal_path)
+            fsync_directory(os.path.dirname(self.journal_path))
+        except FileNotFoundError:
+            pass
+
+    def roll_back(self):
+        """Put the files back where the database still says they are"""
+        _apply_renames(_reverse(self.renames))
+        self.complete()
+
+def begin_move(job_id, current_path, from_status, to_status, storage_root=None, metadata_path=None,
+               created_at=None):
+    """
+    Journal, then perform, a job's move between status directories
+
+    metadata_path is the job's recorded sidecar, if it has one; it moves with
+    the model. created_at (the job's submission time) picks the shard under
+    the date layout.
+
+    The intent (every source and destination) is fsynced before any rename,
+    and both directories are fsynced after, so a crash at any point leaves
+    enough on disk to restore the model and its sidecar to one folder.
+
+    Returns:
+        JournaledMove: the performed move; the caller commits, then calls
+        complete() or roll_back()
+
+    Raises:
+        FileNotFoundError: if the job's file is missing
+        FileExistsError: if the destination folder already has that name
+        OSError: if a rename fails (files already moved are put back)
+    """
+    renames = get_move_targets(current_path, to_status, storage_root, metadata_path, created_at)
+    for _, destination in renames:
+        if os.path.exists(destination):
+            raise FileExistsError(f"Destination already exists: {destination}")
+    journal_dir = get_journal_dir(storage_root)
+    os.makedirs(journal_dir, exist_ok=True)
+    journal_path = os.path.join(journal_dir, f"{uuid.uuid4().hex}.json")
+    _write_entry(journal_path, {
+        'job_id': job_id,
+        'from_status': from_status,
+        'to_status': to_status,
+        'renames': renames,
+        'created_at': time.time()
+    })
+
+    move = JournaledMove(job_id, renames, journal_path)
+    try:
+        _apply_renames(renames)
+    except OSError:
+        move.roll_back()
+        raise
+    return move
+
+def pending_move_job_ids(storage_root=None):
+    """Jobs with a move in the journal, i.e. one that has not settled yet"""
+    journal_dir = get_journal_dir(storage_root)
+    if not os.path.isdir(journal_dir):
+        return set()
+    job_ids = set()
+    for filename in os.listdir(journal_dir):
+        if not filename.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(journal_dir, filename)) as f:
+                job_ids.add(json.load(f)['job_id'])
+        except (OSError, ValueError, KeyError):
+            continue  # Completed (removed) while listing
+    return job_ids
+
+def recover_moves(storage_root=None, min_age_seconds=0):
+    """
+    Settle moves left in the journal by a crash
+
+    A move whose job row already points at the destination was committed and
+    is rolled forward; any other move is rolled back to its source. Entries
+    younger than min_age_seconds are left alone, since in a multi-process
+    deployment they may belong to a live request.
+
+    Returns:
+        dict: counts of 'rolled_forward' and 'rolled_back' moves
+    """
+    counts = {'rolled_forward': 0, 'rolled_back': 0}
+    journal_dir = get_journal_dir(storage_root)
+    if not os.path.isdir(journal_dir):
+        return counts
+
+    logger = current_app.logger
+    for filename in sorted(os.listdir(journal_dir)):
+        journal_path = os.path.join(journal_dir, filename)
+        if not filename.endswith(('.json', '.tmp')):
+            continue
+        if time.time() - os.path.getmtime(journal_path) < min_age_seconds:
+            continue
+        if filename.endswith('.tmp'):
+            os.remove(journal_path)  # Intent never became durable, so no rename happened
+            continue
+
+        with open(journal_path) as f:
+            entry = json.load(f)
+        renames = [tuple(pair) for pair in entry['renames']]
+        move = JournaledMove(entry['job_id'], renames, journal_path)
+        job = db.session.get(Job, entry['job_id'])
+        committed = job is not None and job.file_path and (
+            os.path.normpath(job.file_path) == os.path.normpath(move.new_path)
+        )
+        if committed:
+            _apply_renames(renames)
+            move.complete()
+            counts['rolled_forward'] += 1
+        else:
+            move.roll_back()
+            counts['rolled_back'] += 1
+        logger.warning(
+            f"Recovered interrupted move of job {entry['job_id'][:8]} to {entry['to_status']}: "
+            f"{'rolled forward' if committed else 'rolled back'}"
+        )
+    return counts
@@ -0,0 +1,272 @@
+import atexit
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+import numpy as np
+from flask import current_app
+from app.services.mesh_service import MeshAnalysisError, load_triangles
+
+# Build volumes (W x D x H, mm) for the printers the submission form offers, plus
+# older choices still recorded on existing jobs
+PRINTER_BUILD_VOLUMES_MM = {
+    'Prusa MK4S': (250.0, 210.0, 220.0),
+    'Prusa Mini': (180.0, 180.0, 180.0),
+    'Prusa XL': (360.0, 360.0, 360.0),
+    'Bambu A1 Mini': (180.0, 180.0, 180.0),
+    'Bambu X1 Carbon': (256.0, 256.0, 256.0),
+    'Raise3D Pro 2 Plus': (305.0, 305.0, 605.0),
+    'Formlabs Form 3': (145.0, 145.0, 175.0),
+    'Formlabs Form 3L': (335.0, 200.0, 300.0),
+}
+
+def _printer_key(printer):
+    """'Prusa MK4S' and the legacy 'prusa_mk4s' both become 'prusamk4s'"""
+    return re.sub(r'[^a-z0-9]', '', (printer or '').lower())
+
+_BUILD_VOLUMES_BY_KEY = {_printer_key(name): volume for name, volume in PRINTER_BUILD_VOLUMES_MM.items()}
+
+def get_build_volume(printer):
+    """
+    Returns:
+        tuple: the printer's (W, D, H) in mm, or None for an unknown printer
+    """
+    return _BUILD_VOLUMES_BY_KEY.get(_printer_key(printer))
+
+WELD_TOLERANCE_MM = 1e-3  # Corners closer than this (1 micron) are the same vertex
+DEGENERATE_AREA_MM2 = 1e-8  # Facets smaller than this have no printable surface
+
+SEVERITY_ERROR = 'error'
+SEVERITY_WARNING = 'warning'
+
+def weld_vertices(triangles, tolerance=WELD_TOLERANCE_MM):
+    """
+    Index a triangle soup: STL stores every corner separately
+
+    Corners are snapped to a tolerance grid and each distinct grid point gets
+    one index, so facets that share a corner share its index. Grid points are
+    packed into one int64 key (21 bits per axis, about 2 m at the default
+    tolerance) so np.unique sorts plain integers; larger models fall back to
+    comparing whole rows.
+
+    Returns:
+        numpy.ndarray: (n, 3) int64 vertex indices per triangle
+    """
+    grid = np.round(np.asarray(triangles, dtype=np.float32).reshape(-1, 3) / np.float32(tolerance)).astype(np.int64)
+    grid -= grid.min(axis=0)
+    if grid.max() < 1 << 21:
+        keys = (grid[:, 0] << 42) | (grid[:, 1] << 21) | grid[:, 2]
+    else:
+        keys = np.ascontiguousarray(grid).view(np.dtype((np.void, grid.dtype.itemsize * 3))).ravel()
+    _, indices = np.unique(keys, return_inverse=True)
+    return indices.reshape(-1, 3).astype(np.int64)
+
+def _edge_keys(faces, vertex_count):
+    """Directed edge keys a * V + b for every facet edge (a -> b, winding order)"""
+    start = faces.ravel()
+    end = faces[:, [1, 2, 0]].ravel()
+    return start, end, start * vertex_count + end
+
+def check_degenerate_faces(triangles, faces):
+    """Facets with a repeated corner or (near) zero area"""
+    corners = np.asarray(triangles, dtype=np.float32)
+    # Edge vectors are widened after subtracting, so tiny areas stay exact without a float64 copy of the mesh
+    first = (corners[:, 1] - corners[:, 0]).astype(np.float64)
+    second = (corners[:, 2] - corners[:, 0]).astype(np.float64)
+    areas = np.linalg.norm(np.cross(first, second), axis=1) / 2
+    collapsed = (faces[:, 0] == faces[:, 1]) | (faces[:, 1] == faces[:, 2]) | (faces[:, 2] == faces[:, 0])
+    count = int((collapsed | (areas < DEGENERATE_AREA_MM2)).sum())
+    if not count:
+        return []
+    return [{
+        'code': 'degenerate_faces',
+        'severity': SEVERITY_WARNING,
+        'count': count,
+        'message': f'{count} degenerate or zero-area triangle(s)'
+    }]
+
+def check_edges(faces):
+    """
+    Manifold and winding checks from an edge table
+
+    Every edge is keyed min * V + max and counted with one np.unique pass.
+    A closed manifold surface uses each edge exactly twice; once means a hole,
+    more than twice means non-manifold geometry. Two neighbours traverse a
+    shared edge in opposite directions when their normals agree, so a
+    directed key seen twice marks flipped facets.
+    """
+    faces = faces[(faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])]
+    if not len(faces):
+        return []
+    vertex_count = int(faces.max()) + 1
+    start, end, directed = _edge_keys(faces, vertex_count)
+    undirected = np.minimum(start, end) * vertex_count + np.maximum(start, end)
+
+    _, edge_uses = np.unique(undirected, return_counts=True)
+    issues = []
+    open_edges = int((edge_uses == 1).sum())
+    if open_edges:
+        issues.append({
+            'code': 'open_edges',
+            'severity': SEVERITY_ERROR,
+            'count': open_edges,
+            'message': f'{open_edges} open edge(s); the model is not watertight'
+        })
+    non_manifold = int((edge_uses > 2).sum())
+    if non_manifold:
+        issues.append({
+            'code': 'non_manifold_edges',
+            'severity': SEVERITY_ERROR,
+            'count': non_manifold,
+            'message': f'{non_manifold} non-manifold edge(s) shared by more than two faces'
+        })
+
+    _, direction_uses = np.unique(directed, return_counts=True)
+    flipped = int((direction_uses > 1).sum())
+    if flipped:
+        issues.append({
+            'code': 'inconsistent_normals',
+            'severity': SEVERITY_WARNING,
+            'count': flipped,
+            'message': f'{flipped} edge(s) between faces with inconsistent normals'
+        })
+    return issues
+
+def check_orientation(triangles):
+    """A closed mesh whose signed volume is negative has every normal pointing inward"""
+    corners = np.asarray(triangles, dtype=np.float32)
+    signed_volume = float(np.einsum('ij,ij->', corners[:, 0], np.cross(corners[:, 1], corners[:, 2]),
+                                    dtype=np.float64)) / 6
+    if signed_volume >= 0:
+        return []
+    return [{
+        'code': 'inverted_normals',
+        'severity': SEVERITY_WARNING,
+        'count': None,
+        'message': 'Normals point inward (the model is inside out)'
+    }]
+
+def check_build_volume(triangles, printer):
+    """Whether the bounding box fits the printer in some axis-aligned orientation"""
+    build_volume = get_build_volume(printer)
+    if build_volume is None:
+        return []
+    corners = np.asarray(triangles).reshape(-1, 3)
+    size = corners.max(axis=0).astype(np.float64) - corners.min(axis=0)
+    # Largest model side against the largest printer side, and so on down
+    if np.all(np.sort(size) <= np.sort(build_volume)):
+        return []
+    dimensions = ' x '.join(f'{value:.0f}' for value in size)
+    limits = ' x '.join(f'{value:.0f}' for value in build_volume)
+    return [{
+        'code': 'exceeds_build_volume',
+        'severity': SEVERITY_ERROR,
+        'count': None,
+        'message': f'Model is {dimensions} mm; the printer fits {limits} mm'
+    }]
+
+class PrintabilityChecker:
+    """
+    Runs the printability checks concurrently in a shared thread pool
+
+    The NumPy kernels release the GIL, so the checks for one submission run
+    side by side and the pool is shared by every request thread. The pool is
+    created on first use and sized by PRINTABILITY_WORKERS.
+
+    Meshes are checked as float32 (binary STLs straight from the memmap).
+    Models over PRINTABILITY_MAX_TRIANGLES get only the bounding-box check,
+    and checks still queued at the timeout are cancelled, so one huge upload
+    cannot hold the pool and stall later submissions.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._max_workers = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self, max_workers):
+        with self._lock:
+            if self._executor is None or self._max_workers != max_workers:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='printability')
+                self._max_workers = max_workers
+            return self._executor
+
+    def check(self, path, printer=None):
+        """
+        Check a model file for problems that would stop it printing
+
+        Returns:
+            dict: passed (no error-severity issues), printer, and issues, a
+            list of {'code', 'severity', 'count', 'message'}
+
+        Raises:
+            MeshAnalysisError: if the file cannot be read as a mesh
+        """
+        config = current_app.config
+        try:
+            triangles = np.asarray(load_triangles(path), dtype=np.float32)
+        except (ValueError, IndexError) as e:
+            raise MeshAnalysisError(f'Could not parse model: {e}')
+        if not len(triangles):
+            raise MeshAnalysisError('Model contains no triangles')
+
+        max_triangles = config.get('PRINTABILITY_MAX_TRIANGLES', 1_000_000)
+        if len(triangles) > max_triangles:
+            issues = check_build_volume(triangles, printer)
+            issues.append({
+                'code': 'too_large_to_check',
+                'severity': SEVERITY_WARNING,
+                'count': int(len(triangles)),
+                'message': f'Over {max_triangles} triangles; only the size was checked, review the geometry manually'
+            })
+            return self._result(issues, printer, triangles)
+
+        executor = self._get_executor(max(config.get('PRINTABILITY_WORKERS', 4), 1))
+        faces_future = executor.submit(weld_vertices, triangles)
+        futures = [
+            executor.submit(check_build_volume, triangles, printer),
+            executor.submit(check_orientation, triangles),
+            executor.submit(lambda: check_degenerate_faces(triangles, faces_future.result())),
+            executor.submit(lambda: check_edges(faces_future.result())),
+        ]
+        done, not_done = wait(futures, timeout=config.get('PRINTABILITY_TIMEOUT_SECONDS', 10))
+        # Free the pool for the next submission; checks already running finish on their own
+        for future in [faces_future, *not_done]:
+            future.cancel()
+
+        issues = []
+        for future in futures:
+            if future in done:
+                issues.extend(future.result())
+        if not_done:
+            issues.append({
+                'code': 'check_timeout',
+                'severity': SEVERITY_WARNING,
+                'count': len(not_done),
+                'message': 'Some checks did not finish in time; review the model manually'
+            })
+        return self._result(issues, printer, triangles)
+
+    @staticmethod
+    def _result(issues, printer, triangles):
+        return {
+            'passed': not any(issue['severity'] == SEVERITY_ERROR for issue in issues),
+            'printer': printer,
+            'triangle_count': int(len(triangles)),
+            'issues': issues
+        }
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=not wait)
+                self._executor = None
+
+# Shared per-process checker pool
+printability_checker = PrintabilityChecker()
+atexit.register(printability_checker.shutdown, wait=False)
+
+def check_printability(path, printer=None):
+    """Run every printability check on a model file (see PrintabilityChecker.check)"""
+    return printability_checker.check(path, printer)
@@ -0,0 +1,361 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from app.extensions import db
+from app.models.job import Job
+from app.services.file_service import (
+    ALLOWED_EXTENSIONS,
+    ARCHIVE_DIRECTORY,
+    METADATA_SUFFIX,
+    STATUS_DIRECTORIES,
+    get_model_filename,
+    get_status_directory,
+    is_archived,
+)
+from app.services.move_journal import begin_move, pending_move_job_ids
+
+ORPHAN_DIR_NAME = '.orphans'
+DEFAULT_WORKERS = 8
+DEFAULT_BATCH_SIZE = 1000
+SAMPLE_LIMIT = 50  # Example paths kept per finding; counts are always exact
+
+FINDINGS = ('orphans', 'misplaced', 'duplicates', 'status_mismatch', 'missing')
+
+_WALK_DONE = object()
+
+def iter_file_batches(directories, workers=DEFAULT_WORKERS, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Walk directory trees in parallel, yielding lists of file paths
+
+    Worker threads share a queue of directories and read each with
+    os.scandir, which returns entry types without a stat per file. Batches go
+    through a bounded queue, so a slow consumer throttles the walk and memory
+    stays at a few batches however many files there are. Hidden directories
+    (journal, staging, orphans) are skipped.
+    """
+    directories = [directory for directory in directories if os.path.isdir(directory)]
+    if not directories:
+        return
+
+    output = queue.Queue(maxsize=workers * 2)
+    todo = queue.Queue()
+    stop = threading.Event()
+    lock = threading.Lock()
+    remaining = [len(directories)]
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                output.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def finish_directory():
+        with lock:
+            remaining[0] -= 1
+            finished = remaining[0] == 0
+        if finished:
+            for _ in range(workers):
+                todo.put(None)
+
+    def work():
+        try:
+            while True:
+                directory = todo.get()
+                if directory is None or stop.is_set():
+                    return
+                batch = []
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.name.startswith('.'):
+                                continue
+                            if entry.is_dir(follow_symlinks=False):
+                                with lock:
+                                    remaining[0] += 1
+                                todo.put(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                batch.append(entry.path)
+                                if len(batch) >= batch_size:
+                                    put(batch)
+                                    batch = []
+                except FileNotFoundError:
+                    pass  # Removed while walking
+                if batch:
+                    put(batch)
+                finish_directory()
+        finally:
+            put(_WALK_DONE)
+
+    for directory in directories:
+        todo.put(directory)
+    threads = [threading.Thread(target=work, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        finished = 0
+        while finished < workers:
+            item = output.get()
+            if item is _WALK_DONE:
+                finished += 1
+            else:
+                yield item
+    finally:
+        stop.set()
+        for _ in range(workers):
+            todo.put(None)
+
+def _same_path(a, b):
+    return bool(a and b) and os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+def _candidate_names(path):
+    """Job display names a file could belong to: itself, its archived model, or a sidecar's model"""
+    name = get_model_filename(path)
+    if name.endswith(METADATA_SUFFIX):
+        stem = name[:-len(METADATA_SUFFIX)]
+        return [f"{stem}{ext}" for ext in sorted(ALLOWED_EXTENSIONS)]
+    return [name]
+
+class ReconciliationReport:
+    """Exact counts per finding plus a bounded sample of examples"""
+
+    def __init__(self, sample_limit=SAMPLE_LIMIT):
+        self.sample_limit = sample_limit
+        self.files_scanned = 0
+        self.jobs_checked = 0
+        self.counts = {finding: 0 for finding in FINDINGS}
+        self.samples = {finding: [] for finding in FINDINGS}
+        self.repaired = {finding: 0 for finding in FINDINGS}
+        self.deferred = 0  # Findings left unrepaired because a request or move may still own the file
+        self.errors = []
+
+    def add(self, finding, **example):
+        self.counts[finding] += 1
+        if len(self.samples[finding]) < self.sample_limit:
+            self.samples[finding].append(example)
+
+    @property
+    def clean(self):
+        return not any(self.counts[finding] - self.repaired[finding] for finding in FINDINGS)
+
+    def to_dict(self):
+        return {
+            'files_scanned': self.files_scanned,
+            'jobs_checked': self.jobs_checked,
+            'counts': dict(self.counts),
+            'repaired': dict(self.repaired),
+            'deferred': self.deferred,
+            'samples': {finding: list(examples) for finding, examples in self.samples.items()},
+            'errors': list(self.errors),
+            'clean': self.clean
+        }
+
+class StorageReconciler:
+    """
+    Compares the status directories with the job table and optionally repairs drift
+
+    Findings:
+        orphans: files no job refers to (repair: quarantined under .orphans/)
+        misplaced: a job's file found somewhere other than its recorded path,
+            with nothing at the recorded path (repair: record the real path)
+        duplicates: a second copy of a job's file elsewhere (reported only)
+        status_mismatch: a file in a different folder (or shard) than its
+            job's status, or an archived file outside the archive tier
+            (repair: journaled move to the right one)
+        missing: a recorded path with no file on disk (reported only)
+
+    Repairs leave alone files modified within min_age_seconds (an upload
+    whose job row has not committed yet) and jobs with a journaled move in
+    progress; those findings are reported and counted as deferred.
+    """
+
+    def __init__(self, storage_root=None, repair=False, workers=DEFAULT_WORKERS,
+                 batch_size=DEFAULT_BATCH_SIZE, sample_limit=SAMPLE_LIMIT, min_age_seconds=None):
+        self.storage_root = storage_root or current_app.config.get('APP_STORAGE_ROOT', 'storage')
+        self.repair = repair
+        if min_age_seconds is None:
+            min_age_seconds = current_app.config.get('MOVE_RECOVERY_MIN_AGE_SECONDS', 300)
+        self.min_age_seconds = min_age_seconds
+        self._moving = set()  # Jobs with a journaled move, refreshed per batch
+        self.workers = workers
+        self.batch_size = batch_size
+        self.report = ReconciliationReport(sample_limit)
+        self._relocated = set()  # Jobs whose recorded path is stale but whose file was found
+
+    def status_directory(self, job, path):
+        """Where the job's file at path belongs: its status folder (or the archive), in the configured shard"""
+        folder = ARCHIVE_DIRECTORY if is_archived(path) else STATUS_DIRECTORIES.get(job.status)
+        if not folder:
+            return None
+        return get_status_directory(folder, os.path.basename(path), job.created_at, self.storage_root)
+
+    def run(self):
+        """
+        Scan files against jobs, then jobs against files
+
+        Returns:
+            ReconciliationReport
+        """
+        folders = sorted(set(STATUS_DIRECTORIES.values()) | {ARCHIVE_DIRECTORY})
+        directories = [os.path.join(self.storage_root, folder) for folder in folders]
+        for batch in iter_file_batches(directories, self.workers, self.batch_size):
+            self.report.files_scanned += len(batch)
+            self._check_files(batch)
+        self._check_jobs()
+        return self.report
+
+    def _check_files(self, paths):
+        """One indexed IN query matches a whole batch of files to their jobs"""
+        candidates = {path: _candidate_names(path) for path in paths}
+        names = {name for names in candidates.values() for name in names}
+        already_loaded = set(db.session.identity_map.keys())
+        loaded = Job.query.filter(Job.display_name.in_(names)).all()
+        jobs_by_name = {}
+        for job in loaded:
+            jobs_by_name.setdefault(job.display_name, []).append(job)
+
+        if self.repair:
+            self._moving = pending_move_job_ids(self.storage_root)
+        moves = []
+        for path, names in candidates.items():
+            jobs = [job for name in names for job in jobs_by_name.get(name, [])]
+            is_sidecar = path.endswith(METADATA_SUFFIX)
+            recorded = [(job, job.metadata_path if is_sidecar else job.file_path) for job in jobs]
+            match = next((job for job, recorded_path in recorded if _same_path(path, recorded_path)), None)
+            if match is None and not os.path.exists(path):
+                continue  # Moved or deleted since it was listed (e.g. a sidecar that followed its model)
+            if not jobs:
+                self._orphan(path, self._may_be_in_flight(path))
+                continue
+            if match is None:
+                job, recorded_path = recorded[0]
+                if recorded_path and os.path.exists(recorded_path):
+                    self.report.add('duplicates', path=path, job_id=job.id, recorded_path=recorded_path)
+                    continue
+                self._relocate(job, path, is_sidecar, recorded_path, self._may_be_in_flight(path, job))
+                match = job
+            if not is_sidecar:
+                expected = self.status_directory(match, path)
+                if expected and not _same_path(os.path.dirname(path), expected):
+                    self.report.add('status_mismatch', path=path, job_id=match.id, status=match.status)
+                    if self._may_be_in_flight(path, match):
+                        self._defer()
+                    else:
+                        moves.append(match)
+
+        if self.repair:
+            db.session.commit()
+            for job in moves:
+                self._move_to_status_directory(job)
+
+        # Drop this batch's rows from the session so memory does not grow with the table
+        for job in loaded:
+            if db.session.identity_key(instance=job) not in already_loaded:
+                db.session.expunge(job)
+
+    def _may_be_in_flight(self, path, job=None):
+        """Whether a live request or file move may still own this file"""
+        if not self.repair:
+            return False
+        if job is not None and job.id in self._moving:
+            return True
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return True  # Moved while we looked
+        # A deduplicated upload is a fresh link to an old blob and keeps the blob's mtime;
+        # the link (like a rename) updates ctime, so take whichever is newer
+        return time.time() - max(stat.st_mtime, stat.st_ctime) < self.min_age_seconds
+
+    def _defer(self):
+        self.report.deferred += 1
+
+    def _orphan(self, path, in_flight=False):
+        self.report.add('orphans', path=path)
+        if in_flight:
+            self._defer()
+        if not self.repair or in_flight:
+            return
+        relative = os.path.relpath(path, self.storage_root)
+        target = os.path.join(self.storage_root, ORPHAN_DIR_NAME, relative)
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.rename(path, target)
+            self.report.repaired['orphans'] += 1
+        except OSError as e:
+            self.report.errors.append(f"Could not quarantine {path}: {e}")
+
+    def _relocate(self, job, path, is_sidecar, recorded_path, in_flight=False):
+        self.report.add('misplaced', path=path, job_id=job.id, recorded_path=recorded_path)
+        self._relocated.add(job.id)
+        if in_flight:
+            self._defer()
+        if not self.repair or in_flight:
+            return
+        if is_sidecar:
+            job.metadata_path = path
+        else:
+            job.file_path = path
+        self.report.repaired['misplaced'] += 1
+
+    def _move_to_status_directory(self, job):
+        folder = ARCHIVE_DIRECTORY if is_archived(job.file_path) else STATUS_DIRECTORIES[job.status]
+        try:
+            current_folder = os.path.basename(os.path.dirname(job.file_path))
+            move = begin_move(job.id, job.file_path, current_folder, folder, self.storage_root,
+                              job.metadata_path, job.created_at)
+        except OSError as e:
+            self.report.errors.append(f"Could not move {job.file_path} to {folder}: {e}")
+            return
+        try:
+            job.file_path = move.new_path
+            if move.new_metadata_path:
+                job.metadata_path = move.new_metadata_path
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            move.roll_back()
+            raise
+        move.complete()
+        self.report.repaired['status_mismatch'] += 1
+
+    def _check_jobs(self):
+        """Stream jobs in keyset batches and stat their recorded paths in parallel"""
+        after = ''
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                rows = db.session.query(Job.id, Job.file_path).filter(
+                    Job.id > after, Job.file_path.isnot(None)
+                ).order_by(Job.id).limit(self.batch_size).all()
+                if not rows:
+                    return
+                after = rows[-1].id
+                self.report.jobs_checked += len(rows)
+
+                chunk = max(1, len(rows) // self.workers + 1)
+                slices = [rows[start:start + chunk] for start in range(0, len(rows), chunk)]
+                for rows_slice, exists in zip(slices, executor.map(
+                    lambda part: [os.path.exists(row.file_path) for row in part], slices
+                )):
+                    for row, present in zip(rows_slice, exists):
+                        if not present and row.id not in self._relocated:
+                            self.report.add('missing', job_id=row.id, path=row.file_path)
+
+def reconcile_storage(storage_root=None, repair=False, workers=DEFAULT_WORKERS, batch_size=DEFAULT_BATCH_SIZE,
+                      min_age_seconds=None):
+    """
+    Find (and with repair=True, fix) drift between storage and the job table
+
+    min_age_seconds defaults to MOVE_RECOVERY_MIN_AGE_SECONDS; repairs skip
+    files modified more recently than that.
+
+    Returns:
+        ReconciliationReport
+    """
+    return StorageReconciler(storage_root, repair=repair, workers=workers, batch_size=batch_size,
+                             min_age_seconds=min_age_seconds).run()
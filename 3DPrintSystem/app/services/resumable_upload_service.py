@@ -0,0 +1,221 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import defaultdict
+from flask import current_app
+from werkzeug.datastructures import FileStorage
+from app.services.file_service import is_allowed_file, ALLOWED_EXTENSIONS
+from app.services.upload_service import HashingFileWriter, UPLOAD_CHUNK_SIZE, get_staging_dir
+
+RESUMABLE_DIR_NAME = 'resumable'
+STATE_FILENAME = 'upload.json'
+DATA_FILENAME = 'data.part'
+
+# Chunk appends, finalize and purge of one upload are serialized; waitress serves
+# from threads of one process. Reentrant so finalize can delete while holding it.
+_upload_locks = defaultdict(threading.RLock)
+_upload_locks_guard = threading.Lock()
+
+class UploadStateError(Exception):
+    """A resumable upload request that does not fit the upload's current state"""
+    def __init__(self, message, status_code=400, offset=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.offset = offset
+
+def _resumable_root():
+    return os.path.join(get_staging_dir(), RESUMABLE_DIR_NAME)
+
+def _upload_dir(upload_id):
+    # Ids are uuid4 hex; anything else could escape the staging area
+    if not isinstance(upload_id, str) or len(upload_id) != 32 or not all(c in '0123456789abcdef' for c in upload_id):
+        raise UploadStateError('Upload not found', 404)
+    return os.path.join(_resumable_root(), upload_id)
+
+def _lock_for(upload_id):
+    with _upload_locks_guard:
+        return _upload_locks[upload_id]
+
+def lock_upload(upload_id):
+    """
+    The lock serializing work on one upload
+
+    Raises:
+        UploadStateError: 404 for an id that cannot be an upload
+    """
+    _upload_dir(upload_id)
+    return _lock_for(upload_id)
+
+def _describe(upload_id, state, offset):
+    return {
+        'upload_id': upload_id,
+        'filename': state['filename'],
+        'size': state['size'],
+        'offset': offset,
+        'complete': offset == state['size']
+    }
+
+def load_upload(upload_id):
+    """
+    Read an upload's state from disk
+
+    The received byte count is the size of the data file itself, so the state
+    survives restarts and a chunk cut off mid-transfer keeps what arrived.
+
+    Returns:
+        dict: upload_id, filename, size, offset, complete
+    """
+    directory = _upload_dir(upload_id)
+    try:
+        with open(os.path.join(directory, STATE_FILENAME)) as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        raise UploadStateError('Upload not found', 404)
+    offset = os.path.getsize(os.path.join(directory, DATA_FILENAME))
+    return _describe(upload_id, state, offset)
+
+def create_upload(filename, size):
+    """
+    Start a resumable upload
+
+    Returns:
+        dict: the new upload's state (offset 0)
+
+    Raises:
+        UploadStateError: if the file type or declared size is not acceptable
+    """
+    purge_expired_uploads()
+
+    if not filename or not is_allowed_file(filename):
+        raise UploadStateError(f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}")
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadStateError('File size must be a whole number of bytes')
+    max_bytes = current_app.config['MAX_UPLOAD_FILE_BYTES']
+    if size <= 0:
+        raise UploadStateError('File is empty')
+    if size > max_bytes:
+        raise UploadStateError(f"File too large. Maximum size is {max_bytes // (1024*1024)}MB.", 413)
+
+    upload_id = uuid.uuid4().hex
+    directory = _upload_dir(upload_id)
+    os.makedirs(directory)
+    state = {'filename': filename, 'size': size, 'created_at': time.time()}
+    with open(os.path.join(directory, DATA_FILENAME), 'wb'):
+        pass
+    state_path = os.path.join(directory, STATE_FILENAME)
+    with open(state_path + '.tmp', 'w') as f:
+        json.dump(state, f)
+    os.replace(state_path + '.tmp', state_path)
+    return _describe(upload_id, state, 0)
+
+def append_chunk(upload_id, offset, stream, chunk_size=UPLOAD_CHUNK_SIZE):
+    """
+    Append a chunk read from stream at the given byte offset
+
+    The offset must equal the bytes already received; a mismatch usually means
+    the client missed the response to an earlier chunk and should resume from
+    the offset in the error. Bytes that arrive before a dropped connection are
+    kept.
+
+    Returns:
+        dict: the upload's state after the append
+
+    Raises:
+        UploadStateError: 409 on an offset mismatch, 413 past the declared size
+    """
+    try:
+        offset = int(offset)
+    except (TypeError, ValueError):
+        raise UploadStateError('Chunk offset is required')
+
+    with _lock_for(upload_id):
+        upload = load_upload(upload_id)
+        if offset != upload['offset']:
+            raise UploadStateError('Chunk offset does not match received bytes', 409, upload['offset'])
+
+        data_path = os.path.join(_upload_dir(upload_id), DATA_FILENAME)
+        received = upload['offset']
+        with open(data_path, 'ab') as f:
+            while True:
+                data = stream.read(chunk_size)
+                if not data:
+                    break
+                if received + len(data) > upload['size']:
+                    f.truncate(offset)
+                    raise UploadStateError('Chunk runs past the declared file size', 413, offset)
+                f.write(data)
+                received += len(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        upload['offset'] = received
+        upload['complete'] = received == upload['size']
+        return upload
+
+def open_completed_upload(upload_id):
+    """
+    Wrap a fully received upload as a FileStorage for save_uploaded_file
+
+    The assembled file is hashed in one pass and moved, not copied, when saved.
+    If saving fails the data stays staged so finalize can be retried.
+
+    Raises:
+        UploadStateError: 409 if bytes are still missing
+    """
+    upload = load_upload(upload_id)
+    if not upload['complete']:
+        raise UploadStateError('Upload is not complete', 409, upload['offset'])
+    data_path = os.path.join(_upload_dir(upload_id), DATA_FILENAME)
+    stream = HashingFileWriter.open_existing(data_path, current_app.config['MAX_UPLOAD_FILE_BYTES'])
+    return FileStorage(stream=stream, filename=upload['filename'], name='file')
+
+def delete_upload(upload_id):
+    """Remove an upload's staging directory"""
+    directory = _upload_dir(upload_id)
+    with _lock_for(upload_id):
+        shutil.rmtree(directory, ignore_errors=True)
+    with _upload_locks_guard:
+        _upload_locks.pop(upload_id, None)
+
+def purge_expired_uploads(now=None):
+    """
+    Delete uploads that have received nothing for RESUMABLE_UPLOAD_TTL_HOURS
+
+    Activity is the data file's mtime (the last chunk received), so a long
+    upload that is still arriving is kept however long ago it started.
+    Uploads busy with a chunk or finalize are skipped.
+
+    Returns:
+        int: number of uploads removed
+    """
+    root = _resumable_root()
+    if not os.path.isdir(root):
+        return 0
+    cutoff = (now or time.time()) - current_app.config['RESUMABLE_UPLOAD_TTL_HOURS'] * 3600
+    removed = 0
+    for upload_id in os.listdir(root):
+        directory = os.path.join(root, upload_id)
+        lock = _lock_for(upload_id)
+        if not lock.acquire(blocking=False):
+            continue
+        try:
+            try:
+                last_activity = os.path.getmtime(os.path.join(directory, DATA_FILENAME))
+            except FileNotFoundError:
+                last_activity = os.path.getmtime(directory) if os.path.isdir(directory) else None
+            expired = last_activity is None or last_activity < cutoff
+            if last_activity is not None and expired:
+                shutil.rmtree(directory, ignore_errors=True)
+                removed += 1
+        finally:
+            lock.release()
+        if expired:
+            with _upload_locks_guard:
+                _upload_locks.pop(upload_id, None)
+    return removed
@@ -0,0 +1,275 @@
+import os
+import threading
+from datetime import datetime, timedelta
+from decimal import Decimal
+from flask import current_app
+from sqlalchemy import delete, insert, select, update
+from app.extensions import db
+from app.models.archived_job import ArchivedJob
+from app.models.event import Event
+from app.models.job import Job
+from app.services.blob_store import prune_unreferenced_blobs
+from app.services.cache_service import invalidate_dashboard_cache
+from app.services.event_bus import dashboard_bus
+from app.services.file_service import STATUS_DIRECTORIES
+from app.services.metadata_export import EXPORT_MANIFEST, get_export_mode, metadata_exporter
+from app.services.resumable_upload_service import purge_expired_uploads
+from app.services.watermark_service import bump_watermark
+
+# Retention actions
+PURGE_FILES = 'purge_files'    # Delete the job's files; keep the row (file_path becomes NULL)
+ARCHIVE_ROWS = 'archive_rows'  # Snapshot the job and its events into job_archive, then delete them and the files
+RETENTION_ACTIONS = (PURGE_FILES, ARCHIVE_ROWS)
+
+RETENTION_BATCH_SIZE = 500
+SAMPLE_LIMIT = 20
+
+class RetentionRule:
+    """Apply an action to jobs in a status once they have been untouched for a number of days"""
+
+    def __init__(self, status, action, days):
+        if status not in STATUS_DIRECTORIES:
+            raise ValueError(f"Unknown status in retention rule: {status}")
+        if action not in RETENTION_ACTIONS:
+            raise ValueError(f"Unknown retention action: {action}")
+        if days < 0:
+            raise ValueError(f"Retention days must not be negative: {days}")
+        self.status = status
+        self.action = action
+        self.days = days
+
+    def __repr__(self):
+        return f"{self.status}:{self.action}:{self.days}"
+
+def parse_retention_rules(text):
+    """
+    Parse RETENTION_RULES, e.g. "REJECTED:purge_files:60,PAIDPICKEDUP:archive_rows:365"
+
+    Returns:
+        list: RetentionRule objects, in the order given
+
+    Raises:
+        ValueError: for a malformed rule
+    """
+    rules = []
+    for entry in (text or '').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        parts = [part.strip() for part in entry.split(':')]
+        if len(parts) != 3 or not parts[2].isdigit():
+            raise ValueError(f"Retention rules look like STATUS:action:days, got '{entry}'")
+        rules.append(RetentionRule(parts[0].upper(), parts[1], int(parts[2])))
+    return rules
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+def _snapshot(job_row, event_rows):
+    data = {column: _json_value(value) for column, value in job_row._mapping.items()}
+    data['events'] = [
+        {column: _json_value(value) for column, value in event._mapping.items() if column != 'job_id'}
+        for event in event_rows
+    ]
+    return data
+
+def _remove_files(paths):
+    """Delete files that exist; returns (files removed, bytes freed)"""
+    removed = freed = 0
+    for path in paths:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        removed += 1
+        freed += size
+    return removed, freed
+
+class RetentionRun:
+    """
+    Applies retention rules in bounded chunks
+
+    Each chunk is one short transaction over at most batch_size jobs, read
+    with FOR UPDATE SKIP LOCKED where the database supports it, so no lock
+    is held for longer than one chunk and rows being edited are left for the
+    next run. Files are deleted only after their chunk commits; a crash in
+    between leaves orphans that reconcile_storage quarantines.
+
+    With dry_run=True nothing is changed; the report says what would be.
+    """
+
+    def __init__(self, rules, dry_run=False, batch_size=RETENTION_BATCH_SIZE, now=None):
+        self.rules = rules
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.now = now or datetime.utcnow()
+
+    def run(self):
+        """
+        Returns:
+            dict: 'dry_run', 'rules' (one summary per rule: status, action,
+            days, jobs, files, bytes, sample_job_ids), 'expired_uploads' and
+            'blobs_pruned'
+        """
+        report = {'dry_run': self.dry_run, 'rules': [], 'expired_uploads': 0, 'blobs_pruned': 0}
+        for rule in self.rules:
+            report['rules'].append(self._apply(rule))
+        if self.dry_run:
+            return report
+
+        report['expired_uploads'] = purge_expired_uploads()
+        if any(summary['files'] for summary in report['rules']):
+            report['blobs_pruned'] = prune_unreferenced_blobs()
+
+        changed = [summary for summary in report['rules'] if summary['jobs']]
+        if changed:
+            invalidate_dashboard_cache()
+            if any(summary['action'] == ARCHIVE_ROWS for summary in changed):
+                dashboard_bus.publish('stats_changed')
+            if get_export_mode() == EXPORT_MANIFEST:
+                metadata_exporter.mark_dirty({STATUS_DIRECTORIES[summary['status']] for summary in changed})
+        return report
+
+    def _eligible(self, rule):
+        table = Job.__table__
+        conditions = [table.c.status == rule.status, table.c.updated_at < self.now - timedelta(days=rule.days)]
+        if rule.action == PURGE_FILES:
+            conditions.append(table.c.file_path.isnot(None))
+        return conditions
+
+    def _apply(self, rule):
+        summary = {'status': rule.status, 'action': rule.action, 'days': rule.days,
+                   'jobs': 0, 'files': 0, 'bytes': 0, 'sample_job_ids': []}
+        table = Job.__table__
+        columns = table.c if rule.action == ARCHIVE_ROWS else [table.c.id, table.c.file_path, table.c.metadata_path]
+        after = ''
+        while True:
+            query = (
+                select(*columns).where(table.c.id > after, *self._eligible(rule))
+                .order_by(table.c.id).limit(self.batch_size)
+            )
+            if self.dry_run:
+                with db.engine.connect() as connection:
+                    rows = connection.execute(query).all()
+                paths = []
+            else:
+                with db.engine.begin() as connection:
+                    rows = connection.execute(query.with_for_update(skip_locked=True)).all()
+                    paths = self._change(connection, rule, rows) if rows else []
+            if not rows:
+                return summary
+            after = rows[-1].id
+
+            summary['jobs'] += len(rows)
+            summary['sample_job_ids'].extend(row.id for row in rows[:SAMPLE_LIMIT - len(summary['sample_job_ids'])])
+            if self.dry_run:
+                for row in rows:
+                    for path in (row.file_path, row.metadata_path):
+                        if path and os.path.exists(path):
+                            summary['files'] += 1
+                            summary['bytes'] += os.path.getsize(path)
+            else:
+                removed, freed = _remove_files(paths)
+                summary['files'] += removed
+                summary['bytes'] += freed
+
+    def _change(self, connection, rule, rows):
+        """Apply one chunk inside its transaction; returns the file paths to delete after the commit"""
+        table = Job.__table__
+        ids = [row.id for row in rows]
+        paths = [path for row in rows for path in (row.file_path, row.metadata_path) if path]
+
+        if rule.action == PURGE_FILES:
+            connection.execute(
+                update(table).where(table.c.id.in_(ids)).values(
+                    file_path=None,
+                    metadata_path=None,
+                    updated_at=table.c.updated_at  # Storage plumbing, not a job change
+                )
+            )
+            return paths
+
+        events = Event.__table__
+        events_by_job = {}
+        for event in connection.execute(
+            select(events).where(events.c.job_id.in_(ids)).order_by(events.c.job_id, events.c.timestamp, events.c.id)
+        ):
+            events_by_job.setdefault(event.job_id, []).append(event)
+        archived_at = datetime.utcnow()
+        connection.execute(insert(ArchivedJob.__table__), [
+            {
+                'id': row.id,
+                'status': row.status,
+                'student_email': row.student_email,
+                'created_at': row.created_at,
+                'updated_at': row.updated_at,
+                # Per chunk, not per run: delta sync reads it as the row's deletion time
+                'archived_at': archived_at,
+                'data': _snapshot(row, events_by_job.get(row.id, [])),
+            }
+            for row in rows
+        ])
+        connection.execute(delete(events).where(events.c.job_id.in_(ids)))
+        connection.execute(delete(table).where(table.c.id.in_(ids)))
+        bump_watermark(connection)
+        return paths
+
+def apply_retention(rules=None, dry_run=False, batch_size=None):
+    """
+    Apply the configured (or given) retention rules once
+
+    Returns:
+        dict: see RetentionRun.run()
+    """
+    config = current_app.config
+    if rules is None:
+        rules = parse_retention_rules(config.get('RETENTION_RULES', ''))
+    if batch_size is None:
+        batch_size = config.get('RETENTION_BATCH_SIZE', RETENTION_BATCH_SIZE)
+    return RetentionRun(rules, dry_run=dry_run, batch_size=batch_size).run()
+
+class RetentionScheduler:
+    """Runs apply_retention every RETENTION_INTERVAL_SECONDS on a daemon thread (0 = never)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, app):
+        interval = app.config.get('RETENTION_INTERVAL_SECONDS', 0)
+        if interval <= 0 or not app.config.get('RETENTION_RULES'):
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(app, interval), name='retention', daemon=True)
+            self._thread.start()
+
+    def _run(self, app, interval):
+        while not self._stop.wait(interval):
+            with app.app_context():
+                try:
+                    report = apply_retention()
+                    for summary in report['rules']:
+                        if summary['jobs']:
+                            app.logger.info(
+                                f"Retention {summary['status']}:{summary['action']} applied to "
+                                f"{summary['jobs']} jobs, freeing {summary['bytes']} bytes"
+                            )
+                except Exception as e:
+                    app.logger.error(f"Retention run failed: {str(e)}")
+                finally:
+                    db.session.remove()
+
+    def stop(self):
+        self._stop.set()
+
+# Shared per-process scheduler
+retention_scheduler = RetentionScheduler()
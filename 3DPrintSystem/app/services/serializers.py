@@ -0,0 +1,54 @@
+from app.extensions import db
+from app.models.job import Job
+
+# Columns needed to list a job on the dashboard. status and updated_at are
+# included for sync cursors; notes, tokens and JSON columns are never loaded.
+JOB_LISTING_COLUMNS = (
+    Job.id,
+    Job.student_name,
+    Job.student_email,
+    Job.discipline,
+    Job.class_number,
+    Job.original_filename,
+    Job.display_name,
+    Job.created_at,
+    Job.printer,
+    Job.color,
+    Job.material,
+    Job.cost_usd,
+    Job.staff_viewed_at,
+    Job.status,
+    Job.updated_at,
+    Job.content_hash,
+)
+
+def job_listing_query():
+    """
+    Query selecting only JOB_LISTING_COLUMNS
+
+    Yields plain Row tuples rather than Job instances, so there is no identity
+    map bookkeeping or attribute instrumentation. Rows still support attribute
+    access (row.student_name), so templates can render them like Job objects.
+    """
+    return db.session.query(*JOB_LISTING_COLUMNS)
+
+def serialize_job_listing(row):
+    """Convert a job listing row (or Job) to the dashboard's JSON format"""
+    created_at = row.created_at
+    staff_viewed_at = row.staff_viewed_at
+    cost_usd = row.cost_usd
+    return {
+        'id': row.id,
+        'student_name': row.student_name,
+        'student_email': row.student_email,
+        'discipline': row.discipline,
+        'class_number': row.class_number,
+        'original_filename': row.original_filename,
+        'display_name': row.display_name,
+        'created_at': created_at.isoformat() if created_at else None,
+        'printer': row.printer,
+        'color': row.color,
+        'material': row.material,
+        'cost_usd': float(cost_usd) if cost_usd else None,
+        'staff_viewed_at': staff_viewed_at.isoformat() if staff_viewed_at else None
+    }
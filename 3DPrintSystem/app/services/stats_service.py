@@ -0,0 +1,50 @@
+from sqlalchemy import func, case
+from app.extensions import db
+from app.models.job import Job
+
+# Job status -> key used by the dashboard tab badges
+STATUS_STAT_KEYS = {
+    'UPLOADED': 'uploaded',
+    'PENDING': 'pending',
+    'READYTOPRINT': 'ready',
+    'PRINTING': 'printing',
+    'COMPLETED': 'completed',
+    'PAIDPICKEDUP': 'paidpickedup',
+    'REJECTED': 'rejected'
+}
+
+VALID_STATUSES = list(STATUS_STAT_KEYS)
+
+def normalize_status(status, default='UPLOADED'):
+    """Upper-case a status query parameter, falling back to default if unknown"""
+    status = (status or default).upper()
+    return status if status in STATUS_STAT_KEYS else default
+
+def get_dashboard_stats():
+    """
+    Calculate job counts for every dashboard tab in a single GROUP BY query
+
+    Returns:
+        dict: one count per tab stat key, plus derived counts:
+            'unreviewed' - UPLOADED jobs with no staff_viewed_at
+            'total'      - all jobs across every status
+    """
+    rows = db.session.query(
+        Job.status,
+        func.count(Job.id),
+        func.count(case((Job.staff_viewed_at.is_(None), Job.id)))
+    ).group_by(Job.status).all()
+
+    stats = {stat_key: 0 for stat_key in STATUS_STAT_KEYS.values()}
+    stats['unreviewed'] = 0
+    stats['total'] = 0
+
+    for status, count, unviewed_count in rows:
+        stats['total'] += count
+        stat_key = STATUS_STAT_KEYS.get(status)
+        if stat_key:
+            stats[stat_key] = count
+        if status == 'UPLOADED':
+            stats['unreviewed'] = unviewed_count
+
+    return stats
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import or_, and_
+from app.extensions import db
+from app.models.archived_job import ArchivedJob
+from app.models.job import Job
+from app.services.serializers import job_listing_query
+
+CURSOR_SEPARATOR = '|'
+
+def encode_cursor(timestamp, job_id):
+    """Build an opaque cursor from a job's (timestamp, id) position"""
+    if timestamp is None:
+        return None
+    return f"{timestamp.isoformat()}{CURSOR_SEPARATOR}{job_id}"
+
+def decode_cursor(cursor):
+    """
+    Parse a cursor produced by encode_cursor
+
+    Returns:
+        tuple: (timestamp, job_id), or None if the cursor is missing or malformed
+    """
+    if not cursor or CURSOR_SEPARATOR not in cursor:
+        return None
+    timestamp, job_id = cursor.split(CURSOR_SEPARATOR, 1)
+    try:
+        return datetime.fromisoformat(timestamp), job_id
+    except ValueError:
+        return None
+
+def get_latest_cursor():
+    """Return the cursor of the most recently changed job across all statuses"""
+    latest = db.session.query(Job.updated_at, Job.id).order_by(
+        Job.updated_at.desc(), Job.id.desc()
+    ).first()
+    if not latest:
+        return None
+    return encode_cursor(latest.updated_at, latest.id)
+
+def _after(timestamp_column, id_column, since):
+    since_timestamp, since_id = since
+    return or_(
+        timestamp_column > since_timestamp,
+        and_(timestamp_column == since_timestamp, id_column > since_id)
+    )
+
+def get_job_changes(status, since):
+    """
+    Find jobs that changed after a sync cursor
+
+    Every write to a Job bumps updated_at, so anything after the cursor was
+    either created, edited, or moved between statuses. Jobs that retention
+    archived (deleting their rows) are found by their job_archive
+    archived_at, which acts as a tombstone.
+
+    updated_at comes from the writer's clock when it flushes, not when it
+    commits, so a slow transaction (or another process with a lagging clock)
+    can commit a change stamped before a cursor a client already holds. The
+    scan therefore starts DELTA_SYNC_OVERLAP_SECONDS behind the cursor;
+    clients upsert by id, so changes re-sent from the overlap are harmless.
+
+    Args:
+        status: The dashboard tab being displayed
+        since: Decoded cursor tuple (updated_at, job_id)
+
+    Returns:
+        tuple: (changed job listing rows still in status, ids of jobs now in another
+                status or archived, new cursor string)
+    """
+    overlap = timedelta(seconds=current_app.config.get('DELTA_SYNC_OVERLAP_SECONDS', 30))
+    scan_from = (since[0] - overlap, since[1])
+    changed_jobs = job_listing_query().filter(
+        _after(Job.updated_at, Job.id, scan_from)
+    ).order_by(Job.updated_at, Job.id).all()
+    archived = db.session.query(ArchivedJob.id, ArchivedJob.archived_at).filter(
+        _after(ArchivedJob.archived_at, ArchivedJob.id, scan_from)
+    ).order_by(ArchivedJob.archived_at, ArchivedJob.id).all()
+
+    in_tab = [job for job in changed_jobs if job.status == status]
+    removed_ids = [job.id for job in changed_jobs if job.status != status]
+    removed_ids.extend(row.id for row in archived)
+
+    # The cursor moves to the latest change of either kind, never backwards
+    positions = [since]
+    if changed_jobs:
+        positions.append((changed_jobs[-1].updated_at, changed_jobs[-1].id))
+    if archived:
+        positions.append((archived[-1].archived_at, archived[-1].id))
+    return in_tab, removed_ids, encode_cursor(*max(positions))
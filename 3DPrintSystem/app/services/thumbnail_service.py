@@ -0,0 +1,264 @@
+import atexit
+import multiprocessing
+import os
+import struct
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from flask import current_app
+from app.services.mesh_service import load_triangles
+from app.tasks.queue import enqueue, uses_task_queue
+
+THUMBNAIL_DIR_NAME = 'thumbnails'
+RENDER_THUMBNAIL_TASK = 'thumbnails.render'
+MAX_RENDER_TRIANGLES = 400_000  # Larger meshes are subsampled; detail is invisible at thumbnail size
+FRAGMENT_BUDGET = 500_000  # Candidate pixels tested per batch, bounds peak memory
+RENDER_WORK_BUDGET = 30_000_000  # Candidate pixels per render; degenerate meshes are thinned to fit
+MODEL_COLOR = np.array([74, 110, 168], dtype=np.float64)  # Slate blue
+LIGHT_DIRECTION = np.array([0.3, 0.5, 1.0]) / np.linalg.norm([0.3, 0.5, 1.0])
+
+def get_thumbnail_path(content_hash, storage_root):
+    """Thumbnails are cached by content hash, so identical uploads share one image"""
+    return os.path.join(storage_root, THUMBNAIL_DIR_NAME, f"{content_hash}.png")
+
+def _view_rotation():
+    # Isometric-style view: turn 45 degrees about Z, then tilt the top toward the viewer
+    yaw, pitch = np.radians(45.0), np.radians(-60.0)
+    rotate_z = np.array([
+        [np.cos(yaw), -np.sin(yaw), 0],
+        [np.sin(yaw), np.cos(yaw), 0],
+        [0, 0, 1],
+    ])
+    rotate_x = np.array([
+        [1, 0, 0],
+        [0, np.cos(pitch), -np.sin(pitch)],
+        [0, np.sin(pitch), np.cos(pitch)],
+    ])
+    return rotate_x @ rotate_z
+
+def _project(triangles, size, margin):
+    """Rotate into view space and scale to pixel units; z is depth (larger is nearer)"""
+    points = np.asarray(triangles, dtype=np.float64).reshape(-1, 3) @ _view_rotation().T
+    minimum = points.min(axis=0)
+    extent = (points.max(axis=0) - minimum)[:2].max() or 1.0
+    scale = (size - 2 * margin) / extent
+    offset = (size - (points.max(axis=0) - minimum)[:2] * scale) / 2
+    points[:, :2] = (points[:, :2] - minimum[:2]) * scale + offset
+    points[:, 2] = (points[:, 2] - minimum[2]) * scale
+    points[:, 1] = size - points[:, 1]  # Image rows grow downward
+    return points.reshape(-1, 3, 3)
+
+def _shade(projected):
+    """Two-sided Lambert shading from each facet's normal"""
+    edge1 = projected[:, 1] - projected[:, 0]
+    edge2 = projected[:, 2] - projected[:, 0]
+    normals = np.cross(edge1, edge2)
+    normals[:, 1] *= -1  # Undo the row flip so lighting matches the 3D orientation
+    lengths = np.linalg.norm(normals, axis=1)
+    lengths[lengths == 0] = 1.0
+    intensity = np.abs(normals @ LIGHT_DIRECTION) / lengths
+    return 0.35 + 0.65 * intensity
+
+def _rasterize_batch(tris, shades, box_size, size):
+    """
+    Candidate fragments for triangles whose bounding box fits box_size pixels
+
+    Every triangle tests the same box_size x box_size grid of pixel centres
+    anchored at its bounding box, so the whole batch is one array operation.
+    Each triangle also splats its centroid pixel, so facets smaller than a
+    pixel (most of a dense mesh at thumbnail size) still leave no holes.
+
+    Returns:
+        tuple: (pixel indices, depths, shades) of covered pixels
+    """
+    x0 = np.floor(tris[:, :, 0].min(axis=1)).astype(np.int64)
+    y0 = np.floor(tris[:, :, 1].min(axis=1)).astype(np.int64)
+    offsets = np.arange(box_size)
+    px = x0[:, None, None] + offsets[None, None, :]
+    py = y0[:, None, None] + offsets[None, :, None]
+    cx, cy = px + 0.5, py + 0.5
+
+    (ax, ay, az), (bx, by, bz), (qx, qy, qz) = [
+        [tris[:, corner, axis][:, None, None] for axis in range(3)] for corner in range(3)
+    ]
+    area = (bx - ax) * (qy - ay) - (by - ay) * (qx - ax)
+    area = np.where(area == 0, np.nan, area)
+    w0 = ((bx - cx) * (qy - cy) - (by - cy) * (qx - cx)) / area
+    w1 = ((qx - cx) * (ay - cy) - (qy - cy) * (ax - cx)) / area
+    w2 = 1.0 - w0 - w1
+    inside = (w0 >= 0) & (w1 >= 0) & (w2 >= 0) & (px >= 0) & (px < size) & (py >= 0) & (py < size)
+
+    depth = w0 * az + w1 * bz + w2 * qz
+    shade = np.broadcast_to(shades[:, None, None], inside.shape)
+
+    centroid = tris.mean(axis=1)
+    cpx = np.floor(centroid[:, 0]).astype(np.int64)
+    cpy = np.floor(centroid[:, 1]).astype(np.int64)
+    on_image = (cpx >= 0) & (cpx < size) & (cpy >= 0) & (cpy < size)
+    return (
+        np.concatenate(((py * size + px)[inside], (cpy * size + cpx)[on_image])),
+        np.concatenate((depth[inside], centroid[on_image, 2])),
+        np.concatenate((shade[inside], shades[on_image]))
+    )
+
+def render_triangles(triangles, size=256, margin=8):
+    """
+    Software-rasterize triangles into an RGBA image array
+
+    Triangles are bucketed by bounding-box size (powers of two) and each bucket
+    is rasterized in batches, one vectorized barycentric test per batch. Each
+    batch's nearest fragment per pixel is found by sorting and merged into a
+    depth buffer, so memory stays bounded and the result is deterministic.
+
+    Returns:
+        numpy.ndarray: (size, size, 4) uint8 image with a transparent background
+    """
+    if len(triangles) > MAX_RENDER_TRIANGLES:
+        triangles = triangles[::int(np.ceil(len(triangles) / MAX_RENDER_TRIANGLES))]
+    projected = _project(triangles, size, margin)
+
+    box = np.ceil(projected[:, :, :2].max(axis=1)) - np.floor(projected[:, :, :2].min(axis=1))
+    box_sizes = 2 ** np.ceil(np.log2(np.clip(box.max(axis=1), 1, size))).astype(np.int64)
+    work = int((box_sizes ** 2).sum())
+    if work > RENDER_WORK_BUDGET:
+        keep = slice(None, None, int(np.ceil(work / RENDER_WORK_BUDGET)))
+        projected, box_sizes = projected[keep], box_sizes[keep]
+    shades = _shade(projected)
+
+    depth_buffer = np.full(size * size, -np.inf)
+    shade_buffer = np.zeros(size * size)
+    for box_size in np.unique(box_sizes):
+        selected = np.nonzero(box_sizes == box_size)[0]
+        batch = max(1, FRAGMENT_BUDGET // int(box_size) ** 2)
+        for start in range(0, len(selected), batch):
+            rows = selected[start:start + batch]
+            pixels, depths, fragment_shades = _rasterize_batch(projected[rows], shades[rows], int(box_size), size)
+            if not len(pixels):
+                continue
+            # Nearest fragment first within each pixel, keep one per pixel, then depth-test
+            order = np.lexsort((-depths, pixels))
+            pixels, depths, fragment_shades = pixels[order], depths[order], fragment_shades[order]
+            first = np.concatenate(([True], pixels[1:] != pixels[:-1]))
+            pixels, depths, fragment_shades = pixels[first], depths[first], fragment_shades[first]
+            nearer = depths > depth_buffer[pixels]
+            depth_buffer[pixels[nearer]] = depths[nearer]
+            shade_buffer[pixels[nearer]] = fragment_shades[nearer]
+
+    image = np.zeros((size * size, 4), dtype=np.uint8)
+    covered = np.isfinite(depth_buffer)
+    image[covered, :3] = np.clip(MODEL_COLOR * shade_buffer[covered, None], 0, 255).astype(np.uint8)
+    image[covered, 3] = 255
+    return image.reshape(size, size, 4)
+
+def encode_png(image):
+    """Encode an (h, w, 4) uint8 RGBA array as PNG bytes"""
+    height, width = image.shape[:2]
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+    # Filter type 0 (None) for every scanline
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, width * 4)]).tobytes()
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+        + chunk(b'IDAT', zlib.compress(raw, 6))
+        + chunk(b'IEND', b'')
+    )
+
+def render_thumbnail(model_path, output_path, size=256):
+    """
+    Render a model file to a PNG at output_path (runs in worker processes)
+
+    Writes to a temporary name and renames, so readers never see a partial
+    image. Skips the work if the thumbnail already exists.
+
+    Returns:
+        str: output_path
+    """
+    if os.path.exists(output_path):
+        return output_path
+    image = render_triangles(load_triangles(model_path), size=size)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(encode_png(image))
+    os.replace(temp_path, output_path)
+    return output_path
+
+class ThumbnailWorker:
+    """
+    Renders thumbnails in a process pool, off the request path
+
+    submit() only enqueues, so callers never wait on rendering. The pool is
+    created on first use with a spawn context (forking a threaded server is
+    unsafe) and requests for a hash already being rendered are coalesced.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._max_workers = None
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def _get_executor(self, max_workers):
+        if self._executor is None or self._max_workers != max_workers:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            self._max_workers = max_workers
+        return self._executor
+
+    def submit(self, model_path, content_hash, storage_root=None):
+        """
+        Queue a thumbnail render; returns the Future, or None if skipped
+
+        Skipped when rendering is disabled (THUMBNAIL_WORKERS = 0), the
+        thumbnail is cached, or the same content is already being rendered.
+        With a task queue configured the render is queued there instead.
+        """
+        config = current_app.config
+        max_workers = config.get('THUMBNAIL_WORKERS', 2)
+        if not content_hash or not model_path or max_workers <= 0:
+            return None
+        if storage_root is None:
+            storage_root = config.get('APP_STORAGE_ROOT', 'storage')
+        output_path = get_thumbnail_path(content_hash, storage_root)
+        if os.path.exists(output_path):
+            return None
+        if uses_task_queue():
+            enqueue(RENDER_THUMBNAIL_TASK, {'model_path': model_path, 'content_hash': content_hash},
+                    dedupe_key=f"thumbnail:{content_hash}")
+            return None
+
+        logger = current_app.logger
+        with self._lock:
+            if content_hash in self._in_flight:
+                return None
+            self._in_flight.add(content_hash)
+            future = self._get_executor(max_workers).submit(
+                render_thumbnail, model_path, output_path, config.get('THUMBNAIL_SIZE', 256)
+            )
+
+        def finished(done):
+            with self._lock:
+                self._in_flight.discard(content_hash)
+            if done.exception() is not None:
+                logger.warning(f"Thumbnail render failed for {os.path.basename(model_path)}: {done.exception()}")
+
+        future.add_done_callback(finished)
+        return future
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=not wait)
+                self._executor = None
+
+# Shared per-process worker pool
+thumbnail_worker = ThumbnailWorker()
+atexit.register(thumbnail_worker.shutdown, wait=False)
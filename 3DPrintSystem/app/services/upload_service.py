@@ -0,0 +1,155 @@
+import hashlib
+import os
+import tempfile
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+
+STAGING_DIR_NAME = '.incoming'
+UPLOAD_CHUNK_SIZE = 64 * 1024  # Matches Werkzeug's multipart read size
+
+class UploadTooLarge(RequestEntityTooLarge):
+    """An uploaded file crossed the per-file size limit while streaming in"""
+    def __init__(self, max_bytes):
+        super().__init__(f"File too large. Maximum size is {max_bytes // (1024 * 1024)}MB.")
+        self.max_bytes = max_bytes
+
+class HashingFileWriter:
+    """
+    Writable upload target that hashes and counts bytes as they arrive
+
+    Data goes straight to a temporary file in the staging directory, so memory
+    per upload stays at one chunk no matter how large the file is. Writing past
+    max_bytes deletes the partial file and raises UploadTooLarge. commit()
+    renames the finished file into place; closing an uncommitted writer
+    deletes it.
+    """
+
+    def __init__(self, directory, max_bytes=None):
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=directory, suffix='.part')
+        self._file = os.fdopen(fd, 'w+b')
+        self._hash = hashlib.sha256()
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.committed = False
+        self.delete_on_close = True
+
+    @classmethod
+    def open_existing(cls, path, max_bytes=None, chunk_size=UPLOAD_CHUNK_SIZE):
+        """
+        Wrap a file that is already on disk, hashing it in one sequential pass
+
+        Closing the wrapper without committing leaves the file in place.
+        """
+        writer = cls.__new__(cls)
+        writer.path = path
+        writer._file = open(path, 'r+b')
+        writer._hash = hashlib.sha256()
+        writer.max_bytes = max_bytes
+        writer.size = 0
+        writer.committed = False
+        writer.delete_on_close = False
+        while True:
+            chunk = writer._file.read(chunk_size)
+            if not chunk:
+                break
+            writer._hash.update(chunk)
+            writer.size += len(chunk)
+        writer._file.seek(0)
+        if max_bytes is not None and writer.size > max_bytes:
+            writer._file.close()
+            raise UploadTooLarge(max_bytes)
+        return writer
+
+    def write(self, data):
+        if self.max_bytes is not None and self.size + len(data) > self.max_bytes:
+            self.discard()
+            raise UploadTooLarge(self.max_bytes)
+        self._hash.update(data)
+        self._file.write(data)
+        self.size += len(data)
+        return len(data)
+
+    @property
+    def sha256(self):
+        return self._hash.hexdigest()
+
+    def commit(self, target_path):
+        """Flush to disk and atomically move the file to target_path"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.path, target_path)
+        self.path = target_path
+        self.committed = True
+
+    def discard(self):
+        if not self._file.closed:
+            self._file.close()
+        if not self.committed and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self):
+        if self.committed:
+            return
+        if not self.delete_on_close:
+            self._file.close()
+            return
+        self.discard()
+
+    def __getattr__(self, name):
+        # read/readline/seek/tell for FileStorage consumers
+        return getattr(self._file, name)
+
+def get_staging_dir(storage_root=None):
+    """Directory for in-flight uploads; on the storage volume so commit() is a rename"""
+    if storage_root is None:
+        storage_root = current_app.config.get('APP_STORAGE_ROOT', 'storage')
+    return os.path.join(storage_root, STAGING_DIR_NAME)
+
+def stream_to_file(source, target_path, max_bytes=None, chunk_size=UPLOAD_CHUNK_SIZE):
+    """
+    Copy a readable stream to target_path in fixed-size chunks
+
+    Returns:
+        tuple: (sha256 hex digest, size in bytes)
+
+    Raises:
+        UploadTooLarge: if the stream is longer than max_bytes (nothing is left on disk)
+    """
+    writer = HashingFileWriter(os.path.dirname(target_path) or '.', max_bytes)
+    try:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            writer.write(chunk)
+        writer.commit(target_path)
+    finally:
+        writer.close()
+    return writer.sha256, writer.size
+
+def store_upload(file_storage, target_path, max_bytes=None):
+    """
+    Persist an uploaded file at target_path
+
+    Files parsed by StreamingUploadRequest are already on disk and hashed, so
+    this is a rename. Any other stream is copied chunk by chunk.
+
+    Returns:
+        tuple: (sha256 hex digest, size in bytes)
+    """
+    stream = file_storage.stream
+    if isinstance(stream, HashingFileWriter):
+        stream.commit(target_path)
+        return stream.sha256, stream.size
+    return stream_to_file(stream, target_path, max_bytes)
+
+class StreamingUploadRequest(Request):
+    """Request whose multipart file parts stream into HashingFileWriter targets"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        max_bytes = current_app.config.get('MAX_UPLOAD_FILE_BYTES')
+        if max_bytes is not None and content_length is not None and content_length > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        return HashingFileWriter(get_staging_dir(), max_bytes)
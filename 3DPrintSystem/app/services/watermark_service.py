@@ -0,0 +1,55 @@
+from datetime import datetime
+from itertools import chain
+from sqlalchemy import event, insert, update
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models.job import Job
+from app.models.watermark import DashboardWatermark
+
+WATERMARK_ID = 1
+
+def bump_watermark(connection, jobs_created=0):
+    """
+    Advance the change watermark on the given connection
+
+    Runs inside the caller's transaction, so the bump commits or rolls back
+    together with the job write it describes. ORM writes to Job bump it
+    automatically; call this directly after bulk Core statements on job.
+    """
+    table = DashboardWatermark.__table__
+    now = datetime.utcnow()
+    result = connection.execute(
+        update(table)
+        .where(table.c.id == WATERMARK_ID)
+        .values(version=table.c.version + 1,
+                jobs_created=table.c.jobs_created + jobs_created,
+                updated_at=now)
+    )
+    if result.rowcount == 0:
+        connection.execute(
+            insert(table).values(id=WATERMARK_ID, version=1, jobs_created=jobs_created, updated_at=now)
+        )
+
+def get_watermark():
+    """
+    Read the current watermark
+
+    Returns:
+        dict: 'version' (changes on any job write), 'jobs_created' (only grows
+        when jobs are submitted) and 'updated_at' (ISO time of the last write)
+    """
+    row = db.session.get(DashboardWatermark, WATERMARK_ID)
+    if row is None:
+        return {'version': 0, 'jobs_created': 0, 'updated_at': None}
+    return {
+        'version': row.version,
+        'jobs_created': row.jobs_created,
+        'updated_at': row.updated_at.isoformat() if row.updated_at else None
+    }
+
+@event.listens_for(Session, 'after_flush')
+def _bump_on_job_writes(session, flush_context):
+    if not any(isinstance(obj, Job) for obj in chain(session.new, session.dirty, session.deleted)):
+        return
+    created = sum(1 for obj in session.new if isinstance(obj, Job))
+    bump_watermark(session.connection(), jobs_created=created)
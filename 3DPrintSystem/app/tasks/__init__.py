@@ -1 +1,2 @@
- 
\ No newline at end of file
+from .registry import task, get_task
+from .queue import enqueue, uses_task_queue
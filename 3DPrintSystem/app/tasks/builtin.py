@@ -0,0 +1,29 @@
+"""Background work the app queues when TASK_QUEUE_BACKEND is not 'inline'"""
+import os
+from flask import current_app
+from app.models.job import Job
+from app.services.file_mover import SETTLE_TASK, file_mover, resolve_file_path
+from app.services.metadata_export import EXPORT_MANIFEST_TASK, export_manifest
+from app.services.thumbnail_service import RENDER_THUMBNAIL_TASK, get_thumbnail_path, render_thumbnail
+from app.tasks.queue import PRIORITY_HIGH, PRIORITY_LOW
+from app.tasks.registry import task
+
+@task(name=SETTLE_TASK, priority=PRIORITY_HIGH)
+def settle_job_file(job_id):
+    """Move a job's file into its status folder (see FileMover.settle)"""
+    file_mover.settle(job_id)
+
+@task(name=EXPORT_MANIFEST_TASK, priority=PRIORITY_LOW)
+def export_folder_manifest(folder):
+    """Rewrite one status folder's metadata manifest"""
+    export_manifest(folder)
+
+@task(name=RENDER_THUMBNAIL_TASK)
+def render_job_thumbnail(model_path, content_hash):
+    """Render a thumbnail; if the file has moved since queueing, render from where its job is now"""
+    config = current_app.config
+    if not os.path.exists(model_path):
+        job = Job.query.filter_by(content_hash=content_hash).first()
+        model_path = resolve_file_path(job) if job else model_path
+    render_thumbnail(model_path, get_thumbnail_path(content_hash, config['APP_STORAGE_ROOT']),
+                     config.get('THUMBNAIL_SIZE', 256))
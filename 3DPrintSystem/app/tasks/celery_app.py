@@ -0,0 +1,12 @@
+"""
+Celery entry point, used when TASK_QUEUE_BACKEND is 'celery'
+
+    celery -A app.tasks.celery_app worker --concurrency 4
+
+Like task_worker.py, the app is built without the server's startup services.
+"""
+from app import create_app
+from app.tasks.celery_backend import create_celery
+
+flask_app = create_app()
+celery = create_celery(flask_app)
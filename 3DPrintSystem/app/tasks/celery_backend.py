@@ -0,0 +1,86 @@
+import threading
+from datetime import datetime
+from app.extensions import db
+from app.models.task import DeadLetterTask
+from app.tasks.registry import all_tasks
+
+try:
+    from celery import Celery
+except ImportError:  # Optional: only needed with TASK_QUEUE_BACKEND = 'celery'
+    Celery = None
+
+CELERY_MAX_PRIORITY = 9
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def _require_celery():
+    if Celery is None:
+        raise RuntimeError("TASK_QUEUE_BACKEND 'celery' requires the celery package")
+
+def to_celery_priority(priority):
+    """Map queue priorities (higher first, PRIORITY_LOW..PRIORITY_HIGH) onto Celery's 0-9"""
+    return max(0, min(CELERY_MAX_PRIORITY, 5 + priority // 2))
+
+def _get_client(broker_url, result_backend):
+    """A send-only Celery app per broker, shared by request threads"""
+    with _clients_lock:
+        key = (broker_url, result_backend)
+        if key not in _clients:
+            _clients[key] = Celery('3dprint', broker=broker_url, backend=result_backend)
+        return _clients[key]
+
+def send_celery_task(name, payload, priority=0, countdown=0):
+    """Hand a task to the Celery broker by name; workers run it (see create_celery)"""
+    from flask import current_app
+    _require_celery()
+    config = current_app.config
+    client = _get_client(config['CELERY_BROKER_URL'], config.get('CELERY_RESULT_BACKEND'))
+    client.send_task(name, kwargs=payload, countdown=countdown or None, priority=to_celery_priority(priority))
+
+def create_celery(app):
+    """
+    Build the Celery app for `celery -A app.tasks.celery_app worker`
+
+    Every registered task runs in a Flask application context with the same
+    policy as the database queue: exponential backoff between attempts and
+    a task_dead_letter row once TASK_MAX_ATTEMPTS is used up.
+    """
+    _require_celery()
+    from app.tasks.queue import retry_delay
+
+    celery = Celery(app.import_name, broker=app.config['CELERY_BROKER_URL'],
+                    backend=app.config.get('CELERY_RESULT_BACKEND'))
+    celery.conf.task_queue_max_priority = CELERY_MAX_PRIORITY
+    celery.conf.task_acks_late = True  # A task whose worker dies is redelivered
+
+    def register(definition):
+        max_attempts = definition.max_attempts or app.config.get('TASK_MAX_ATTEMPTS', 5)
+
+        @celery.task(name=definition.name, bind=True, max_retries=max_attempts - 1)
+        def run(self, **kwargs):
+            with app.app_context():
+                try:
+                    return definition.fn(**kwargs)
+                except Exception as e:
+                    attempts = self.request.retries + 1
+                    if attempts >= max_attempts:
+                        _record_dead_letter(definition, kwargs, attempts, repr(e))
+                        raise
+                    raise self.retry(exc=e, countdown=retry_delay(attempts))
+        return run
+
+    for definition in all_tasks():
+        register(definition)
+    return celery
+
+def _record_dead_letter(definition, payload, attempts, error):
+    db.session.add(DeadLetterTask(
+        name=definition.name,
+        payload=payload,
+        priority=definition.priority,
+        attempts=attempts,
+        last_error=error,
+        failed_at=datetime.utcnow()
+    ))
+    db.session.commit()
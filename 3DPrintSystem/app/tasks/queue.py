@@ -0,0 +1,277 @@
+import os
+import random
+import socket
+from datetime import datetime, timedelta
+from flask import current_app, has_app_context
+from sqlalchemy import delete, insert, select, update
+from app.extensions import db
+from app.models.task import DeadLetterTask, QueuedTask, TaskLock
+from app.tasks.registry import get_task
+
+# TASK_QUEUE_BACKEND values
+BACKEND_INLINE = 'inline'      # No queue: callers keep their in-process pools
+BACKEND_DATABASE = 'database'  # task_queue table, run by task_worker.py
+BACKEND_CELERY = 'celery'      # Celery, via CELERY_BROKER_URL
+TASK_BACKENDS = (BACKEND_INLINE, BACKEND_DATABASE, BACKEND_CELERY)
+
+TASK_QUEUED = 'queued'
+TASK_RUNNING = 'running'
+
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+
+CLAIM_LOCK_NAME = 'claim'
+MAX_ERROR_LENGTH = 4000
+
+def get_task_backend():
+    """The configured backend; code outside an app context always runs inline"""
+    if not has_app_context():
+        return BACKEND_INLINE
+    return current_app.config.get('TASK_QUEUE_BACKEND', BACKEND_INLINE)
+
+def uses_task_queue():
+    """Whether background work should be queued rather than run in-process"""
+    return get_task_backend() != BACKEND_INLINE
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def retry_delay(attempts, base_seconds=None, max_seconds=None):
+    """
+    Seconds to wait before retrying after the given number of failed attempts
+
+    Exponential (base, 2x base, 4x base, ...) up to max_seconds, less up to
+    10% jitter so tasks that failed together do not retry in lockstep.
+    """
+    config = current_app.config
+    base_seconds = config.get('TASK_RETRY_BASE_SECONDS', 10) if base_seconds is None else base_seconds
+    max_seconds = config.get('TASK_RETRY_MAX_SECONDS', 3600) if max_seconds is None else max_seconds
+    delay = min(max_seconds, base_seconds * 2 ** max(0, attempts - 1))
+    return delay * (1 - 0.1 * random.random())
+
+def enqueue(name, payload=None, priority=PRIORITY_NORMAL, countdown=0, max_attempts=None, dedupe_key=None):
+    """
+    Queue a task by name on the configured backend
+
+    Tasks are queued on their own connection and are visible to workers at
+    once, so queue work for changes that have already committed. With a
+    dedupe_key, a task already queued under that key absorbs this one.
+    The inline backend runs the task immediately.
+
+    Returns:
+        int: the task's id in task_queue, or None for other backends
+    """
+    payload = payload or {}
+    backend = get_task_backend()
+    if backend == BACKEND_INLINE:
+        get_task(name)(**payload)
+        return None
+    if max_attempts is None:
+        max_attempts = current_app.config.get('TASK_MAX_ATTEMPTS', 5)
+    if backend == BACKEND_CELERY:
+        from app.tasks.celery_backend import send_celery_task
+        send_celery_task(name, payload, priority=priority, countdown=countdown)
+        return None
+    if backend != BACKEND_DATABASE:
+        raise ValueError(f"Unknown task queue backend: {backend}")
+
+    table = QueuedTask.__table__
+    now = datetime.utcnow()
+    with db.engine.begin() as connection:
+        if dedupe_key:
+            existing = connection.execute(
+                select(table.c.id).where(table.c.dedupe_key == dedupe_key, table.c.status == TASK_QUEUED).limit(1)
+            ).scalar()
+            if existing is not None:
+                return existing
+        result = connection.execute(insert(table).values(
+            name=name,
+            payload=payload,
+            priority=priority,
+            status=TASK_QUEUED,
+            attempts=0,
+            max_attempts=max_attempts,
+            run_at=now + timedelta(seconds=countdown),
+            dedupe_key=dedupe_key,
+            created_at=now
+        ))
+        return result.inserted_primary_key[0]
+
+def _acquire_claim_lock(connection, worker_id, now):
+    """
+    Serialize claimers on SQLite by writing the claim lock row
+
+    The first write in a SQLite transaction takes the database's write lock
+    (even an UPDATE that matches nothing), so a second claimer waits here
+    until the first commits its claim.
+    """
+    table = TaskLock.__table__
+    values = {'holder': worker_id, 'acquired_at': now}
+    result = connection.execute(update(table).where(table.c.name == CLAIM_LOCK_NAME).values(**values))
+    if result.rowcount == 0:  # Schema made by create_all rather than the migration
+        connection.execute(insert(table).values(name=CLAIM_LOCK_NAME, **values))
+
+def claim_tasks(worker_id, limit=1, now=None):
+    """
+    Claim up to limit runnable tasks for a worker
+
+    PostgreSQL (and other databases with SKIP LOCKED) lets concurrent
+    workers each lock different rows without waiting; SQLite claimers take
+    turns through the task_lock row. Either way a task is claimed once.
+
+    Returns:
+        list: claimed task rows, highest priority first
+    """
+    now = now or datetime.utcnow()
+    table = QueuedTask.__table__
+    order = (table.c.priority.desc(), table.c.run_at, table.c.id)
+    with db.engine.begin() as connection:
+        query = (
+            select(table.c.id)
+            .where(table.c.status == TASK_QUEUED, table.c.run_at <= now)
+            .order_by(*order).limit(limit)
+        )
+        if connection.dialect.name == 'sqlite':
+            _acquire_claim_lock(connection, worker_id, now)
+        else:
+            query = query.with_for_update(skip_locked=True)
+        ids = connection.execute(query).scalars().all()
+        if not ids:
+            return []
+        connection.execute(
+            update(table).where(table.c.id.in_(ids)).values(
+                status=TASK_RUNNING,
+                locked_by=worker_id,
+                locked_at=now,
+                attempts=table.c.attempts + 1
+            )
+        )
+        return connection.execute(select(table).where(table.c.id.in_(ids)).order_by(*order)).all()
+
+def complete_task(task, worker_id):
+    """Remove a finished task (if this worker still holds it)"""
+    table = QueuedTask.__table__
+    with db.engine.begin() as connection:
+        connection.execute(
+            delete(table).where(table.c.id == task.id, table.c.locked_by == worker_id, table.c.status == TASK_RUNNING)
+        )
+
+def _dead_letter(connection, task, error, now):
+    table = QueuedTask.__table__
+    connection.execute(insert(DeadLetterTask.__table__).values(
+        task_id=task.id,
+        name=task.name,
+        payload=task.payload,
+        priority=task.priority,
+        attempts=task.attempts,
+        last_error=error,
+        created_at=task.created_at,
+        failed_at=now
+    ))
+    connection.execute(delete(table).where(table.c.id == task.id))
+
+def fail_task(task, worker_id, error, retry=True, now=None):
+    """
+    Record a failed attempt: retry after a backoff, or dead-letter the task
+
+    A task is dead-lettered once it has used max_attempts, or at once when
+    retry is False (e.g. no task is registered under its name).
+
+    Returns:
+        bool: True if the task will be retried
+    """
+    now = now or datetime.utcnow()
+    error = (error or '')[-MAX_ERROR_LENGTH:]
+    table = QueuedTask.__table__
+    held = (table.c.id == task.id, table.c.locked_by == worker_id, table.c.status == TASK_RUNNING)
+    with db.engine.begin() as connection:
+        if not connection.execute(select(table.c.id).where(*held)).first():
+            return False  # Recovered from us as stale; whoever holds it now decides
+        if not retry or task.attempts >= task.max_attempts:
+            _dead_letter(connection, task, error, now)
+            return False
+        connection.execute(update(table).where(*held).values(
+            status=TASK_QUEUED,
+            locked_by=None,
+            locked_at=None,
+            last_error=error,
+            run_at=now + timedelta(seconds=retry_delay(task.attempts))
+        ))
+        return True
+
+def recover_stale_tasks(timeout_seconds=None, now=None):
+    """
+    Requeue tasks whose worker stopped without finishing them
+
+    A task running for longer than TASK_LOCK_TIMEOUT_SECONDS is presumed
+    lost; it goes back on the queue, or to the dead letters if that was its
+    last attempt.
+
+    Returns:
+        int: number of tasks recovered
+    """
+    now = now or datetime.utcnow()
+    if timeout_seconds is None:
+        timeout_seconds = current_app.config.get('TASK_LOCK_TIMEOUT_SECONDS', 600)
+    table = QueuedTask.__table__
+    stale = (table.c.status == TASK_RUNNING, table.c.locked_at < now - timedelta(seconds=timeout_seconds))
+    with db.engine.begin() as connection:
+        rows = connection.execute(select(table).where(*stale)).all()
+        for row in rows:
+            error = f"Worker {row.locked_by} stopped before finishing"
+            if row.attempts >= row.max_attempts:
+                _dead_letter(connection, row, error, now)
+            else:
+                connection.execute(
+                    update(table).where(table.c.id == row.id, *stale).values(
+                        status=TASK_QUEUED, locked_by=None, locked_at=None, last_error=error, run_at=now
+                    )
+                )
+    return len(rows)
+
+def requeue_dead_letters(ids=None):
+    """
+    Put dead-lettered tasks back on the queue with fresh attempts
+
+    Returns:
+        int: number of tasks requeued
+    """
+    dead = DeadLetterTask.__table__
+    now = datetime.utcnow()
+    max_attempts = current_app.config.get('TASK_MAX_ATTEMPTS', 5)
+    with db.engine.begin() as connection:
+        query = select(dead)
+        if ids is not None:
+            query = query.where(dead.c.id.in_(ids))
+        rows = connection.execute(query).all()
+        if not rows:
+            return 0
+        connection.execute(insert(QueuedTask.__table__), [
+            {
+                'name': row.name,
+                'payload': row.payload,
+                'priority': row.priority,
+                'status': TASK_QUEUED,
+                'attempts': 0,
+                'max_attempts': max_attempts,
+                'run_at': now,
+                'created_at': now,
+            }
+            for row in rows
+        ])
+        connection.execute(delete(dead).where(dead.c.id.in_([row.id for row in rows])))
+    return len(rows)
+
+def get_queue_stats():
+    """
+    Returns:
+        dict: queued, running and dead_letter counts
+    """
+    table = QueuedTask.__table__
+    with db.engine.connect() as connection:
+        counts = dict(connection.execute(
+            select(table.c.status, db.func.count()).group_by(table.c.status)
+        ).all())
+        dead = connection.execute(select(db.func.count()).select_from(DeadLetterTask.__table__)).scalar()
+    return {'queued': counts.get(TASK_QUEUED, 0), 'running': counts.get(TASK_RUNNING, 0), 'dead_letter': dead}
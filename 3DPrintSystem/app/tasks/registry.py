@@ -0,0 +1,73 @@
+import importlib
+import threading
+
+# Modules whose @task functions every worker knows about
+BUILTIN_TASK_MODULES = ('app.tasks.builtin',)
+
+_tasks = {}
+_load_lock = threading.Lock()
+_builtins_loaded = False
+
+class TaskDefinition:
+    """A registered task: the function plus its queueing defaults"""
+
+    def __init__(self, fn, name, priority=0, max_attempts=None):
+        self.fn = fn
+        self.name = name
+        self.priority = priority
+        self.max_attempts = max_attempts  # None uses TASK_MAX_ATTEMPTS
+        self.__doc__ = fn.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.fn(*args, **kwargs)
+
+    def delay(self, countdown=0, priority=None, dedupe_key=None, **kwargs):
+        """Queue this task with keyword arguments (see app.tasks.queue.enqueue)"""
+        from app.tasks.queue import enqueue
+        return enqueue(
+            self.name, kwargs,
+            priority=self.priority if priority is None else priority,
+            countdown=countdown,
+            max_attempts=self.max_attempts,
+            dedupe_key=dedupe_key
+        )
+
+def task(name=None, priority=0, max_attempts=None):
+    """
+    Register a function as a background task
+
+    Payloads are JSON, so tasks take JSON-serializable keyword arguments
+    and must be safe to run more than once (a retry may follow a partial run).
+    """
+    def register(fn):
+        task_name = name or f"{fn.__module__}.{fn.__name__}"
+        if task_name in _tasks and _tasks[task_name].fn is not fn:
+            raise ValueError(f"Task already registered: {task_name}")
+        definition = TaskDefinition(fn, task_name, priority, max_attempts)
+        _tasks[task_name] = definition
+        return definition
+    return register
+
+def _load_builtin_tasks():
+    global _builtins_loaded
+    if _builtins_loaded:
+        return
+    with _load_lock:
+        if not _builtins_loaded:
+            for module in BUILTIN_TASK_MODULES:
+                importlib.import_module(module)
+            _builtins_loaded = True
+
+def get_task(name):
+    """
+    Look up a registered task by name
+
+    Raises:
+        KeyError: if no task has that name
+    """
+    _load_builtin_tasks()
+    return _tasks[name]
+
+def all_tasks():
+    _load_builtin_tasks()
+    return list(_tasks.values())
@@ -0,0 +1,119 @@
+import threading
+import time
+import traceback
+from app.tasks.queue import (
+    claim_tasks,
+    complete_task,
+    default_worker_id,
+    fail_task,
+    recover_stale_tasks,
+)
+from app.tasks.registry import get_task
+
+class Worker:
+    """
+    Runs tasks from the database queue on a pool of threads
+
+    Each thread claims one task at a time, runs it in its own application
+    context and then deletes it, or records the failure for a backoff retry
+    (see fail_task). The main thread periodically requeues tasks abandoned
+    by workers that died.
+    """
+
+    def __init__(self, app, concurrency=None, poll_interval=None, worker_id=None):
+        config = app.config
+        self.app = app
+        self.concurrency = concurrency or config.get('TASK_WORKER_CONCURRENCY', 4)
+        self.poll_interval = config.get('TASK_POLL_INTERVAL_SECONDS', 1) if poll_interval is None else poll_interval
+        self.worker_id = worker_id or default_worker_id()
+        self.stop_event = threading.Event()
+        self.succeeded = 0
+        self.failed = 0
+        self._counts_lock = threading.Lock()
+
+    def process_next(self):
+        """
+        Claim and run one task
+
+        Returns:
+            bool: False if no task was runnable
+        """
+        with self.app.app_context():
+            claimed = claim_tasks(self.worker_id, limit=1)
+        if not claimed:
+            return False
+        task = claimed[0]
+        with self.app.app_context():
+            try:
+                definition = get_task(task.name)
+            except KeyError:
+                fail_task(task, self.worker_id, f"No task registered as '{task.name}'", retry=False)
+                self._count(succeeded=False)
+                return True
+            try:
+                definition.fn(**(task.payload or {}))
+            except Exception as e:
+                retrying = fail_task(task, self.worker_id, traceback.format_exc())
+                self.app.logger.warning(
+                    f"Task {task.name} #{task.id} failed (attempt {task.attempts}/{task.max_attempts}"
+                    f"{', will retry' if retrying else ''}): {str(e)}"
+                )
+                self._count(succeeded=False)
+                return True
+            complete_task(task, self.worker_id)
+        self._count(succeeded=True)
+        return True
+
+    def _count(self, succeeded):
+        with self._counts_lock:
+            if succeeded:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+    def _loop(self, drain):
+        while not self.stop_event.is_set():
+            try:
+                processed = self.process_next()
+            except Exception as e:
+                self.app.logger.error(f"Task worker {self.worker_id} could not claim a task: {str(e)}")
+                processed = False
+            if not processed:
+                if drain:
+                    return
+                self.stop_event.wait(self.poll_interval)
+
+    def run(self, drain=False):
+        """
+        Process tasks until stop() is called, or with drain=True until none
+        are runnable
+        """
+        with self.app.app_context():
+            recover_stale_tasks()
+        threads = [
+            threading.Thread(target=self._loop, args=(drain,), name=f"task-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        recovery_interval = max(1, self.app.config.get('TASK_LOCK_TIMEOUT_SECONDS', 600) / 2)
+        next_recovery = time.monotonic() + recovery_interval
+        while not self.stop_event.is_set():
+            alive = [thread for thread in threads if thread.is_alive()]
+            if not alive:
+                break
+            alive[0].join(timeout=1)
+            if drain or time.monotonic() < next_recovery:
+                continue
+            next_recovery = time.monotonic() + recovery_interval
+            with self.app.app_context():
+                try:
+                    recover_stale_tasks()
+                except Exception as e:
+                    self.app.logger.error(f"Could not recover stale tasks: {str(e)}")
+        for thread in threads:
+            thread.join()
+
+    def stop(self):
+        """Finish the tasks in progress, then return from run()"""
+        self.stop_event.set()
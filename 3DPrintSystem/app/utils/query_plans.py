@@ -0,0 +1,121 @@
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import func, select, text
+from app.extensions import db
+from app.models.job import Job
+from app.models.event import Event
+
+SEED_MARKER = 'plan-check-seed'
+SEED_STATUSES = ['UPLOADED', 'PENDING', 'READYTOPRINT', 'PRINTING', 'COMPLETED', 'PAIDPICKEDUP', 'REJECTED']
+
+def seed_plan_check_data(job_count, events_per_job=2, batch_size=1000):
+    """
+    Insert synthetic jobs and events with a realistic shape, then ANALYZE
+
+    Most jobs are reviewed and spread over all statuses, and every student has
+    a distinct email, so selectivity statistics resemble production. Seeded
+    rows are tagged with SEED_MARKER in last_updated_by/triggered_by.
+    """
+    now = datetime.utcnow()
+    for start in range(0, job_count, batch_size):
+        jobs, events = [], []
+        for index in range(start, min(start + batch_size, job_count)):
+            job_id = str(uuid.uuid4())
+            created_at = now - timedelta(minutes=index)
+            jobs.append({
+                'id': job_id,
+                'student_name': f'Seed Student {index}',
+                'student_email': f'seed{index}@example.edu',
+                'status': SEED_STATUSES[index % len(SEED_STATUSES)],
+                'staff_viewed_at': None if index % 50 == 0 else created_at,
+                'created_at': created_at,
+                'updated_at': created_at,
+                'last_updated_by': SEED_MARKER
+            })
+            events.extend({
+                'job_id': job_id,
+                'timestamp': created_at + timedelta(seconds=offset),
+                'event_type': 'JobCreated' if offset == 0 else 'StaffApproved',
+                'triggered_by': SEED_MARKER
+            } for offset in range(events_per_job))
+        db.session.execute(Job.__table__.insert(), jobs)
+        if events:
+            db.session.execute(Event.__table__.insert(), events)
+        db.session.commit()
+
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+
+def remove_plan_check_data():
+    """Delete rows created by seed_plan_check_data"""
+    db.session.execute(Event.__table__.delete().where(Event.triggered_by == SEED_MARKER))
+    db.session.execute(Job.__table__.delete().where(Job.last_updated_by == SEED_MARKER))
+    db.session.commit()
+
+def hot_queries():
+    """
+    The dashboard's hottest queries, each paired with the index it should use
+
+    Returns:
+        list: (name, statement, expected_index_name) tuples
+    """
+    return [
+        (
+            'dashboard tab page',
+            select(Job.id).where(Job.status == 'UPLOADED')
+            .order_by(Job.created_at.desc(), Job.id.desc()).limit(51),
+            'ix_job_status_created_at'
+        ),
+        (
+            'unreviewed uploads',
+            select(func.count()).select_from(Job)
+            .where(Job.status == 'UPLOADED', Job.staff_viewed_at.is_(None)),
+            'ix_job_unreviewed_status'
+        ),
+        (
+            'latest change',
+            select(Job.updated_at, Job.id).order_by(Job.updated_at.desc(), Job.id.desc()).limit(1),
+            'ix_job_updated_at'
+        ),
+        (
+            'student email lookup',
+            select(Job.id).where(func.lower(Job.student_email) == 'student@example.edu'),
+            'ix_job_student_email_lower'
+        ),
+        (
+            'job event history',
+            select(Event.id).where(Event.job_id == 'job-id').order_by(Event.timestamp),
+            'ix_event_job_id_timestamp'
+        ),
+    ]
+
+def explain(statement):
+    """Return the database's query plan for a statement as a list of text lines"""
+    dialect = db.engine.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+    if dialect.name == 'sqlite':
+        rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+        return [row[-1] for row in rows]
+    rows = db.session.execute(text(f"EXPLAIN {sql}")).fetchall()
+    return [row[0] for row in rows]
+
+def check_hot_query_plans():
+    """
+    Explain every hot query and report whether the planner picked its index
+
+    Planners ignore indexes on near-empty tables, so run this against a
+    database with realistic row counts and fresh statistics (ANALYZE).
+
+    Returns:
+        list: dicts with 'name', 'expected_index', 'uses_index' and 'plan'
+    """
+    results = []
+    for name, statement, expected_index in hot_queries():
+        plan = explain(statement)
+        results.append({
+            'name': name,
+            'expected_index': expected_index,
+            'uses_index': any(expected_index in line for line in plan),
+            'plan': plan
+        })
+    return results
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Retention for 3D Print System
+Applies RETENTION_RULES: purges old files and archives old jobs in bounded chunks
+
+Usage:
+    python apply_retention.py --dry-run                 # report what the rules would remove
+    python apply_retention.py                           # apply the configured rules
+    python apply_retention.py --rules "REJECTED:purge_files:60,PAIDPICKEDUP:archive_rows:365"
+"""
+import argparse
+import json
+import sys
+from app import create_app
+from app.services.retention_service import apply_retention, parse_retention_rules
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply job retention rules')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would change without changing it')
+    parser.add_argument('--rules', help='Rules to apply instead of RETENTION_RULES')
+    parser.add_argument('--batch-size', type=int, help='Jobs changed per transaction')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    app = create_app()
+    try:
+        rules = parse_retention_rules(args.rules if args.rules is not None else app.config['RETENTION_RULES'])
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    if not rules:
+        print("ℹ️  No retention rules configured (set RETENTION_RULES or pass --rules)")
+        return True
+
+    with app.app_context():
+        report = apply_retention(rules, dry_run=args.dry_run, batch_size=args.batch_size)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return True
+
+    verb = 'Would apply' if args.dry_run else 'Applied'
+    for summary in report['rules']:
+        print(f"{'🔍' if args.dry_run else '✅'} {verb} {summary['status']}:{summary['action']}:{summary['days']} "
+              f"to {summary['jobs']} jobs ({summary['files']} files, {summary['bytes'] / (1024 * 1024):.1f} MB)")
+        for job_id in summary['sample_job_ids']:
+            print(f"    {job_id}")
+    if not args.dry_run:
+        print(f"🧹 Removed {report['expired_uploads']} expired uploads and {report['blobs_pruned']} unreferenced blobs")
+
+    return True
+
+if __name__ == "__main__":
+    if main():
+        print("\n🎉 Retention run complete" + (" (dry run, nothing changed)" if '--dry-run' in sys.argv else ''))
+        sys.exit(0)
+    else:
+        sys.exit(1)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Storage Archiving for 3D Print System
+Compresses old picked-up and rejected jobs' files into the Archive tier
+
+Files are read back transparently (decompressed as they stream), so nothing
+else needs to know a job was archived. Safe to run while the app is serving.
+
+Usage:
+    python archive_storage.py                     # archive jobs idle for ARCHIVE_AFTER_DAYS
+    python archive_storage.py --after-days 30     # override the age threshold
+    python archive_storage.py --workers 4 --io-budget-mb 50
+"""
+import argparse
+import sys
+from app import create_app
+from app.services.archive_service import archiver
+
+def main():
+    parser = argparse.ArgumentParser(description='Compress old job files into the archive tier')
+    parser.add_argument('--after-days', type=int, help='Archive jobs untouched for this many days')
+    parser.add_argument('--workers', type=int, help='Compression processes (0 compresses inline)')
+    parser.add_argument('--io-budget-mb', type=float,
+                        help='Read budget shared by all workers, in MB/s (0 = unlimited)')
+    args = parser.parse_args()
+
+    app = create_app()
+    if args.after_days is not None:
+        app.config['ARCHIVE_AFTER_DAYS'] = args.after_days
+    if args.workers is not None:
+        app.config['ARCHIVE_WORKERS'] = args.workers
+    if args.io_budget_mb is not None:
+        app.config['ARCHIVE_IO_BYTES_PER_SECOND'] = int(args.io_budget_mb * 1024 * 1024)
+
+    print(f"🗜️  Archiving files idle for {app.config['ARCHIVE_AFTER_DAYS']} days "
+          f"with {app.config['ARCHIVE_CODEC']}...")
+    with app.app_context():
+        summary = archiver.run_once()
+    archiver.shutdown()
+
+    saved = summary['original_bytes'] - summary['compressed_bytes']
+    print(f"✅ Archived {summary['archived']} files, saving {saved / (1024 * 1024):.1f} MB")
+    for error in summary['errors']:
+        print(f"⚠️  {error}")
+
+    return not summary['errors']
+
+if __name__ == "__main__":
+    if main():
+        print("\n🎉 Archive pass complete")
+        sys.exit(0)
+    else:
+        print("\n💥 Some files could not be archived")
+        sys.exit(1)
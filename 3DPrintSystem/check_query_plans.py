@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Query Plan Check for 3D Print System
+Verifies that the database planner uses the indexes on the dashboard's hot query paths
+
+Usage:
+    python check_query_plans.py                 # explain against existing data
+    python check_query_plans.py --database sqlite:///plan-check.db --seed 50000
+                                                # seed synthetic rows into a scratch database first
+
+Seeding writes thousands of jobs that staff would see on the dashboard, so it
+only runs against a database given with --database that is not the app's own.
+Missing tables are created there first.
+"""
+import argparse
+import sys
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.utils.query_plans import check_hot_query_plans, seed_plan_check_data, remove_plan_check_data
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that hot dashboard queries use their indexes')
+    parser.add_argument('--database',
+                        help='Database URL to check instead of DATABASE_URL (required with --seed)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Insert this many synthetic jobs (and events) before explaining')
+    parser.add_argument('--keep-seed', action='store_true',
+                        help='Leave seeded rows in place after the check')
+    args = parser.parse_args()
+
+    if args.seed:
+        if not args.database:
+            parser.error('--seed needs --database pointing at a scratch or copied database')
+        if args.database == Config.SQLALCHEMY_DATABASE_URI:
+            parser.error('--database must not be the live DATABASE_URL when seeding')
+    if args.database:
+        Config.SQLALCHEMY_DATABASE_URI = args.database
+
+    app = create_app()
+
+    with app.app_context():
+        if args.seed:
+            db.create_all()
+            print(f"🌱 Seeding {args.seed} synthetic jobs into {args.database}...")
+            seed_plan_check_data(args.seed)
+
+        try:
+            results = check_hot_query_plans()
+        finally:
+            if args.seed and not args.keep_seed:
+                remove_plan_check_data()
+
+    all_ok = True
+    for result in results:
+        marker = '✅' if result['uses_index'] else '❌'
+        print(f"{marker} {result['name']} (expects {result['expected_index']})")
+        for line in result['plan']:
+            print(f"    {line}")
+        all_ok = all_ok and result['uses_index']
+
+    return all_ok
+
+if __name__ == "__main__":
+    if main():
+        print("\n🎉 All hot queries use their indexes")
+        sys.exit(0)
+    else:
+        print("\n💥 Some hot queries are not using their indexes (is the table seeded and analyzed?)")
+        sys.exit(1)
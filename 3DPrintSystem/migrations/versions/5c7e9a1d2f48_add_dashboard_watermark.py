@@ -0,0 +1,35 @@
+"""add dashboard change watermark
+
+Revision ID: 5c7e9a1d2f48
+Revises: 8d2e4b7a6c31
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c7e9a1d2f48'
+down_revision = '8d2e4b7a6c31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('dashboard_watermark',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('jobs_created', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Seed the single row from existing jobs so clients see a consistent starting point
+    op.execute(
+        "INSERT INTO dashboard_watermark (id, version, jobs_created, updated_at) "
+        "SELECT 1, COUNT(*), COUNT(*), MAX(updated_at) FROM job"
+    )
+
+
+def downgrade():
+    op.drop_table('dashboard_watermark')
@@ -0,0 +1,35 @@
+"""add indexes for dashboard and event hot paths
+
+Revision ID: 8d2e4b7a6c31
+Revises: 3a1f5c2e9b10
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2e4b7a6c31'
+down_revision = '3a1f5c2e9b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_job_status_created_at', 'job',
+                    ['status', sa.text('created_at DESC'), sa.text('id DESC')])
+    op.create_index('ix_job_unreviewed_status', 'job', ['status'],
+                    postgresql_where=sa.text('staff_viewed_at IS NULL'),
+                    sqlite_where=sa.text('staff_viewed_at IS NULL'))
+    op.create_index('ix_job_updated_at', 'job', ['updated_at', 'id'])
+    op.create_index('ix_job_student_email_lower', 'job', [sa.text('lower(student_email)')])
+    op.create_index('ix_event_job_id_timestamp', 'event', ['job_id', 'timestamp'])
+
+
+def downgrade():
+    op.drop_index('ix_event_job_id_timestamp', table_name='event')
+    op.drop_index('ix_job_student_email_lower', table_name='job')
+    op.drop_index('ix_job_updated_at', table_name='job')
+    op.drop_index('ix_job_unreviewed_status', table_name='job')
+    op.drop_index('ix_job_status_created_at', table_name='job')
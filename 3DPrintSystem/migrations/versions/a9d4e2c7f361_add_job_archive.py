@@ -0,0 +1,37 @@
+"""add job archive for retention rules
+
+Revision ID: a9d4e2c7f361
+Revises: c1e8b3f6a472
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d4e2c7f361'
+down_revision = 'c1e8b3f6a472'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('job_archive',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('student_email', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.Column('data', sa.JSON(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_archive_archived_at', 'job_archive', ['archived_at'])
+    op.create_index('ix_job_archive_student_email_lower', 'job_archive', [sa.text('lower(student_email)')])
+
+
+def downgrade():
+    op.drop_index('ix_job_archive_student_email_lower', table_name='job_archive')
+    op.drop_index('ix_job_archive_archived_at', table_name='job_archive')
+    op.drop_table('job_archive')
@@ -0,0 +1,39 @@
+"""add job content hash for deduplicated storage
+
+Revision ID: b4f1d6e8a203
+Revises: 5c7e9a1d2f48
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4f1d6e8a203'
+down_revision = '5c7e9a1d2f48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_job_content_hash', 'job', ['content_hash'])
+
+
+def downgrade():
+    op.drop_index('ix_job_content_hash', table_name='job')
+    # SQLite rebuilds the table to drop a column, which loses indexes on expressions
+    # and partial indexes; drop them first and put them back afterwards
+    op.drop_index('ix_job_student_email_lower', table_name='job')
+    op.drop_index('ix_job_unreviewed_status', table_name='job')
+    op.drop_index('ix_job_status_created_at', table_name='job')
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.drop_column('content_hash')
+    op.create_index('ix_job_status_created_at', 'job',
+                    ['status', sa.text('created_at DESC'), sa.text('id DESC')])
+    op.create_index('ix_job_unreviewed_status', 'job', ['status'],
+                    postgresql_where=sa.text('staff_viewed_at IS NULL'),
+                    sqlite_where=sa.text('staff_viewed_at IS NULL'))
+    op.create_index('ix_job_student_email_lower', 'job', [sa.text('lower(student_email)')])
@@ -0,0 +1,24 @@
+"""index job display name for storage reconciliation
+
+Revision ID: c1e8b3f6a472
+Revises: f7c3a5e1d924
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c1e8b3f6a472'
+down_revision = 'f7c3a5e1d924'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_job_display_name', 'job', ['display_name'])
+
+
+def downgrade():
+    op.drop_index('ix_job_display_name', table_name='job')
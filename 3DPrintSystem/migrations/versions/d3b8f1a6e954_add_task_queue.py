@@ -0,0 +1,68 @@
+"""add database task queue, dead letters and claim lock
+
+Revision ID: d3b8f1a6e954
+Revises: a9d4e2c7f361
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3b8f1a6e954'
+down_revision = 'a9d4e2c7f361'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_queue',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_at', sa.DateTime(), nullable=False),
+    sa.Column('dedupe_key', sa.String(length=200), nullable=True),
+    sa.Column('locked_by', sa.String(length=100), nullable=True),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_queue_claim', 'task_queue', ['status', sa.text('priority DESC'), 'run_at', 'id'])
+    op.create_index('ix_task_queue_dedupe_key', 'task_queue', ['dedupe_key', 'status'])
+
+    op.create_table('task_dead_letter',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('failed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_dead_letter_failed_at', 'task_dead_letter', ['failed_at'])
+
+    lock_table = op.create_table('task_lock',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('holder', sa.String(length=100), nullable=True),
+    sa.Column('acquired_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(lock_table, [{'name': 'claim'}])
+
+
+def downgrade():
+    op.drop_table('task_lock')
+    op.drop_index('ix_task_dead_letter_failed_at', table_name='task_dead_letter')
+    op.drop_table('task_dead_letter')
+    op.drop_index('ix_task_queue_dedupe_key', table_name='task_queue')
+    op.drop_index('ix_task_queue_claim', table_name='task_queue')
+    op.drop_table('task_queue')
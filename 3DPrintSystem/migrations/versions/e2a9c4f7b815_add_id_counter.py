@@ -0,0 +1,28 @@
+"""add id counter for upload file IDs
+
+Revision ID: e2a9c4f7b815
+Revises: b4f1d6e8a203
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a9c4f7b815'
+down_revision = 'b4f1d6e8a203'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('id_counter',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('next_value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('id_counter')
@@ -0,0 +1,37 @@
+"""add job mesh analysis
+
+Revision ID: f7c3a5e1d924
+Revises: e2a9c4f7b815
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7c3a5e1d924'
+down_revision = 'e2a9c4f7b815'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('mesh_analysis', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    # SQLite rebuilds the table to drop a column, which loses indexes on expressions
+    # and partial indexes; drop them first and put them back afterwards
+    op.drop_index('ix_job_student_email_lower', table_name='job')
+    op.drop_index('ix_job_unreviewed_status', table_name='job')
+    op.drop_index('ix_job_status_created_at', table_name='job')
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.drop_column('mesh_analysis')
+    op.create_index('ix_job_status_created_at', 'job',
+                    ['status', sa.text('created_at DESC'), sa.text('id DESC')])
+    op.create_index('ix_job_unreviewed_status', 'job', ['status'],
+                    postgresql_where=sa.text('staff_viewed_at IS NULL'),
+                    sqlite_where=sa.text('staff_viewed_at IS NULL'))
+    op.create_index('ix_job_student_email_lower', 'job', [sa.text('lower(student_email)')])
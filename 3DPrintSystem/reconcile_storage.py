@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Storage Reconciliation for 3D Print System
+Compares the status directories under APP_STORAGE_ROOT with the job table
+
+Usage:
+    python reconcile_storage.py              # report orphans, missing files and misfiled jobs
+    python reconcile_storage.py --repair     # also quarantine orphans and fix paths/folders
+                                             # (skips files newer than MOVE_RECOVERY_MIN_AGE_SECONDS
+                                             # and jobs with a move in progress)
+    python reconcile_storage.py --json       # machine-readable report
+"""
+import argparse
+import json
+import sys
+from app import create_app
+from app.services.reconciliation_service import DEFAULT_BATCH_SIZE, DEFAULT_WORKERS, FINDINGS, reconcile_storage
+
+def main():
+    parser = argparse.ArgumentParser(description='Find drift between stored files and job records')
+    parser.add_argument('--repair', action='store_true',
+                        help='Quarantine orphans, record relocated files and move misfiled jobs')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help='Threads for the directory walk and file checks')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Files (or jobs) compared per database query')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    app = create_app()
+
+    with app.app_context():
+        report = reconcile_storage(repair=args.repair, workers=args.workers, batch_size=args.batch_size)
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+        return report.clean
+
+    print(f"📂 Scanned {report.files_scanned} files and {report.jobs_checked} jobs")
+    for finding in FINDINGS:
+        count = report.counts[finding]
+        marker = '✅' if count == report.repaired[finding] else '❌'
+        repaired = f" ({report.repaired[finding]} repaired)" if args.repair else ''
+        print(f"{marker} {finding}: {count}{repaired}")
+        for example in report.samples[finding]:
+            print(f"    {example.get('path')}" + (f"  [job {example['job_id'][:8]}]" if example.get('job_id') else ''))
+    if report.deferred:
+        print(f"⏳ {report.deferred} left for a later run (recently written or mid-move)")
+    for error in report.errors:
+        print(f"⚠️  {error}")
+
+    return report.clean
+
+if __name__ == "__main__":
+    if main():
+        print("\n🎉 Storage and database agree")
+        sys.exit(0)
+    else:
+        print("\n💥 Storage and database disagree (run with --repair to fix what can be fixed)")
+        sys.exit(1)
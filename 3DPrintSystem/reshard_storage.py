@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Storage Resharding for 3D Print System
+Moves every job's file into its folder and shard for the configured STORAGE_LAYOUT
+
+Safe to run while the app is serving: each move is journaled and committed on
+its own, and jobs that change mid-move are re-read rather than overwritten.
+
+Usage:
+    STORAGE_LAYOUT=hash python reshard_storage.py     # reshard into 256 name-hash shards
+    STORAGE_LAYOUT=date python reshard_storage.py     # reshard by year/month of submission
+    STORAGE_LAYOUT=flat python reshard_storage.py     # flatten back into plain folders
+"""
+import argparse
+import os
+import sys
+from app import create_app
+from app.services.file_mover import SETTLE_BATCH_SIZE, file_mover
+from app.services.file_service import STATUS_DIRECTORIES, STORAGE_LAYOUTS, remove_empty_directories
+
+def main():
+    parser = argparse.ArgumentParser(description='Move job files into the configured storage layout')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Files moved concurrently')
+    parser.add_argument('--batch-size', type=int, default=SETTLE_BATCH_SIZE,
+                        help='Jobs read per database query')
+    parser.add_argument('--keep-empty', action='store_true',
+                        help='Leave emptied shard directories in place')
+    args = parser.parse_args()
+
+    app = create_app()
+    layout = app.config['STORAGE_LAYOUT']
+    if layout not in STORAGE_LAYOUTS:
+        print(f"❌ Unknown STORAGE_LAYOUT '{layout}' (expected one of: {', '.join(STORAGE_LAYOUTS)})")
+        return False
+
+    print(f"📂 Resharding {app.config['APP_STORAGE_ROOT']} into the '{layout}' layout...")
+    with app.app_context():
+        summary = file_mover.settle_all(workers=args.workers, batch_size=args.batch_size)
+        removed = 0
+        if not args.keep_empty:
+            for folder in sorted(set(STATUS_DIRECTORIES.values())):
+                removed += remove_empty_directories(os.path.join(app.config['APP_STORAGE_ROOT'], folder))
+
+    print(f"✅ Checked {summary['checked']} jobs, moved {summary['moved']}, removed {removed} empty directories")
+    for error in summary['errors']:
+        print(f"⚠️  {error}")
+
+    return not summary['errors']
+
+if __name__ == "__main__":
+    if main():
+        print("\n🎉 Storage matches the configured layout")
+        sys.exit(0)
+    else:
+        print("\n💥 Some files could not be moved (see reconcile_storage.py for details)")
+        sys.exit(1)
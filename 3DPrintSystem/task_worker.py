@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Task Worker for 3D Print System
+Runs background work queued in the database (TASK_QUEUE_BACKEND=database)
+
+Workers run next to the server and share its storage, so they build the app
+with create_app() alone: move recovery and the archive/retention schedulers
+stay with the server (see start_background_services).
+
+Usage:
+    python task_worker.py                      # run until interrupted
+    python task_worker.py --concurrency 8      # more worker threads
+    python task_worker.py --drain              # exit once nothing is runnable (e.g. from cron)
+    python task_worker.py --stats              # queue and dead-letter counts
+    python task_worker.py --requeue-dead       # retry every dead-lettered task
+"""
+import argparse
+import signal
+import sys
+from app import create_app
+from app.tasks.queue import get_queue_stats, requeue_dead_letters
+from app.tasks.worker import Worker
+
+def main():
+    parser = argparse.ArgumentParser(description='Run queued background tasks')
+    parser.add_argument('--concurrency', type=int, help='Worker threads (default TASK_WORKER_CONCURRENCY)')
+    parser.add_argument('--poll-interval', type=float, help='Seconds to wait when the queue is empty')
+    parser.add_argument('--drain', action='store_true', help='Exit once no task is runnable')
+    parser.add_argument('--stats', action='store_true', help='Print queue counts and exit')
+    parser.add_argument('--requeue-dead', nargs='*', type=int, metavar='ID',
+                        help='Requeue dead-lettered tasks (all of them if no IDs are given) and exit')
+    args = parser.parse_args()
+
+    app = create_app()
+
+    if args.stats or args.requeue_dead is not None:
+        with app.app_context():
+            if args.requeue_dead is not None:
+                requeued = requeue_dead_letters(args.requeue_dead or None)
+                print(f"🔁 Requeued {requeued} dead-lettered tasks")
+            stats = get_queue_stats()
+        print(f"📋 {stats['queued']} queued, {stats['running']} running, {stats['dead_letter']} dead-lettered")
+        return True
+
+    worker = Worker(app, concurrency=args.concurrency, poll_interval=args.poll_interval)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: worker.stop())
+
+    print(f"👷 Worker {worker.worker_id} running {worker.concurrency} threads"
+          f"{' until the queue is drained' if args.drain else ''}...")
+    worker.run(drain=args.drain)
+    print(f"✅ {worker.succeeded} tasks succeeded, {worker.failed} failed")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,80 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Config reads these at import time, so they must be set before importing app
+os.environ.setdefault('SECRET_KEY', 'test')
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+os.environ.setdefault('STAFF_PASSWORD', 'pass')
+os.environ.setdefault('STORAGE_PATH', tempfile.mkdtemp(prefix='3dprint-storage-'))
+# Tests that exercise thumbnail rendering opt back in to the process pool
+os.environ.setdefault('THUMBNAIL_WORKERS', '0')
+# Manifests are exported explicitly with metadata_exporter.flush() in tests
+os.environ.setdefault('METADATA_EXPORT_INTERVAL_SECONDS', '0')
+# File moves run inline after each commit so tests see them immediately
+os.environ.setdefault('FILE_MOVE_WORKERS', '0')
+# Archive passes are run explicitly, compressing inline
+os.environ.setdefault('ARCHIVE_WORKERS', '0')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '3DPrintSystem'))
+
+# Script-style checks that need a live server on localhost:5000
+collect_ignore = [
+    'check_jobs.py',
+    'direct_test.py',
+    'direct_test_fix.py',
+    'test_auto_update.py',
+    'test_dashboard.py',
+    'test_email.py',
+    'test_form_submission.py',
+    'test_modals.py',
+    'test_sound_notifications.py',
+]
+
+
+@pytest.fixture
+def app(tmp_path):
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['APP_STORAGE_ROOT'] = str(tmp_path)
+    app.config['UPLOAD_FOLDER'] = str(tmp_path / 'Uploaded')
+    (tmp_path / 'Uploaded').mkdir()
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def staff_client(app):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['staff_logged_in'] = True
+    return client
+
+
+@pytest.fixture
+def make_job(app):
+    """Factory that inserts a Job row with sensible defaults"""
+    import uuid
+    from app.extensions import db
+    from app.models.job import Job
+
+    def _make_job(**fields):
+        fields.setdefault('id', str(uuid.uuid4()))
+        fields.setdefault('student_name', 'Test Student')
+        fields.setdefault('student_email', 'student@example.edu')
+        fields.setdefault('status', 'UPLOADED')
+        job = Job(**fields)
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    return _make_job
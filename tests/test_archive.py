@@ -0,0 +1,178 @@
+import io
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from app.extensions import db
+from app.models.job import Job
+from app.services import archive_service, file_service
+from app.services.archive_service import archiver, compress_file
+from app.services.blob_store import get_blob_path
+from app.services.file_mover import file_mover, resolve_file_path
+from app.services.file_service import open_stored_file
+from app.services.mesh_service import analyze_mesh
+from app.services.reconciliation_service import reconcile_storage
+
+CUBE_STL = os.path.join(os.path.dirname(__file__), 'test_cube.stl')
+LONG_AGO = datetime(2020, 1, 1)
+
+
+def _stored(app, folder, name, source=CUBE_STL):
+    path = Path(app.config['APP_STORAGE_ROOT']) / folder / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(source, path)
+    return str(path)
+
+
+def _upload(app, job_id, monkeypatch):
+    monkeypatch.setattr(file_service, '_get_next_id', lambda: job_id)
+    with open(CUBE_STL, 'rb') as f:
+        payload = f.read()
+    with app.test_request_context(
+        '/submit', method='POST',
+        data={'file': (io.BytesIO(payload), 'cube.stl')},
+        content_type='multipart/form-data'
+    ):
+        from flask import request
+        form = {'studentName': 'Jane Doe', 'printMethod': 'filament', 'colorPreference': 'red'}
+        return file_service.save_uploaded_file(request.files['file'], form)
+
+
+def test_archiving_an_upload_frees_its_blob(app, make_job, monkeypatch):
+    display_name, file_path, _, content_hash = _upload(app, 'A1', monkeypatch)
+    blob_path = get_blob_path(content_hash)
+    assert os.path.samefile(file_path, blob_path)
+    job = make_job(display_name=display_name, status='PAIDPICKEDUP', updated_at=LONG_AGO,
+                   file_path=file_path, content_hash=content_hash)
+
+    assert archiver.run_once()['archived'] == 1
+
+    db.session.refresh(job)
+    assert job.file_path.endswith('.xz')
+    assert not os.path.exists(file_path)
+    assert not os.path.exists(blob_path)
+    with open_stored_file(job.file_path) as f, open(CUBE_STL, 'rb') as original:
+        assert f.read() == original.read()
+
+
+def test_archiving_keeps_a_blob_another_job_still_links(app, make_job, monkeypatch):
+    old_name, old_path, _, content_hash = _upload(app, 'A1', monkeypatch)
+    new_name, new_path, _, _ = _upload(app, 'A2', monkeypatch)
+    make_job(display_name=old_name, status='PAIDPICKEDUP', updated_at=LONG_AGO,
+             file_path=old_path, content_hash=content_hash)
+    make_job(display_name=new_name, status='UPLOADED', file_path=new_path, content_hash=content_hash)
+
+    assert archiver.run_once()['archived'] == 1
+
+    blob_path = get_blob_path(content_hash)
+    assert os.path.samefile(new_path, blob_path)
+    assert os.stat(blob_path).st_nlink == 2
+
+
+def test_old_picked_up_files_are_compressed_and_read_back(app, make_job):
+    job = make_job(display_name='cube.stl', status='PAIDPICKEDUP', updated_at=LONG_AGO,
+                   file_path=_stored(app, 'PaidPickedUp', 'cube.stl'))
+    original = Path(job.file_path)
+    with open(CUBE_STL, 'rb') as f:
+        contents = f.read()
+
+    summary = archiver.run_once()
+
+    assert summary['archived'] == 1
+    assert summary['original_bytes'] == len(contents)
+    assert summary['compressed_bytes'] < summary['original_bytes']
+    db.session.refresh(job)
+    assert job.file_path.endswith(os.path.join('Archive', 'cube.stl.xz'))
+    assert job.updated_at == LONG_AGO
+    assert not original.exists()
+    with open_stored_file(job.file_path) as f:
+        assert f.read() == contents
+    assert analyze_mesh(job.file_path) == analyze_mesh(CUBE_STL)
+    assert reconcile_storage().clean
+    assert archiver.run_once()['archived'] == 0
+
+
+def test_archived_obj_models_stream_through_the_loader(app, make_job, tmp_path):
+    obj = tmp_path / 'tri.obj'
+    obj.write_text('v 0 0 0\nv 10 0 0\nv 0 10 0\nf 1 2 3\n')
+    job = make_job(display_name='tri.obj', status='REJECTED', updated_at=LONG_AGO,
+                   file_path=_stored(app, 'Uploaded', 'tri.obj', source=obj))
+
+    archiver.run_once()
+
+    db.session.refresh(job)
+    assert job.file_path.endswith('.obj.xz')
+    assert analyze_mesh(job.file_path)['triangle_count'] == 1
+
+
+def test_recent_and_active_jobs_are_left_alone(app, make_job):
+    recent = make_job(display_name='new.stl', status='PAIDPICKEDUP',
+                      file_path=_stored(app, 'PaidPickedUp', 'new.stl'))
+    active = make_job(display_name='busy.stl', status='PRINTING', updated_at=LONG_AGO,
+                      file_path=_stored(app, 'Printing', 'busy.stl'))
+
+    assert archiver.run_once()['archived'] == 0
+    assert Path(recent.file_path).exists()
+    assert Path(active.file_path).exists()
+
+
+def test_job_changed_while_compressing_keeps_its_original(app, make_job, monkeypatch):
+    job = make_job(display_name='cube.stl', status='PAIDPICKEDUP', updated_at=LONG_AGO,
+                   file_path=_stored(app, 'PaidPickedUp', 'cube.stl'))
+    real_compress = archive_service.compress_file
+
+    def compress_then_reopen(source, destination, *args):
+        sizes = real_compress(source, destination, *args)
+        db.session.execute(db.update(Job).where(Job.id == job.id).values(status='COMPLETED'))
+        db.session.commit()
+        return sizes
+    monkeypatch.setattr(archive_service, 'compress_file', compress_then_reopen)
+
+    assert archiver.run_once()['archived'] == 0
+    db.session.refresh(job)
+    assert Path(job.file_path).exists()
+    assert not job.file_path.endswith('.xz')
+    assert list(Path(app.config['APP_STORAGE_ROOT'], 'Archive').rglob('*.xz')) == []
+
+
+def test_archived_files_stay_in_the_archive_tier(app, make_job):
+    job = make_job(display_name='cube.stl', status='PAIDPICKEDUP', updated_at=LONG_AGO,
+                   file_path=_stored(app, 'PaidPickedUp', 'cube.stl'))
+    archiver.run_once()
+    db.session.refresh(job)
+
+    assert file_mover.settle(job.id) is None
+    assert resolve_file_path(job) == job.file_path
+
+
+def test_compression_respects_the_io_budget(tmp_path):
+    source = tmp_path / 'big.stl'
+    source.write_bytes(b'solid big\n' * 30_000)  # 300 KB
+
+    started = time.monotonic()
+    original, compressed = compress_file(str(source), str(tmp_path / 'big.stl.xz'), 'lzma',
+                                         bytes_per_second=1_000_000, chunk_size=64 * 1024)
+
+    assert original == 300_000
+    assert compressed < original // 10
+    assert time.monotonic() - started >= 0.25
+
+
+def test_scheduled_passes_start_only_in_the_server_process(monkeypatch):
+    from app import create_app, start_background_services
+    from app.config import Config
+
+    monkeypatch.setattr(Config, 'ARCHIVE_INTERVAL_SECONDS', 3600)
+    app = create_app()  # As CLI scripts and task workers do
+    assert archiver._thread is None or not archiver._thread.is_alive()
+
+    start_background_services(app)
+    try:
+        assert archiver._thread.is_alive()
+    finally:
+        archiver._stop.set()
+        archiver._thread.join(5)
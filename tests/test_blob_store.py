@@ -0,0 +1,82 @@
+import io
+import os
+
+from app.services import file_service
+from app.services.blob_store import deduplicate_file, get_blob_path, prune_unreferenced_blobs
+from app.services.move_journal import begin_move
+
+FORM = {
+    'studentName': 'Jane Doe',
+    'printMethod': 'filament',
+    'colorPreference': 'red',
+}
+
+
+def _save(app, payload, job_id, monkeypatch):
+    monkeypatch.setattr(file_service, '_get_next_id', lambda: job_id)
+    with app.test_request_context(
+        '/submit', method='POST',
+        data={'file': (io.BytesIO(payload), 'part.stl')},
+        content_type='multipart/form-data'
+    ):
+        from flask import request
+        return file_service.save_uploaded_file(request.files['file'], FORM)
+
+
+def test_identical_uploads_share_one_blob(app, monkeypatch):
+    payload = os.urandom(4096)
+    _, first_path, _, first_hash = _save(app, payload, 'A1', monkeypatch)
+    _, second_path, _, second_hash = _save(app, payload, 'A2', monkeypatch)
+
+    assert first_hash == second_hash
+    assert first_path != second_path
+    with app.app_context():
+        blob_path = get_blob_path(first_hash)
+    assert os.path.samefile(first_path, blob_path)
+    assert os.path.samefile(second_path, blob_path)
+    assert os.stat(blob_path).st_nlink == 3
+
+
+def test_different_uploads_get_their_own_blobs(app, monkeypatch):
+    _, first_path, _, first_hash = _save(app, b'solid a', 'A1', monkeypatch)
+    _, second_path, _, second_hash = _save(app, b'solid b', 'A2', monkeypatch)
+
+    assert first_hash != second_hash
+    assert not os.path.samefile(first_path, second_path)
+
+
+def test_deduplicated_file_survives_status_moves(app, monkeypatch):
+    _, path, _, content_hash = _save(app, b'solid cube', 'A1', monkeypatch)
+    move = begin_move('job-1', path, 'Uploaded', 'Pending')
+    move.complete()
+
+    assert os.path.samefile(move.new_path, get_blob_path(content_hash))
+
+
+def test_prune_removes_only_unreferenced_blobs(app, tmp_path):
+    kept, dropped = tmp_path / 'kept.stl', tmp_path / 'dropped.stl'
+    kept.write_bytes(b'kept')
+    dropped.write_bytes(b'dropped')
+    deduplicate_file(str(kept), 'a' * 64)
+    deduplicate_file(str(dropped), 'b' * 64)
+    dropped.unlink()
+
+    assert prune_unreferenced_blobs() == 1
+    assert os.path.exists(get_blob_path('a' * 64))
+    assert not os.path.exists(get_blob_path('b' * 64))
+
+
+def test_dashboard_reports_identical_jobs(staff_client, make_job):
+    original = make_job(status='REJECTED', content_hash='c' * 64, student_name='Jane Doe')
+    resubmission = make_job(status='UPLOADED', content_hash='c' * 64)
+    make_job(status='UPLOADED', content_hash='d' * 64)
+
+    jobs = staff_client.get('/dashboard/api/stats?status=UPLOADED').get_json()['jobs']
+    by_id = {job['id']: job for job in jobs}
+
+    assert by_id[resubmission.id]['identical_to']['id'] == original.id
+    assert by_id[resubmission.id]['identical_to']['status'] == 'REJECTED'
+    assert sum(1 for job in jobs if job['identical_to']) == 1
+
+    page = staff_client.get('/dashboard/?status=UPLOADED').get_data(as_text=True)
+    assert 'Identical to Jane Doe' in page
@@ -0,0 +1,91 @@
+import os
+from pathlib import Path
+
+from app.extensions import db
+from app.models.event import Event
+from app.models.job import Job
+
+
+def make_uploaded_file(app, name):
+    path = Path(app.config['UPLOAD_FOLDER']) / name
+    path.write_text('solid test')
+    return str(path)
+
+
+def test_single_approve_still_moves_file_and_logs_event(app, staff_client, make_job):
+    job = make_job(file_path=make_uploaded_file(app, 'single.stl'))
+
+    response = staff_client.post(f'/dashboard/api/approve-job/{job.id}',
+                                 json={'weight_g': 50, 'time_hours': 2, 'material': 'Resin'})
+
+    assert response.get_json()['job_data']['cost_usd'] == 10.0
+    db.session.refresh(job)
+    assert job.status == 'PENDING'
+    assert Path(job.file_path).parent.name == 'Pending'
+    assert Event.query.filter_by(job_id=job.id, event_type='StaffApproved').count() == 1
+
+
+def test_bulk_approve_applies_per_job_params_and_reports_failures(app, staff_client, make_job):
+    first = make_job(file_path=make_uploaded_file(app, 'first.stl'))
+    second = make_job(file_path=make_uploaded_file(app, 'second.stl'))
+    already_pending = make_job(status='PENDING')
+
+    response = staff_client.post('/dashboard/api/bulk/approve', json={
+        'weight_g': 10,
+        'time_hours': 1,
+        'jobs': [first.id, {'id': second.id, 'weight_g': 100}, already_pending.id, 'missing'],
+    })
+    data = response.get_json()
+
+    assert data['succeeded'] == 2
+    assert data['failed'] == 2
+    results = {result['job_id']: result for result in data['results']}
+    assert results[first.id]['job_data']['cost_usd'] == 3.0
+    assert results[second.id]['job_data']['cost_usd'] == 10.0
+    assert results[already_pending.id]['error'] == 'Job cannot be approved from PENDING status'
+    assert results['missing']['status_code'] == 404
+
+    pending_dir = Path(app.config['APP_STORAGE_ROOT']) / 'Pending'
+    assert sorted(os.listdir(pending_dir)) == ['first.stl', 'second.stl']
+    assert Event.query.filter_by(event_type='StaffApproved').count() == 2
+
+
+def test_bulk_approve_restores_files_when_commit_fails(app, staff_client, make_job, monkeypatch):
+    job = make_job(file_path=make_uploaded_file(app, 'rollback.stl'))
+
+    def failing_commit():
+        raise RuntimeError('database unavailable')
+    monkeypatch.setattr(db.session, 'commit', failing_commit)
+
+    data = staff_client.post('/dashboard/api/bulk/approve',
+                             json={'job_ids': [job.id], 'weight_g': 10, 'time_hours': 1}).get_json()
+
+    assert data['results'][0]['success'] is False
+    assert (Path(app.config['UPLOAD_FOLDER']) / 'rollback.stl').exists()
+
+
+def test_bulk_reject_and_mark_reviewed(staff_client, make_job):
+    to_reject = make_job()
+    to_review = make_job()
+
+    rejected = staff_client.post('/dashboard/api/bulk/reject',
+                                 json={'job_ids': [to_reject.id], 'reasons': ['Not manifold']}).get_json()
+    reviewed = staff_client.post('/dashboard/api/bulk/mark-reviewed',
+                                 json={'job_ids': [to_review.id]}).get_json()
+
+    assert rejected['succeeded'] == 1
+    assert reviewed['succeeded'] == 1
+    assert db.session.get(Job, to_reject.id).status == 'REJECTED'
+    assert db.session.get(Job, to_review.id).staff_viewed_at is not None
+
+
+def test_bulk_request_requires_jobs(staff_client):
+    response = staff_client.post('/dashboard/api/bulk/reject', json={'reasons': ['x']})
+    assert response.status_code == 400
+
+
+def test_bulk_request_rejects_non_object_bodies(staff_client):
+    for body in (['job-1'], 'job-1', 7):
+        response = staff_client.post('/dashboard/api/bulk/approve', json=body)
+        assert response.status_code == 400
+        assert response.get_json()['success'] is False
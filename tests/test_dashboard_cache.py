@@ -0,0 +1,48 @@
+import time
+
+from app.services.cache_service import TTLCache, dashboard_cache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.get_or_load('a', lambda: 1)
+    cache.get_or_load('b', lambda: 2)
+    cache.get_or_load('a', lambda: 'reloaded')
+    cache.get_or_load('c', lambda: 3)
+
+    assert cache.get_or_load('a', lambda: 'reloaded') == 1
+    assert cache.get_or_load('b', lambda: 'reloaded') == 'reloaded'
+    assert cache.stats()['hits'] == 2
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(max_entries=10, ttl_seconds=0.01)
+    cache.get_or_load('a', lambda: 1)
+    time.sleep(0.02)
+    assert cache.get_or_load('a', lambda: 2) == 2
+
+
+def test_repeated_polls_hit_the_cache(staff_client, make_job):
+    make_job(status='UPLOADED')
+    staff_client.get('/dashboard/api/stats')
+    before = dashboard_cache.stats()
+
+    staff_client.get('/dashboard/api/stats')
+    after = dashboard_cache.stats()
+
+    assert after['misses'] == before['misses']
+    assert after['hits'] > before['hits']
+
+
+def test_job_write_invalidates_cache(staff_client, make_job):
+    job = make_job(status='UPLOADED')
+    assert staff_client.get('/dashboard/api/stats').get_json()['stats']['unreviewed'] == 1
+
+    staff_client.post(f'/dashboard/api/mark-reviewed/{job.id}')
+
+    assert staff_client.get('/dashboard/api/stats').get_json()['stats']['unreviewed'] == 0
+
+
+def test_cache_stats_endpoint(staff_client):
+    data = staff_client.get('/dashboard/api/cache-stats').get_json()
+    assert set(data['cache']) >= {'hits', 'misses', 'entries', 'hit_rate'}
@@ -0,0 +1,33 @@
+from app.extensions import db
+
+
+def test_unchanged_dataset_returns_304(staff_client, make_job):
+    make_job(status='UPLOADED')
+
+    first = staff_client.get('/dashboard/api/stats')
+    etag = first.headers['ETag']
+    second = staff_client.get('/dashboard/api/stats', headers={'If-None-Match': etag})
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.data == b''
+    assert second.headers['ETag'] == etag
+
+
+def test_etag_changes_when_a_job_changes(staff_client, make_job):
+    job = make_job(status='UPLOADED')
+    etag = staff_client.get('/dashboard/api/stats').headers['ETag']
+
+    job.status = 'PENDING'
+    db.session.commit()
+    response = staff_client.get('/dashboard/api/stats', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_etag_depends_on_requested_tab(staff_client, make_job):
+    make_job(status='UPLOADED')
+    uploaded = staff_client.get('/dashboard/api/stats?status=UPLOADED').headers['ETag']
+    pending = staff_client.get('/dashboard/api/stats?status=PENDING').headers['ETag']
+    assert uploaded != pending
@@ -0,0 +1,94 @@
+import queue
+
+from app.extensions import db
+from app.services.event_bus import EventBus, dashboard_bus, format_sse, queue_job_event
+
+
+def drain(subscription):
+    events = []
+    while True:
+        try:
+            events.append(subscription.get_nowait())
+        except queue.Empty:
+            return events
+
+
+def test_bus_drops_events_for_slow_subscribers():
+    bus = EventBus(max_queue_size=1)
+    subscription = bus.subscribe()
+    bus.publish('job_updated', {'job_id': 'a'})
+    bus.publish('job_updated', {'job_id': 'b'})
+
+    assert drain(subscription) == [('job_updated', {'job_id': 'a'})]
+    bus.unsubscribe(subscription)
+    assert bus.subscriber_count == 0
+
+
+def test_events_publish_only_after_commit(app, make_job):
+    job = make_job(status='UPLOADED')
+    subscription = dashboard_bus.subscribe()
+    try:
+        job.status = 'PENDING'
+        queue_job_event('job_updated', job)
+        assert drain(subscription) == []
+
+        db.session.commit()
+        assert drain(subscription) == [
+            ('job_updated', {'job_id': job.id, 'status': 'PENDING'}),
+            ('stats_changed', {}),
+        ]
+
+        queue_job_event('job_updated', job)
+        db.session.rollback()
+        db.session.commit()
+        assert drain(subscription) == []
+    finally:
+        dashboard_bus.unsubscribe(subscription)
+
+
+def test_mark_reviewed_pushes_job_updated(app, staff_client, make_job):
+    job = make_job(status='UPLOADED')
+    subscription = dashboard_bus.subscribe()
+    try:
+        staff_client.post(f'/dashboard/api/mark-reviewed/{job.id}')
+        event_types = [event_type for event_type, _ in drain(subscription)]
+    finally:
+        dashboard_bus.unsubscribe(subscription)
+
+    assert event_types == ['job_updated', 'stats_changed']
+
+
+def test_stream_endpoint_speaks_event_stream(app, staff_client):
+    app.config['SSE_MAX_STREAM_SECONDS'] = 0
+
+    response = staff_client.get('/dashboard/api/stream')
+
+    assert response.mimetype == 'text/event-stream'
+    assert response.get_data(as_text=True).startswith('retry:')
+    assert dashboard_bus.subscriber_count == 0
+
+
+def test_format_sse():
+    assert format_sse('job_created', {'job_id': 'x'}) == 'event: job_created\ndata: {"job_id": "x"}\n\n'
+
+
+def test_stream_refuses_connections_past_the_cap(app, staff_client):
+    app.config['SSE_MAX_SUBSCRIBERS'] = 1
+    held = dashboard_bus.subscribe()
+    try:
+        response = staff_client.get('/dashboard/api/stream')
+    finally:
+        dashboard_bus.unsubscribe(held)
+
+    assert response.status_code == 503
+    assert dashboard_bus.subscriber_count == 0
+
+
+def test_stream_releases_its_slot_when_closed_unread(app, staff_client):
+    app.config['SSE_MAX_STREAM_SECONDS'] = 0
+
+    response = staff_client.get('/dashboard/api/stream', buffered=False)
+    assert dashboard_bus.subscriber_count == 1
+    response.close()
+
+    assert dashboard_bus.subscriber_count == 0
@@ -0,0 +1,84 @@
+from app.extensions import db
+
+
+def test_full_sync_returns_cursor(staff_client, make_job):
+    make_job(status='UPLOADED')
+
+    data = staff_client.get('/dashboard/api/stats').get_json()
+
+    assert data['delta'] is False
+    assert len(data['jobs']) == 1
+    assert data['cursor']
+
+
+def test_delta_sync_returns_only_changes(app, staff_client, make_job):
+    app.config['DELTA_SYNC_OVERLAP_SECONDS'] = 0
+    stays = make_job(status='UPLOADED', student_name='Unchanged')
+    leaves = make_job(status='UPLOADED', student_name='Approved')
+    cursor = staff_client.get('/dashboard/api/stats').get_json()['cursor']
+
+    idle = staff_client.get(f'/dashboard/api/stats?since={cursor}').get_json()
+    assert idle['delta'] is True
+    assert idle['jobs'] == []
+    assert idle['removed_ids'] == []
+    assert idle['cursor'] == cursor
+
+    leaves.status = 'PENDING'
+    db.session.commit()
+    arrived = make_job(status='UPLOADED', student_name='New')
+
+    data = staff_client.get(f'/dashboard/api/stats?since={cursor}').get_json()
+
+    assert [job['id'] for job in data['jobs']] == [arrived.id]
+    assert data['removed_ids'] == [leaves.id]
+    assert stays.id not in data['removed_ids']
+    assert data['cursor'] != cursor
+
+
+def test_malformed_cursor_falls_back_to_full_sync(staff_client, make_job):
+    make_job(status='UPLOADED')
+
+    data = staff_client.get('/dashboard/api/stats?since=garbage').get_json()
+
+    assert data['delta'] is False
+    assert len(data['jobs']) == 1
+
+
+def test_delta_sync_reports_jobs_archived_by_retention(app, staff_client, make_job):
+    from datetime import datetime
+    app.config['DELTA_SYNC_OVERLAP_SECONDS'] = 0
+    from app.services.retention_service import apply_retention, parse_retention_rules
+
+    archived = make_job(status='PAIDPICKEDUP', updated_at=datetime(2020, 1, 1))
+    archived_id = archived.id
+    make_job(status='PAIDPICKEDUP')
+    cursor = staff_client.get('/dashboard/api/stats?status=PAIDPICKEDUP').get_json()['cursor']
+    db.session.expunge_all()
+
+    apply_retention(parse_retention_rules('PAIDPICKEDUP:archive_rows:365'))
+
+    data = staff_client.get(f'/dashboard/api/stats?status=PAIDPICKEDUP&since={cursor}').get_json()
+    assert data['removed_ids'] == [archived_id]
+    assert data['jobs'] == []
+
+    # The cursor moves past the deletion, so it is reported once
+    again = staff_client.get(f"/dashboard/api/stats?status=PAIDPICKEDUP&since={data['cursor']}").get_json()
+    assert again['removed_ids'] == []
+
+
+def test_delta_sync_catches_changes_committed_behind_the_cursor(app, staff_client, make_job):
+    from datetime import datetime, timedelta
+
+    make_job(status='UPLOADED')
+    cursor = staff_client.get('/dashboard/api/stats').get_json()['cursor']
+    held_at = datetime.fromisoformat(cursor.split('|')[0])
+
+    # A slower transaction flushed before the client's cursor but commits only now
+    late = make_job(status='UPLOADED', student_name='Late', updated_at=held_at - timedelta(seconds=2))
+
+    data = staff_client.get(f'/dashboard/api/stats?since={cursor}').get_json()
+    assert late.id in [job['id'] for job in data['jobs']]
+    assert data['cursor'] == cursor  # Never moves backwards
+
+    app.config['DELTA_SYNC_OVERLAP_SECONDS'] = 0
+    assert staff_client.get(f'/dashboard/api/stats?since={cursor}').get_json()['jobs'] == []
@@ -4,7 +4,7 @@ from pathlib import Path
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '3DPrintSystem'))
 from app import create_app
-from app.routes.dashboard import _move_file_between_status_dirs
+from app.services.move_journal import begin_move
 
 
 def test_move_file_updates_metadata_path(tmp_path):
@@ -27,7 +27,9 @@ def test_move_file_updates_metadata_path(tmp_path):
     meta_file.write_text('{}')
 
     with app.app_context():
-        new_file, new_meta = _move_file_between_status_dirs(str(test_file), 'Uploaded', 'Pending')
+        move = begin_move('job-1', str(test_file), 'Uploaded', 'Pending', metadata_path=str(meta_file))
+        move.complete()
+        new_file, new_meta = move.new_path, move.new_metadata_path
 
     assert Path(new_file).exists()
     assert Path(new_meta).exists()
@@ -0,0 +1,88 @@
+import threading
+from pathlib import Path
+
+from app.extensions import db
+from app.models.job import Job
+from app.services import file_mover as file_mover_module
+from app.services.file_mover import file_mover, queue_file_move, resolve_file_path
+
+
+def _uploaded(app, name):
+    path = Path(app.config['UPLOAD_FOLDER']) / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('solid test')
+    return str(path)
+
+
+def _hold_moves(monkeypatch):
+    """Let renames happen but block before the new path is committed"""
+    renamed, release = threading.Event(), threading.Event()
+    real_begin_move = file_mover_module.begin_move
+
+    def held_begin_move(*args, **kwargs):
+        move = real_begin_move(*args, **kwargs)
+        renamed.set()
+        release.wait(5)
+        return move
+    monkeypatch.setattr(file_mover_module, 'begin_move', held_begin_move)
+    return renamed, release
+
+
+def test_approval_commits_before_the_file_moves(app, staff_client, make_job, monkeypatch):
+    app.config['FILE_MOVE_WORKERS'] = 2
+    path = _uploaded(app, 'slow.stl')
+    job = make_job(file_path=path)
+    renamed, release = _hold_moves(monkeypatch)
+
+    response = staff_client.post(f'/dashboard/api/approve-job/{job.id}', json={'weight_g': 10, 'time_hours': 1})
+    assert response.get_json()['success']
+    assert renamed.wait(5)
+
+    # Status is committed; the row still names the source while the rename is in flight
+    row = db.session.get(Job, job.id)
+    assert row.status == 'PENDING'
+    assert row.file_path == path
+    assert Path(resolve_file_path(row)).parent.name == 'Pending'
+    approved_at = row.updated_at
+
+    release.set()
+    file_mover.wait(5)
+    db.session.refresh(row)
+    assert Path(row.file_path).parent.name == 'Pending'
+    assert Path(row.file_path).exists()
+    assert row.updated_at == approved_at  # The move is not a job change
+
+
+def test_superseded_moves_go_straight_to_the_latest_folder(app, make_job):
+    path = _uploaded(app, 'fast.stl')
+    job = make_job(file_path=path, status='UPLOADED')
+    app.config['FILE_MOVE_WORKERS'] = 2
+
+    job.status = 'PENDING'
+    job.status = 'READYTOPRINT'
+    queue_file_move(job)
+    queue_file_move(job)
+    db.session.commit()
+    file_mover.wait(5)
+
+    row = db.session.get(Job, job.id)
+    assert Path(row.file_path).parent.name == 'ReadyToPrint'
+    assert not (Path(app.config['APP_STORAGE_ROOT']) / 'Pending' / 'fast.stl').exists()
+
+
+def test_rolled_back_transitions_move_nothing(app, make_job):
+    path = _uploaded(app, 'stay.stl')
+    job = make_job(file_path=path)
+
+    job.status = 'PENDING'
+    queue_file_move(job)
+    db.session.rollback()
+    db.session.commit()
+
+    assert Path(path).exists()
+
+
+def test_settle_leaves_files_already_in_place(app, make_job):
+    job = make_job(file_path=_uploaded(app, 'home.stl'), status='UPLOADED')
+
+    assert file_mover.settle(job.id) is None
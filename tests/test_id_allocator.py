@@ -0,0 +1,97 @@
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Flask
+
+from app.extensions import db
+from app.services.id_allocator import (
+    FILE_ID_START,
+    BlockAllocator,
+    allocate_file_ids,
+    to_base36,
+)
+
+THREADS = 16
+PROCESSES = 4
+IDS_PER_WORKER = 200
+
+
+def _file_db_app(db_path):
+    """Minimal app on a file-backed SQLite database, which threads and processes can share"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'timeout': 60}}
+    app.config['FILE_ID_BLOCK_SIZE'] = 7
+    db.init_app(app)
+    return app
+
+
+def _allocate_in_process(db_path):
+    app = _file_db_app(db_path)
+    with app.app_context():
+        return allocate_file_ids(IDS_PER_WORKER)
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    db_path = tmp_path / 'ids.db'
+    app = _file_db_app(db_path)
+    with app.app_context():
+        db.create_all()
+    return app, db_path
+
+
+def test_base36_ids_never_collide_with_legacy_ids():
+    assert to_base36(0) == '0'
+    assert to_base36(FILE_ID_START) == '1000'
+    assert to_base36(FILE_ID_START - 1) == 'ZZZ'
+
+
+def test_ids_are_unique_and_ascending(app):
+    ids = allocate_file_ids(50) + allocate_file_ids(3)
+    values = [int(file_id, 36) for file_id in ids]
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert all(len(file_id) >= 4 for file_id in ids)
+
+
+def test_threads_sharing_one_allocator_get_distinct_ids(file_db):
+    app, _ = file_db
+    allocator = BlockAllocator('stress_shared')
+
+    def worker():
+        with app.app_context():
+            return [value for _ in range(IDS_PER_WORKER) for value in allocator.allocate()]
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = [value for chunk in executor.map(lambda _: worker(), range(THREADS)) for value in chunk]
+
+    assert len(results) == THREADS * IDS_PER_WORKER
+    assert len(set(results)) == len(results)
+
+
+def test_independent_allocators_contending_on_the_database_get_distinct_ids(file_db):
+    app, _ = file_db
+
+    def worker():
+        # A separate allocator per thread stands in for a separate process
+        allocator = BlockAllocator('stress_contended')
+        with app.app_context():
+            return [value for _ in range(IDS_PER_WORKER) for value in allocator.allocate(block_size=3)]
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = [value for chunk in executor.map(lambda _: worker(), range(THREADS)) for value in chunk]
+
+    assert len(set(results)) == THREADS * IDS_PER_WORKER
+
+
+def test_processes_get_distinct_ids(file_db):
+    _, db_path = file_db
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(PROCESSES) as pool:
+        results = [file_id for chunk in pool.map(_allocate_in_process, [str(db_path)] * PROCESSES) for file_id in chunk]
+
+    assert len(results) == PROCESSES * IDS_PER_WORKER
+    assert len(set(results)) == len(results)
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+from app.services.listing_service import get_job_page
+from app.services.sync_service import decode_cursor
+
+
+def test_keyset_pages_cover_tab_without_overlap(app, make_job):
+    base = datetime(2025, 1, 1)
+    # Two jobs share a created_at to exercise the id tie-breaker
+    created = [base, base, base + timedelta(hours=1), base + timedelta(hours=2), base + timedelta(hours=3)]
+    for index, created_at in enumerate(created):
+        make_job(id=f'job-{index}', status='COMPLETED', created_at=created_at)
+    make_job(status='UPLOADED', created_at=base)
+
+    seen = []
+    cursor = None
+    while True:
+        jobs, next_cursor = get_job_page('COMPLETED', after=decode_cursor(cursor), limit=2)
+        seen.extend(job.id for job in jobs)
+        if not next_cursor:
+            break
+        cursor = next_cursor
+
+    assert seen == ['job-4', 'job-3', 'job-2', 'job-1', 'job-0']
+
+
+def test_last_page_has_no_cursor(app, make_job):
+    make_job(status='PRINTING')
+    jobs, next_cursor = get_job_page('PRINTING', limit=1)
+    assert len(jobs) == 1
+    assert next_cursor is None
+
+
+def test_api_stats_pages_with_after(app, staff_client, make_job):
+    app.config['DASHBOARD_PAGE_SIZE'] = 1
+    older = make_job(status='REJECTED', created_at=datetime(2025, 1, 1))
+    newer = make_job(status='REJECTED', created_at=datetime(2025, 1, 2))
+
+    first = staff_client.get('/dashboard/api/stats?status=REJECTED').get_json()
+    assert [job['id'] for job in first['jobs']] == [newer.id]
+    assert first['stats']['rejected'] == 2
+
+    second = staff_client.get(f"/dashboard/api/stats?status=REJECTED&after={first['next_page']}").get_json()
+    assert [job['id'] for job in second['jobs']] == [older.id]
+    assert second['next_page'] is None
+
+
+def test_index_renders_first_page_only(app, staff_client, make_job):
+    app.config['DASHBOARD_PAGE_SIZE'] = 1
+    make_job(status='UPLOADED', student_name='Newest Student', created_at=datetime(2025, 1, 2))
+    make_job(status='UPLOADED', student_name='Oldest Student', created_at=datetime(2025, 1, 1))
+
+    html = staff_client.get('/dashboard/').get_data(as_text=True)
+
+    assert 'Newest Student' in html
+    assert 'Oldest Student' not in html
+
+
+def test_listing_rows_skip_orm_hydration(app, make_job):
+    from decimal import Decimal
+    from app.extensions import db
+    from app.services.serializers import serialize_job_listing
+
+    make_job(status='PENDING', notes='internal only', cost_usd=Decimal('4.50'),
+             created_at=datetime(2025, 1, 1))
+    db.session.expunge_all()
+
+    jobs, _ = get_job_page('PENDING')
+
+    assert len(db.session.identity_map) == 0
+    data = serialize_job_listing(jobs[0])
+    assert data['cost_usd'] == 4.5
+    assert data['created_at'] == '2025-01-01T00:00:00'
+    assert data['staff_viewed_at'] is None
+    assert 'notes' not in data
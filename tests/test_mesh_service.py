@@ -0,0 +1,137 @@
+import os
+import time
+import zipfile
+
+import numpy as np
+import pytest
+
+from app.services.mesh_service import BINARY_STL_DTYPE, MeshAnalysisError, analyze_mesh
+
+CUBE_STL = os.path.join(os.path.dirname(__file__), 'test_cube.stl')
+
+# A 10 mm cube as 8 corners and 12 outward-facing triangles
+CUBE_VERTICES = np.array([
+    [0, 0, 0], [10, 0, 0], [10, 10, 0], [0, 10, 0],
+    [0, 0, 10], [10, 0, 10], [10, 10, 10], [0, 10, 10],
+], dtype=np.float64)
+CUBE_FACES = np.array([
+    [0, 2, 1], [0, 3, 2], [4, 5, 6], [4, 6, 7],
+    [0, 1, 5], [0, 5, 4], [1, 2, 6], [1, 6, 5],
+    [2, 3, 7], [2, 7, 6], [3, 0, 4], [3, 4, 7],
+])
+
+
+def _write_binary_stl(path, triangles):
+    facets = np.zeros(len(triangles), dtype=BINARY_STL_DTYPE)
+    facets['vertices'] = triangles
+    with open(path, 'wb') as f:
+        f.write(b'\0' * 80)
+        f.write(len(triangles).to_bytes(4, 'little'))
+        facets.tofile(f)
+
+
+def test_ascii_stl_unit_cube():
+    analysis = analyze_mesh(CUBE_STL)
+
+    assert analysis['triangle_count'] == 12
+    assert analysis['volume_cm3'] == pytest.approx(0.001)
+    assert analysis['surface_area_cm2'] == pytest.approx(0.06)
+    assert analysis['bounding_box_mm'] == {'x': 1.0, 'y': 1.0, 'z': 1.0}
+
+
+def test_binary_stl_cube_volume_is_position_independent(tmp_path):
+    path = tmp_path / 'cube.stl'
+    _write_binary_stl(path, CUBE_VERTICES[CUBE_FACES] + [100, -50, 7])
+
+    analysis = analyze_mesh(str(path))
+
+    assert analysis['volume_cm3'] == pytest.approx(1.0)
+    assert analysis['surface_area_cm2'] == pytest.approx(6.0)
+    assert analysis['estimated_weight_g'] == {'Filament': 1.2, 'Resin': 1.1}
+
+
+def test_obj_polygons_are_triangulated(tmp_path):
+    path = tmp_path / 'cube.obj'
+    lines = [f"v {x} {y} {z}" for x, y, z in CUBE_VERTICES]
+    # Quads, some using v/vt/vn tokens and negative indices
+    lines += [
+        'f 1 4 3 2', 'f 5/1/1 6/1/1 7/1/1 8/1/1', 'f 1 2 6 5',
+        'f 2 3 7 6', 'f 3 4 8 7', 'f -8 -4 -1 -5',
+    ]
+    path.write_text('\n'.join(lines))
+
+    analysis = analyze_mesh(str(path))
+
+    assert analysis['triangle_count'] == 12
+    assert analysis['volume_cm3'] == pytest.approx(1.0)
+
+
+def test_3mf_is_read_from_zip_with_units(tmp_path):
+    vertices = ''.join(f'<vertex x="{x / 10}" y="{y / 10}" z="{z / 10}"/>' for x, y, z in CUBE_VERTICES)
+    triangles = ''.join(f'<triangle v1="{a}" v2="{b}" v3="{c}"/>' for a, b, c in CUBE_FACES)
+    model = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<model unit="centimeter" xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">'
+        f'<resources><object id="1" type="model"><mesh><vertices>{vertices}</vertices>'
+        f'<triangles>{triangles}</triangles></mesh></object></resources>'
+        '<build><item objectid="1"/></build></model>'
+    )
+    path = tmp_path / 'cube.3mf'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as package:
+        package.writestr('3D/3dmodel.model', model)
+
+    analysis = analyze_mesh(str(path))
+
+    assert analysis['volume_cm3'] == pytest.approx(1.0)
+    assert analysis['bounding_box_mm'] == {'x': 10.0, 'y': 10.0, 'z': 10.0}
+
+
+def test_unreadable_models_raise(tmp_path):
+    path = tmp_path / 'broken.3mf'
+    path.write_bytes(b'not a zip')
+    with pytest.raises(MeshAnalysisError):
+        analyze_mesh(str(path))
+
+
+def test_two_million_triangle_stl_is_fast(tmp_path):
+    path = tmp_path / 'large.stl'
+    rng = np.random.default_rng(0)
+    _write_binary_stl(path, rng.random((2_000_000, 3, 3), dtype=np.float32) * 100)
+
+    start = time.perf_counter()
+    analysis = analyze_mesh(str(path))
+    elapsed = time.perf_counter() - start
+
+    assert analysis['triangle_count'] == 2_000_000
+    assert elapsed < 1.0
+
+
+def test_analysis_endpoint_backfills_and_suggests_weight(staff_client, make_job, tmp_path):
+    path = tmp_path / 'cube.stl'
+    _write_binary_stl(path, CUBE_VERTICES[CUBE_FACES] * 2)
+    job = make_job(status='UPLOADED', file_path=str(path), material='Resin')
+
+    data = staff_client.get(f'/dashboard/api/jobs/{job.id}/analysis').get_json()
+
+    assert data['analysis']['volume_cm3'] == pytest.approx(8.0)
+    assert data['suggested_weight_g'] == 9.0  # 8 cm³ of resin at 1.12 g/cm³
+    assert job.mesh_analysis is not None
+
+
+def test_failed_backfill_is_recorded_and_not_retried(staff_client, make_job, tmp_path, monkeypatch):
+    from app.routes import dashboard
+
+    path = tmp_path / 'broken.stl'
+    path.write_bytes(b'\0' * 84)  # Header only: no triangles
+    job = make_job(status='UPLOADED', file_path=str(path), material='Resin')
+    calls = []
+    real_analyze = dashboard.analyze_mesh
+    monkeypatch.setattr(dashboard, 'analyze_mesh', lambda p: calls.append(p) or real_analyze(p))
+
+    first = staff_client.get(f'/dashboard/api/jobs/{job.id}/analysis').get_json()
+    second = staff_client.get(f'/dashboard/api/jobs/{job.id}/analysis').get_json()
+
+    assert len(calls) == 1
+    assert 'error' in first['analysis']
+    assert second['analysis'] == first['analysis']
+    assert second['suggested_weight_g'] is None
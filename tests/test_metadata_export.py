@@ -0,0 +1,95 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from app.extensions import db
+from app.services import file_service
+from app.services.metadata_export import (
+    MANIFEST_FILENAME,
+    export_all_manifests,
+    metadata_exporter,
+    resolve_metadata_path,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_exporter(app):
+    # The exporter is per process; settle folders left dirty by earlier tests
+    metadata_exporter.flush()
+
+
+def _manifest(app, folder):
+    path = Path(app.config['APP_STORAGE_ROOT']) / folder / MANIFEST_FILENAME
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_uploads_write_no_sidecar_by_default(app, monkeypatch):
+    monkeypatch.setattr(file_service, '_get_next_id', lambda: 'A1')
+    client = app.test_client()
+    upload_id = client.post('/upload/init', json={'filename': 'cube.stl', 'size': 10}).get_json()['upload_id']
+    client.put(f'/upload/{upload_id}?offset=0', data=b'solid cube')
+    client.post(f'/upload/{upload_id}/finalize', json={
+        'student_name': 'Jane Doe',
+        'student_email': 'jane@example.edu',
+        'discipline': 'art',
+        'class_number': 'ART 101',
+        'print_method': 'Filament',
+        'color': 'red',
+        'printer': 'prusa_mk4s',
+        'acknowledged_minimum_charge': 'yes',
+    })
+
+    assert [name for name in os.listdir(app.config['UPLOAD_FOLDER']) if name.endswith('.metadata.json')] == []
+    assert 'Uploaded' in metadata_exporter.dirty_folders
+
+
+def test_commits_mark_old_and_new_folders_dirty(app, make_job):
+    job = make_job(status='UPLOADED')
+    metadata_exporter.flush()
+
+    job.status = 'PENDING'
+    db.session.commit()
+
+    assert metadata_exporter.dirty_folders == {'Uploaded', 'Pending'}
+
+
+def test_rolled_back_changes_mark_nothing(app, make_job):
+    job = make_job(status='UPLOADED')
+    metadata_exporter.flush()
+
+    job.status = 'PENDING'
+    db.session.flush()
+    db.session.rollback()
+
+    assert metadata_exporter.dirty_folders == set()
+
+
+def test_flush_writes_one_manifest_per_dirty_folder(app, make_job):
+    uploaded = make_job(status='UPLOADED', display_name='a.stl')
+    rejected = make_job(status='REJECTED', display_name='b.stl')
+    make_job(status='PENDING', display_name='c.stl')
+
+    written = metadata_exporter.flush()
+
+    assert written == {'Uploaded': 2, 'Pending': 1}
+    lines = _manifest(app, 'Uploaded')
+    assert {line['job_id'] for line in lines} == {uploaded.id, rejected.id}
+    assert lines[0]['display_name'] == 'a.stl'
+    assert metadata_exporter.dirty_folders == set()
+
+
+def test_metadata_path_resolves_to_sidecar_or_manifest(app, staff_client, make_job):
+    legacy = make_job(status='UPLOADED', metadata_path='/legacy/a.metadata.json')
+    current = make_job(status='COMPLETED', display_name='c.stl')
+    export_all_manifests()
+
+    assert resolve_metadata_path(legacy) == '/legacy/a.metadata.json'
+    assert resolve_metadata_path(current) == os.path.join(app.config['APP_STORAGE_ROOT'], 'Completed', MANIFEST_FILENAME)
+    assert _manifest(app, 'Completed')[0]['job_id'] == current.id
+
+    data = staff_client.get(f'/dashboard/api/jobs/{current.id}/metadata').get_json()
+    assert data['metadata']['display_name'] == 'c.stl'
+    assert data['metadata_path'].endswith(MANIFEST_FILENAME)
@@ -0,0 +1,44 @@
+import os
+
+import sqlalchemy as sa
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), '..', '3DPrintSystem', 'migrations')
+
+
+def _job_indexes(engine):
+    with engine.connect() as connection:
+        return dict(connection.execute(sa.text(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'job' AND sql IS NOT NULL"
+        )).all())
+
+
+def test_upgrade_downgrade_upgrade_keeps_every_index(monkeypatch, tmp_path):
+    from flask_migrate import downgrade, upgrade
+    from app import create_app
+    from app.config import Config
+    from app.extensions import db
+
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'migrations.db'}")
+    app = create_app()
+    with app.app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+        upgraded = _job_indexes(db.engine)
+        assert 'ix_job_student_email_lower' in upgraded
+
+        # Dropping mesh_analysis rebuilds the table on SQLite; the expression and partial indexes must survive
+        downgrade(directory=MIGRATIONS_DIR, revision='e2a9c4f7b815')
+        rebuilt = _job_indexes(db.engine)
+        assert rebuilt['ix_job_student_email_lower'] == upgraded['ix_job_student_email_lower']
+        assert rebuilt['ix_job_unreviewed_status'] == upgraded['ix_job_unreviewed_status']
+
+        # content_hash's downgrade rebuilds the table the same way
+        downgrade(directory=MIGRATIONS_DIR, revision='5c7e9a1d2f48')
+        assert _job_indexes(db.engine)['ix_job_student_email_lower'] == upgraded['ix_job_student_email_lower']
+
+        downgrade(directory=MIGRATIONS_DIR, revision='base')
+        assert _job_indexes(db.engine) == {}
+
+        upgrade(directory=MIGRATIONS_DIR)
+        assert _job_indexes(db.engine) == upgraded
+        db.session.remove()
+        db.engine.dispose()
@@ -0,0 +1,146 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from app.extensions import db
+from app.services.move_journal import begin_move, get_journal_dir, recover_moves
+
+
+def _uploaded(app, name, sidecar=True):
+    upload_dir = Path(app.config['UPLOAD_FOLDER'])
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    model = upload_dir / name
+    model.write_text('solid test')
+    if not sidecar:
+        return str(model), None
+    metadata = upload_dir / (Path(name).stem + '.metadata.json')
+    metadata.write_text('{}')
+    return str(model), str(metadata)
+
+
+def _journal_entries(app):
+    journal_dir = get_journal_dir(app.config['APP_STORAGE_ROOT'])
+    return os.listdir(journal_dir) if os.path.isdir(journal_dir) else []
+
+
+def test_move_is_journaled_until_completed(app, make_job):
+    path, metadata_path = _uploaded(app, 'model.stl')
+    job = make_job(file_path=path, metadata_path=metadata_path)
+
+    move = begin_move(job.id, job.file_path, 'Uploaded', 'Pending', metadata_path=job.metadata_path)
+    assert Path(move.new_path).parent.name == 'Pending'
+    assert Path(move.new_metadata_path).exists()
+    assert len(_journal_entries(app)) == 1
+
+    move.complete()
+    assert _journal_entries(app) == []
+
+
+def test_roll_back_restores_model_and_sidecar_together(app, make_job):
+    path, metadata_path = _uploaded(app, 'model.stl')
+    job = make_job(file_path=path, metadata_path=metadata_path)
+
+    begin_move(job.id, path, 'Uploaded', 'Pending', metadata_path=metadata_path).roll_back()
+
+    assert Path(path).exists()
+    assert (Path(path).parent / 'model.metadata.json').exists()
+    assert not (Path(app.config['APP_STORAGE_ROOT']) / 'Pending' / 'model.stl').exists()
+    assert _journal_entries(app) == []
+
+
+def test_existing_destination_is_never_overwritten(app, make_job):
+    job = make_job(file_path=_uploaded(app, 'model.stl', sidecar=False)[0])
+    pending = Path(app.config['APP_STORAGE_ROOT']) / 'Pending'
+    pending.mkdir()
+    (pending / 'model.stl').write_text('someone else')
+
+    with pytest.raises(FileExistsError):
+        begin_move(job.id, job.file_path, 'Uploaded', 'Pending')
+    assert (pending / 'model.stl').read_text() == 'someone else'
+    assert _journal_entries(app) == []
+
+
+def test_recovery_rolls_committed_moves_forward(app, make_job):
+    path, metadata_path = _uploaded(app, 'model.stl')
+    job = make_job(file_path=path, metadata_path=metadata_path)
+    move = begin_move(job.id, path, 'Uploaded', 'Pending', metadata_path=metadata_path)
+    # Crash after the commit but before the sidecar rename landed and the journal was cleared
+    os.rename(move.new_metadata_path, str(Path(path).parent / 'model.metadata.json'))
+    job.file_path = move.new_path
+    db.session.commit()
+
+    assert recover_moves(app.config['APP_STORAGE_ROOT']) == {'rolled_forward': 1, 'rolled_back': 0}
+    assert Path(move.new_path).exists()
+    assert Path(move.new_metadata_path).exists()
+    assert _journal_entries(app) == []
+
+
+def test_recovery_rolls_uncommitted_moves_back(app, make_job):
+    path, metadata_path = _uploaded(app, 'model.stl')
+    job = make_job(file_path=path, metadata_path=metadata_path)
+    begin_move(job.id, path, 'Uploaded', 'Pending', metadata_path=metadata_path)  # Crash before the commit
+
+    assert recover_moves(app.config['APP_STORAGE_ROOT']) == {'rolled_forward': 0, 'rolled_back': 1}
+    assert Path(path).exists()
+    assert (Path(path).parent / 'model.metadata.json').exists()
+
+
+def test_recovery_leaves_recent_entries_alone(app, make_job):
+    job = make_job(file_path=_uploaded(app, 'model.stl')[0])
+    begin_move(job.id, job.file_path, 'Uploaded', 'Pending')
+
+    assert recover_moves(app.config['APP_STORAGE_ROOT'], min_age_seconds=60) == {'rolled_forward': 0, 'rolled_back': 0}
+    assert len(_journal_entries(app)) == 1
+
+
+def test_approve_restores_file_when_commit_fails(app, staff_client, make_job, monkeypatch):
+    path, metadata_path = _uploaded(app, 'approve.stl')
+    job = make_job(file_path=path, metadata_path=metadata_path)
+
+    def failing_commit():
+        raise RuntimeError('database unavailable')
+    monkeypatch.setattr(db.session, 'commit', failing_commit)
+
+    response = staff_client.post(f'/dashboard/api/approve-job/{job.id}', json={'weight_g': 10, 'time_hours': 1})
+
+    assert response.status_code == 500
+    assert Path(path).exists()
+    assert _journal_entries(app) == []
+
+
+def test_other_processes_starting_leave_live_moves_alone(tmp_path, monkeypatch):
+    from app import create_app, start_background_services
+    from app.config import Config
+    from app.models.job import Job
+
+    # Processes share storage and a file-backed database, as in production
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'jobs.db'}")
+    monkeypatch.setattr(Config, 'APP_STORAGE_ROOT', str(tmp_path))
+    monkeypatch.setattr(Config, 'UPLOAD_FOLDER', str(tmp_path / 'Uploaded'))
+    server = create_app()
+    with server.app_context():
+        db.create_all()
+        path = _uploaded(server, 'live.stl', sidecar=False)[0]
+        db.session.add(Job(id='live-job', student_name='Test', student_email='s@example.edu',
+                           status='UPLOADED', file_path=path))
+        db.session.commit()
+        move = begin_move('live-job', path, 'Uploaded', 'Pending')  # Renamed, not yet committed
+
+    # A CLI script or task worker starting next to the server recovers nothing
+    create_app()
+    assert len(_journal_entries(server)) == 1
+
+    # A server restart skips entries younger than MOVE_RECOVERY_MIN_AGE_SECONDS
+    start_background_services(create_app())
+    assert len(_journal_entries(server)) == 1
+    assert Path(move.new_path).exists()
+
+    # Once old enough, the abandoned move is rolled back
+    monkeypatch.setattr(Config, 'MOVE_RECOVERY_MIN_AGE_SECONDS', 0)
+    start_background_services(create_app())
+    assert _journal_entries(server) == []
+    assert Path(path).exists()
+    with server.app_context():
+        db.session.remove()
+        db.engine.dispose()
@@ -0,0 +1,188 @@
+import time
+
+import numpy as np
+import pytest
+
+from app.extensions import db
+from app.models.event import Event
+from app.models.job import Job
+from app.services import file_service, printability_service
+from app.services.mesh_service import BINARY_STL_DTYPE, MeshAnalysisError
+from app.services.printability_service import check_printability, get_build_volume
+
+# A 10 mm cube as 8 corners and 12 outward-facing triangles
+CUBE_VERTICES = np.array([
+    [0, 0, 0], [10, 0, 0], [10, 10, 0], [0, 10, 0],
+    [0, 0, 10], [10, 0, 10], [10, 10, 10], [0, 10, 10],
+], dtype=np.float64)
+CUBE_FACES = np.array([
+    [0, 2, 1], [0, 3, 2], [4, 5, 6], [4, 6, 7],
+    [0, 1, 5], [0, 5, 4], [1, 2, 6], [1, 6, 5],
+    [2, 3, 7], [2, 7, 6], [3, 0, 4], [3, 4, 7],
+])
+
+
+def _write_stl(path, triangles):
+    facets = np.zeros(len(triangles), dtype=BINARY_STL_DTYPE)
+    facets['vertices'] = triangles
+    with open(path, 'wb') as f:
+        f.write(b'\0' * 80)
+        f.write(len(triangles).to_bytes(4, 'little'))
+        facets.tofile(f)
+    return str(path)
+
+
+def _codes(result):
+    return {issue['code']: issue for issue in result['issues']}
+
+
+def test_closed_cube_passes(app, tmp_path):
+    result = check_printability(_write_stl(tmp_path / 'cube.stl', CUBE_VERTICES[CUBE_FACES]), 'prusa_mk4s')
+
+    assert result['passed']
+    assert result['issues'] == []
+    assert result['triangle_count'] == 12
+
+
+def test_missing_face_leaves_open_edges(app, tmp_path):
+    result = check_printability(_write_stl(tmp_path / 'open.stl', CUBE_VERTICES[CUBE_FACES[1:]]), 'prusa_mk4s')
+
+    assert not result['passed']
+    assert _codes(result)['open_edges']['count'] == 3
+
+
+def test_flipped_face_is_inconsistent(app, tmp_path):
+    faces = CUBE_FACES.copy()
+    faces[0] = faces[0][::-1]
+    result = check_printability(_write_stl(tmp_path / 'flipped.stl', CUBE_VERTICES[faces]), 'prusa_mk4s')
+
+    assert result['passed']  # Slicers usually repair winding, so this only warns
+    assert _codes(result)['inconsistent_normals']['count'] == 3
+
+
+def test_inside_out_model_is_flagged(app, tmp_path):
+    result = check_printability(_write_stl(tmp_path / 'inverted.stl', CUBE_VERTICES[CUBE_FACES[:, ::-1]]), 'prusa_mk4s')
+
+    assert set(_codes(result)) == {'inverted_normals'}
+
+
+def test_shared_edge_between_two_cubes_is_non_manifold(app, tmp_path):
+    # A second cube touching the first along one edge only
+    second = CUBE_VERTICES[CUBE_FACES] + [10, 10, 0]
+    result = check_printability(_write_stl(tmp_path / 'pair.stl', np.concatenate((CUBE_VERTICES[CUBE_FACES], second))), 'prusa_xl')
+
+    assert not result['passed']
+    assert _codes(result)['non_manifold_edges']['count'] == 1
+
+
+def test_zero_area_triangles_are_counted(app, tmp_path):
+    sliver = np.array([[[0, 0, 0], [5, 0, 0], [10, 0, 0]]], dtype=np.float64)
+    collapsed = np.array([[[0, 0, 0], [0, 0, 0], [10, 10, 10]]], dtype=np.float64)
+    triangles = np.concatenate((CUBE_VERTICES[CUBE_FACES], sliver, collapsed))
+    result = check_printability(_write_stl(tmp_path / 'degenerate.stl', triangles), 'prusa_mk4s')
+
+    assert _codes(result)['degenerate_faces']['count'] == 2
+
+
+@pytest.mark.parametrize('printer, fits', [
+    ('Formlabs Form 3', False),
+    ('Prusa MK4S', False),
+    ('Bambu X1 Carbon', False),
+    ('Formlabs Form 3L', True),
+    ('raise3d_pro2plus', True),  # Legacy value; fits once stood on end
+    ('unknown_printer', True),
+])
+def test_build_volume_allows_rotation(app, tmp_path, printer, fits):
+    long_box = CUBE_VERTICES[CUBE_FACES] * [30, 15, 4]  # 300 x 150 x 40 mm
+    result = check_printability(_write_stl(tmp_path / 'box.stl', long_box), printer)
+
+    assert ('exceeds_build_volume' not in _codes(result)) == fits
+
+
+@pytest.mark.parametrize('printer', [
+    'Prusa MK4S', 'Prusa Mini', 'Bambu A1 Mini', 'Bambu X1 Carbon', 'Formlabs Form 3', 'Formlabs Form 3L',
+])
+def test_every_printer_on_the_form_has_a_build_volume(printer):
+    assert get_build_volume(printer) is not None
+
+
+def test_models_over_the_triangle_cap_only_get_the_size_check(app, tmp_path):
+    app.config['PRINTABILITY_MAX_TRIANGLES'] = 11
+    long_box = CUBE_VERTICES[CUBE_FACES] * [30, 15, 4]  # 300 x 150 x 40 mm
+    result = check_printability(_write_stl(tmp_path / 'big.stl', long_box), 'Prusa MK4S')
+
+    assert set(_codes(result)) == {'exceeds_build_volume', 'too_large_to_check'}
+    assert result['triangle_count'] == 12
+
+
+def test_timed_out_checks_are_cancelled(app, tmp_path, monkeypatch):
+    app.config['PRINTABILITY_WORKERS'] = 1
+    app.config['PRINTABILITY_TIMEOUT_SECONDS'] = 0.05
+    calls = []
+    real_weld = printability_service.weld_vertices
+
+    def slow_weld(triangles):
+        time.sleep(0.3)
+        return real_weld(triangles)
+    monkeypatch.setattr(printability_service, 'weld_vertices', slow_weld)
+    monkeypatch.setattr(printability_service, 'check_orientation', lambda triangles: calls.append(1) or [])
+    try:
+        result = check_printability(_write_stl(tmp_path / 'cube.stl', CUBE_VERTICES[CUBE_FACES]), 'prusa_mk4s')
+        time.sleep(0.5)
+
+        assert _codes(result)['check_timeout']['count'] == 4
+        assert calls == []  # Queued behind the slow weld and cancelled, not run later
+    finally:
+        printability_service.printability_checker.shutdown()
+
+
+def test_unreadable_model_raises(app, tmp_path):
+    path = tmp_path / 'empty.stl'
+    path.write_bytes(b'\0' * 84)
+
+    with pytest.raises(MeshAnalysisError):
+        check_printability(str(path), 'prusa_mk4s')
+
+
+def _submit(app, stl, printer):
+    """Submit a model through the resumable upload flow, as the form does"""
+    client = app.test_client()
+    with open(stl, 'rb') as f:
+        data = f.read()
+    upload_id = client.post('/upload/init', json={'filename': 'model.stl', 'size': len(data)}).get_json()['upload_id']
+    client.put(f'/upload/{upload_id}?offset=0', data=data)
+    response = client.post(f'/upload/{upload_id}/finalize', json={
+        'student_name': 'Jane Doe',
+        'student_email': 'jane@example.edu',
+        'discipline': 'art',
+        'class_number': 'ART 101',
+        'print_method': 'Filament',
+        'color': 'red',
+        'printer': printer,
+        'acknowledged_minimum_charge': 'yes',
+    })
+    return response.get_json()['job_id']
+
+
+def test_results_are_recorded_at_submission_and_listed(app, staff_client, monkeypatch, tmp_path):
+    monkeypatch.setattr(file_service, '_get_next_id', lambda: 'A1')
+    job_id = _submit(app, _write_stl(tmp_path / 'open.stl', CUBE_VERTICES[CUBE_FACES[1:]]), 'Prusa MK4S')
+
+    event = Event.query.filter_by(job_id=job_id, event_type='JobCreated').one()
+    assert not event.details['printability']['passed']
+
+    listed = staff_client.get('/dashboard/api/stats?status=UPLOADED').get_json()['jobs']
+    check = next(job['printability'] for job in listed if job['id'] == job_id)
+    assert [issue['code'] for issue in check['issues']] == ['open_edges']
+
+    page = staff_client.get('/dashboard/?status=UPLOADED').get_data(as_text=True)
+    assert 'open edge(s)' in page
+
+
+def test_form_printer_choices_get_the_build_volume_check(app, monkeypatch, tmp_path):
+    monkeypatch.setattr(file_service, '_get_next_id', lambda: 'A2')
+    long_box = CUBE_VERTICES[CUBE_FACES] * [30, 15, 4]  # 300 x 150 x 40 mm
+    job_id = _submit(app, _write_stl(tmp_path / 'box.stl', long_box), 'Bambu A1 Mini')
+
+    printability = Event.query.filter_by(job_id=job_id, event_type='JobCreated').one().details['printability']
+    assert [issue['code'] for issue in printability['issues']] == ['exceeds_build_volume']
@@ -0,0 +1,20 @@
+from app.models.job import Job
+from app.utils.query_plans import check_hot_query_plans, remove_plan_check_data, seed_plan_check_data
+
+
+def test_hot_queries_use_their_indexes_on_seeded_database(app):
+    seed_plan_check_data(3000)
+
+    results = check_hot_query_plans()
+
+    missing = [(result['name'], result['plan']) for result in results if not result['uses_index']]
+    assert missing == []
+
+
+def test_remove_seed_data(app, make_job):
+    real = make_job(status='UPLOADED')
+    seed_plan_check_data(10)
+
+    remove_plan_check_data()
+
+    assert [job.id for job in Job.query.all()] == [real.id]
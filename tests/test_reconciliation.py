@@ -0,0 +1,158 @@
+import io
+import os
+import time
+from pathlib import Path
+
+from app.extensions import db
+from app.models.job import Job
+from app.services import file_service
+from app.services.move_journal import begin_move
+from app.services.reconciliation_service import iter_file_batches, reconcile_storage
+
+
+def _file(root, folder, name, text='solid test'):
+    path = Path(root) / folder / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return str(path)
+
+
+def test_parallel_walk_finds_every_file_in_batches(tmp_path):
+    for shard in range(5):
+        for index in range(30):
+            _file(tmp_path, f'Completed/{shard:02d}', f'{shard}-{index}.stl')
+    _file(tmp_path, 'Completed/.hidden', 'skipped.stl')
+
+    batches = list(iter_file_batches([str(tmp_path / 'Completed'), str(tmp_path / 'Missing')], workers=3, batch_size=7))
+
+    assert all(len(batch) <= 7 for batch in batches)
+    names = sorted(os.path.basename(path) for batch in batches for path in batch)
+    assert len(names) == 150
+    assert 'skipped.stl' not in names
+
+
+def test_clean_storage_reports_nothing(app, make_job):
+    root = app.config['APP_STORAGE_ROOT']
+    make_job(display_name='a.stl', status='PENDING',
+             file_path=_file(root, 'Pending', 'a.stl'),
+             metadata_path=_file(root, 'Pending', 'a.metadata.json'))
+
+    report = reconcile_storage()
+
+    assert report.files_scanned == 2
+    assert report.jobs_checked == 1
+    assert report.clean
+
+
+def test_findings_are_reported_without_changes(app, make_job):
+    root = app.config['APP_STORAGE_ROOT']
+    orphan = _file(root, 'Completed', 'stray.stl')
+    missing = make_job(display_name='gone.stl', file_path=os.path.join(root, 'Uploaded', 'gone.stl'))
+    moved = make_job(display_name='moved.stl', status='PENDING',
+                     file_path=os.path.join(root, 'Uploaded', 'moved.stl'))
+    _file(root, 'Pending', 'moved.stl')
+    misfiled = make_job(display_name='late.stl', status='PRINTING', file_path=_file(root, 'Pending', 'late.stl'))
+
+    report = reconcile_storage()
+
+    assert report.counts == {'orphans': 1, 'misplaced': 1, 'duplicates': 0, 'status_mismatch': 1, 'missing': 1}
+    assert report.samples['orphans'] == [{'path': orphan}]
+    assert report.samples['missing'][0]['job_id'] == missing.id
+    assert report.samples['misplaced'][0]['job_id'] == moved.id
+    assert report.samples['status_mismatch'][0]['job_id'] == misfiled.id
+    assert not report.clean
+    assert os.path.exists(orphan)
+
+
+def test_repair_quarantines_relocates_and_refiles(app, make_job):
+    root = app.config['APP_STORAGE_ROOT']
+    _file(root, 'Completed', 'stray.stl')
+    moved_id = make_job(display_name='moved.stl', status='PENDING',
+                        file_path=os.path.join(root, 'Uploaded', 'moved.stl')).id
+    _file(root, 'Pending', 'moved.stl')
+    misfiled_id = make_job(display_name='late.stl', status='PRINTING',
+                           file_path=_file(root, 'Pending', 'late.stl'),
+                           metadata_path=_file(root, 'Pending', 'late.metadata.json')).id
+
+    report = reconcile_storage(repair=True, min_age_seconds=0)
+
+    assert report.repaired == {'orphans': 1, 'misplaced': 1, 'duplicates': 0, 'status_mismatch': 1, 'missing': 0}
+    assert report.clean
+    assert (Path(root) / '.orphans' / 'Completed' / 'stray.stl').exists()
+    assert db.session.get(Job, moved_id).file_path == os.path.join(root, 'Pending', 'moved.stl')
+    refiled = db.session.get(Job, misfiled_id)
+    assert Path(refiled.file_path).parent.name == 'Printing'
+    assert Path(refiled.metadata_path).exists()
+    assert reconcile_storage().clean
+
+
+def test_repair_leaves_fresh_uploads_alone(app):
+    root = app.config['APP_STORAGE_ROOT']
+    fresh = _file(root, 'Uploaded', 'new.stl')  # Its job row has not committed yet
+
+    report = reconcile_storage(repair=True, min_age_seconds=60)
+
+    assert report.counts['orphans'] == 1
+    assert report.repaired['orphans'] == 0
+    assert report.deferred == 1
+    assert os.path.exists(fresh)
+
+
+def test_repair_leaves_fresh_deduplicated_uploads_alone(app, make_job, monkeypatch):
+    def upload(job_id):
+        monkeypatch.setattr(file_service, '_get_next_id', lambda: job_id)
+        with app.test_request_context('/submit', method='POST', content_type='multipart/form-data',
+                                      data={'file': (io.BytesIO(b'solid shared'), 'part.stl')}):
+            from flask import request
+            form = {'studentName': 'Jane Doe', 'printMethod': 'filament', 'colorPreference': 'red'}
+            return file_service.save_uploaded_file(request.files['file'], form)
+
+    first_name, first_path, _, content_hash = upload('A1')
+    make_job(display_name=first_name, status='UPLOADED', file_path=first_path, content_hash=content_hash)
+    long_ago = time.time() - 365 * 24 * 3600
+    os.utime(first_path, (long_ago, long_ago))  # The shared blob was stored long ago
+    _, duplicate_path, _, _ = upload('A2')  # Linked to the old blob; its job has not committed yet
+    assert time.time() - os.path.getmtime(duplicate_path) > 3600
+
+    report = reconcile_storage(repair=True, min_age_seconds=60)
+
+    assert report.counts['orphans'] == 1
+    assert report.deferred == 1
+    assert os.path.exists(duplicate_path)
+
+
+def test_repair_leaves_jobs_mid_move_alone(app, make_job):
+    root = app.config['APP_STORAGE_ROOT']
+    job = make_job(display_name='moving.stl', status='PENDING',
+                   file_path=_file(root, 'Uploaded', 'moving.stl'))
+    move = begin_move(job.id, job.file_path, 'Uploaded', 'Pending', root)  # Not committed yet
+
+    report = reconcile_storage(repair=True, min_age_seconds=0)
+
+    assert report.counts['misplaced'] == 1
+    assert report.repaired['misplaced'] == 0
+    assert report.deferred == 1
+    db.session.expire_all()
+    assert db.session.get(Job, job.id).file_path == os.path.join(root, 'Uploaded', 'moving.stl')
+    move.roll_back()
+    assert os.path.exists(os.path.join(root, 'Uploaded', 'moving.stl'))
+
+
+def test_large_tree_reconciles_quickly(app):
+    root = Path(app.config['APP_STORAGE_ROOT'])
+    rows = []
+    for index in range(5000):
+        name = f'job{index:05d}.stl'
+        _file(root, 'Completed', name)
+        rows.append({'id': f'{index:05d}', 'display_name': name, 'status': 'COMPLETED',
+                     'file_path': str(root / 'Completed' / name)})
+    db.session.execute(Job.__table__.insert(), rows)
+    db.session.commit()
+
+    started = time.perf_counter()
+    report = reconcile_storage(batch_size=500)
+
+    assert report.files_scanned == 5000
+    assert report.jobs_checked == 5000
+    assert report.clean
+    assert time.perf_counter() - started < 5
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from app.extensions import db
+from app.models.job import Job
+from app.services import file_service
+from app.services import resumable_upload_service
+from app.services.resumable_upload_service import lock_upload, purge_expired_uploads
+
+SUBMISSION = {
+    'student_name': 'Jane Doe',
+    'student_email': 'jane@example.edu',
+    'discipline': 'art',
+    'class_number': 'ART 101',
+    'print_method': 'Filament',
+    'color': 'red',
+    'printer': 'prusa_mk4s',
+    'acknowledged_minimum_charge': 'yes',
+}
+
+
+@pytest.fixture
+def client(app, monkeypatch):
+    monkeypatch.setattr(file_service, '_get_next_id', lambda: 'A1')
+    return app.test_client()
+
+
+def _init(client, size, filename='model.3mf'):
+    response = client.post('/upload/init', json={'filename': filename, 'size': size})
+    assert response.status_code == 201
+    return response.get_json()['upload_id']
+
+
+def test_chunks_resume_from_reported_offset_and_finalize(app, client):
+    payload = os.urandom(200 * 1024)
+    upload_id = _init(client, len(payload))
+
+    client.put(f'/upload/{upload_id}?offset=0', data=payload[:70000])
+    status = client.get(f'/upload/{upload_id}').get_json()
+    assert status['offset'] == 70000
+    assert not status['complete']
+
+    # A retried chunk at a stale offset is refused with the offset to resume from
+    stale = client.put(f'/upload/{upload_id}?offset=0', data=payload[:70000])
+    assert stale.status_code == 409
+    assert stale.get_json()['offset'] == 70000
+
+    done = client.put(f'/upload/{upload_id}', data=payload[70000:], headers={'Upload-Offset': '70000'})
+    assert done.get_json()['complete']
+
+    response = client.post(f'/upload/{upload_id}/finalize', json=SUBMISSION)
+    data = response.get_json()
+    assert data['success']
+
+    job = db.session.get(Job, data['job_id'])
+    assert job.original_filename == 'model.3mf'
+    with open(job.file_path, 'rb') as f:
+        assert hashlib.sha256(f.read()).hexdigest() == hashlib.sha256(payload).hexdigest()
+    assert client.get(f'/upload/{upload_id}').status_code == 404
+
+
+def test_finalize_requires_all_bytes(client):
+    upload_id = _init(client, 100)
+    client.put(f'/upload/{upload_id}?offset=0', data=b'x' * 40)
+
+    response = client.post(f'/upload/{upload_id}/finalize', json=SUBMISSION)
+
+    assert response.status_code == 409
+    assert response.get_json()['offset'] == 40
+
+
+def test_finalize_validates_submission_fields(client):
+    upload_id = _init(client, 10)
+    client.put(f'/upload/{upload_id}?offset=0', data=b'x' * 10)
+
+    response = client.post(f'/upload/{upload_id}/finalize', json={**SUBMISSION, 'student_email': 'nope'})
+
+    assert response.status_code == 400
+    assert 'student_email' in response.get_json()['errors']
+    assert client.get(f'/upload/{upload_id}').get_json()['complete']
+
+
+def test_chunk_past_declared_size_is_dropped(client):
+    upload_id = _init(client, 100)
+    client.put(f'/upload/{upload_id}?offset=0', data=b'x' * 60)
+
+    response = client.put(f'/upload/{upload_id}?offset=60', data=b'x' * 60)
+
+    assert response.status_code == 413
+    assert client.get(f'/upload/{upload_id}').get_json()['offset'] == 60
+
+
+def test_init_rejects_bad_type_and_oversize(app, client):
+    assert client.post('/upload/init', json={'filename': 'virus.exe', 'size': 10}).status_code == 400
+    too_big = app.config['MAX_UPLOAD_FILE_BYTES'] + 1
+    assert client.post('/upload/init', json={'filename': 'a.stl', 'size': too_big}).status_code == 413
+
+
+def test_unknown_or_malformed_ids_are_not_found(client):
+    assert client.get('/upload/' + 'a' * 32).status_code == 404
+    assert client.put('/upload/..%2F..?offset=0', data=b'x').status_code == 404
+
+
+def test_expired_uploads_are_purged(app, client):
+    upload_id = _init(client, 10)
+    with app.test_request_context():
+        assert purge_expired_uploads(now=time.time() + 25 * 3600) == 1
+    assert client.get(f'/upload/{upload_id}').status_code == 404
+
+
+def test_uploads_still_receiving_chunks_are_kept(app, client):
+    upload_id = _init(client, 10)
+    with app.test_request_context():
+        directory = resumable_upload_service._upload_dir(upload_id)
+    started_long_ago = time.time() - 48 * 3600
+    with open(os.path.join(directory, 'upload.json')) as f:
+        state = json.load(f)
+    state['created_at'] = started_long_ago
+    with open(os.path.join(directory, 'upload.json'), 'w') as f:
+        json.dump(state, f)
+    os.utime(os.path.join(directory, 'data.part'), (started_long_ago, started_long_ago))
+    client.put(f'/upload/{upload_id}?offset=0', data=b'12345')  # A chunk arrives now
+
+    with app.test_request_context():
+        assert purge_expired_uploads(now=time.time() + 3600) == 0
+        assert purge_expired_uploads(now=time.time() + 25 * 3600) == 1
+
+
+def test_purge_skips_uploads_being_worked_on(app, client):
+    upload_id = _init(client, 10)
+    with app.test_request_context():
+        lock = lock_upload(upload_id)
+    held, release = threading.Event(), threading.Event()
+
+    def finalize_in_progress():
+        with lock:
+            held.set()
+            release.wait(5)
+    worker = threading.Thread(target=finalize_in_progress)
+    worker.start()
+    held.wait(5)
+    with app.test_request_context():
+        try:
+            assert purge_expired_uploads(now=time.time() + 25 * 3600) == 0
+        finally:
+            release.set()
+            worker.join(5)
+        assert purge_expired_uploads(now=time.time() + 25 * 3600) == 1
+        assert upload_id not in resumable_upload_service._upload_locks
+
+
+def test_repeated_finalize_creates_one_job(app, client):
+    payload = os.urandom(1024)
+    upload_id = _init(client, len(payload))
+    client.put(f'/upload/{upload_id}?offset=0', data=payload)
+
+    first = client.post(f'/upload/{upload_id}/finalize', json=SUBMISSION)
+    retry = client.post(f'/upload/{upload_id}/finalize', json=SUBMISSION)
+
+    assert first.status_code == 200
+    assert retry.status_code == 404
+    assert Job.query.count() == 1
@@ -0,0 +1,108 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from app.extensions import db
+from app.models.archived_job import ArchivedJob
+from app.models.event import Event
+from app.models.job import Job
+from app.services.retention_service import apply_retention, parse_retention_rules
+from app.services.watermark_service import get_watermark
+
+LONG_AGO = datetime(2020, 1, 1)
+
+
+def _stored(app, folder, name):
+    path = Path(app.config['APP_STORAGE_ROOT']) / folder / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('solid test')
+    return str(path)
+
+
+def test_rules_are_parsed_and_validated():
+    rules = parse_retention_rules(' REJECTED:purge_files:60, paidpickedup:archive_rows:365 ,')
+
+    assert [repr(rule) for rule in rules] == ['REJECTED:purge_files:60', 'PAIDPICKEDUP:archive_rows:365']
+    for bad in ('REJECTED:purge_files', 'REJECTED:shred:60', 'LOST:purge_files:60', 'REJECTED:purge_files:soon'):
+        with pytest.raises(ValueError):
+            parse_retention_rules(bad)
+
+
+def test_dry_run_reports_without_changing_anything(app, make_job):
+    old = make_job(status='REJECTED', updated_at=LONG_AGO, file_path=_stored(app, 'Uploaded', 'old.stl'))
+    make_job(status='REJECTED', file_path=_stored(app, 'Uploaded', 'new.stl'))
+
+    report = apply_retention(parse_retention_rules('REJECTED:purge_files:60'), dry_run=True)
+
+    summary = report['rules'][0]
+    assert summary['jobs'] == 1
+    assert summary['files'] == 1
+    assert summary['bytes'] == len('solid test')
+    assert summary['sample_job_ids'] == [old.id]
+    db.session.refresh(old)
+    assert Path(old.file_path).exists()
+
+
+def test_purge_files_keeps_the_rows(app, make_job):
+    jobs = [make_job(status='REJECTED', updated_at=LONG_AGO, file_path=_stored(app, 'Uploaded', f'r{index}.stl'))
+            for index in range(5)]
+    paths = [job.file_path for job in jobs]
+    recent = make_job(status='REJECTED', file_path=_stored(app, 'Uploaded', 'recent.stl'))
+
+    report = apply_retention(parse_retention_rules('REJECTED:purge_files:60'), batch_size=2)
+
+    assert report['rules'][0]['jobs'] == 5
+    assert report['rules'][0]['files'] == 5
+    assert not any(Path(path).exists() for path in paths)
+    for job in jobs:
+        db.session.refresh(job)
+        assert job.file_path is None
+        assert job.updated_at == LONG_AGO
+    assert Path(recent.file_path).exists()
+    # Already purged jobs are not picked up again
+    assert apply_retention(parse_retention_rules('REJECTED:purge_files:60'))['rules'][0]['jobs'] == 0
+
+
+def test_archive_rows_snapshots_jobs_and_events(app, make_job):
+    job = make_job(status='PAIDPICKEDUP', updated_at=LONG_AGO, display_name='done.stl', cost_usd=4.5,
+                   student_email='Student@Example.edu', file_path=_stored(app, 'PaidPickedUp', 'done.stl'))
+    db.session.add(Event(job_id=job.id, event_type='JobCreated', details={'source': 'test'}, triggered_by='student'))
+    db.session.commit()
+    keep_id = make_job(status='COMPLETED', updated_at=LONG_AGO).id
+    job_id, path = job.id, job.file_path
+    version = get_watermark()['version']
+    db.session.expunge_all()
+
+    report = apply_retention(parse_retention_rules('PAIDPICKEDUP:archive_rows:365'))
+
+    assert report['rules'][0]['jobs'] == 1
+    assert db.session.get(Job, job_id) is None
+    assert Event.query.filter_by(job_id=job_id).count() == 0
+    assert db.session.get(Job, keep_id) is not None
+    assert not Path(path).exists()
+    assert get_watermark()['version'] > version
+
+    archived = db.session.get(ArchivedJob, job_id)
+    assert archived.status == 'PAIDPICKEDUP'
+    assert archived.data['display_name'] == 'done.stl'
+    assert archived.data['cost_usd'] == '4.50'
+    assert archived.data['events'][0]['event_type'] == 'JobCreated'
+    assert archived.data['events'][0]['details'] == {'source': 'test'}
+
+
+def test_scheduled_runs_start_only_in_the_server_process(monkeypatch):
+    from app import create_app, start_background_services
+    from app.config import Config
+    from app.services.retention_service import retention_scheduler
+
+    monkeypatch.setattr(Config, 'RETENTION_RULES', 'REJECTED:purge_files:60')
+    app = create_app()  # As CLI scripts and task workers do
+    assert retention_scheduler._thread is None or not retention_scheduler._thread.is_alive()
+
+    start_background_services(app)
+    try:
+        assert retention_scheduler._thread.is_alive()
+    finally:
+        retention_scheduler.stop()
+        retention_scheduler._thread.join(5)
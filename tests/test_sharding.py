@@ -0,0 +1,131 @@
+import hashlib
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from app.extensions import db
+from app.models.job import Job
+from app.services import file_mover as file_mover_module
+from app.services import file_service
+from app.services.file_mover import file_mover, queue_file_move, resolve_file_path
+from app.services.file_service import get_shard_directory, remove_empty_directories
+from app.services.reconciliation_service import reconcile_storage
+
+
+def _file(root, *parts):
+    path = Path(root).joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('solid test')
+    return str(path)
+
+
+def test_shard_directories_per_layout():
+    submitted = datetime(2026, 3, 9)
+    prefix = hashlib.sha1(b'cube.stl').hexdigest()[:2]
+
+    assert get_shard_directory('Pending', 'cube.stl', submitted, 'flat') == 'Pending'
+    assert get_shard_directory('Pending', 'cube.stl', submitted, 'hash') == os.path.join('Pending', prefix)
+    assert get_shard_directory('Pending', 'cube.stl', submitted, 'date') == os.path.join('Pending', '2026', '03')
+    with pytest.raises(ValueError):
+        get_shard_directory('Pending', 'cube.stl', submitted, 'bogus')
+
+
+def test_uploads_land_in_their_shard(app, monkeypatch):
+    app.config['STORAGE_LAYOUT'] = 'hash'
+    monkeypatch.setattr(file_service, '_get_next_id', lambda: 'A1')
+    client = app.test_client()
+    upload_id = client.post('/upload/init', json={'filename': 'cube.stl', 'size': 10}).get_json()['upload_id']
+    client.put(f'/upload/{upload_id}?offset=0', data=b'solid cube')
+    client.post(f'/upload/{upload_id}/finalize', json={
+        'student_name': 'Jane Doe',
+        'student_email': 'jane@example.edu',
+        'discipline': 'art',
+        'class_number': 'ART 101',
+        'print_method': 'Filament',
+        'color': 'red',
+        'printer': 'prusa_mk4s',
+        'acknowledged_minimum_charge': 'yes',
+    })
+
+    job = Job.query.one()
+    expected = get_shard_directory(app.config['UPLOAD_FOLDER'], job.display_name)
+    assert Path(job.file_path).parent == Path(expected)
+    assert Path(job.file_path).exists()
+
+
+def test_status_moves_keep_the_file_in_its_shard(app, make_job):
+    app.config['STORAGE_LAYOUT'] = 'date'
+    root = app.config['APP_STORAGE_ROOT']
+    job = make_job(display_name='cube.stl', created_at=datetime(2025, 11, 2),
+                   file_path=_file(root, 'Uploaded', '2025', '11', 'cube.stl'))
+
+    job.status = 'PENDING'
+    queue_file_move(job)
+    db.session.commit()
+
+    db.session.refresh(job)
+    assert Path(job.file_path) == Path(root, 'Pending', '2025', '11', 'cube.stl')
+    assert Path(job.file_path).exists()
+    assert resolve_file_path(job) == job.file_path
+    assert reconcile_storage().clean
+
+
+def test_settle_all_reshards_an_existing_tree(app, make_job):
+    root = app.config['APP_STORAGE_ROOT']
+    jobs = [
+        make_job(display_name=f'part{index}.stl', status='COMPLETED',
+                 file_path=_file(root, 'Completed', f'part{index}.stl'),
+                 metadata_path=_file(root, 'Completed', f'part{index}.metadata.json'))
+        for index in range(6)
+    ]
+    app.config['STORAGE_LAYOUT'] = 'hash'
+    assert reconcile_storage().counts['status_mismatch'] == 6
+
+    summary = file_mover.settle_all(workers=3, batch_size=4)
+
+    assert summary == {'checked': 6, 'moved': 6, 'errors': []}
+    for job in jobs:
+        db.session.refresh(job)
+        shard = get_shard_directory(os.path.join(root, 'Completed'), job.display_name)
+        assert Path(job.file_path).parent == Path(shard)
+        assert Path(job.metadata_path).parent == Path(shard)
+    assert reconcile_storage().clean
+    assert file_mover.settle_all() == {'checked': 6, 'moved': 0, 'errors': []}
+
+
+def test_settle_rereads_the_job_when_another_process_moved_it(app, make_job, monkeypatch):
+    app.config['STORAGE_LAYOUT'] = 'hash'
+    root = app.config['APP_STORAGE_ROOT']
+    job = make_job(display_name='raced.stl', status='PENDING', file_path=_file(root, 'Pending', 'raced.stl'))
+    shard = get_shard_directory(os.path.join(root, 'Pending'), 'raced.stl')
+    real_begin_move = file_mover_module.begin_move
+    calls = []
+
+    def racing_begin_move(job_id, current_path, *args, **kwargs):
+        if not calls:
+            # Another process settles the job between our read and our rename
+            calls.append(current_path)
+            os.makedirs(shard, exist_ok=True)
+            os.rename(current_path, os.path.join(shard, 'raced.stl'))
+            db.session.execute(db.update(Job).where(Job.id == job_id).values(file_path=os.path.join(shard, 'raced.stl')))
+            db.session.commit()
+        return real_begin_move(job_id, current_path, *args, **kwargs)
+    monkeypatch.setattr(file_mover_module, 'begin_move', racing_begin_move)
+
+    assert file_mover.settle(job.id) is None
+    db.session.refresh(job)
+    assert Path(job.file_path) == Path(shard, 'raced.stl')
+    assert Path(job.file_path).exists()
+
+
+def test_empty_shards_are_removed_but_not_the_folder(tmp_path):
+    folder = tmp_path / 'Completed'
+    (folder / 'ab').mkdir(parents=True)
+    (folder / '2025' / '11').mkdir(parents=True)
+    _file(folder, 'cd', 'kept.stl')
+    (folder / '.journal').mkdir()
+
+    assert remove_empty_directories(str(folder), min_age_seconds=0) == 3
+    assert sorted(os.listdir(folder)) == ['.journal', 'cd']
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.services.stats_service import get_dashboard_stats, normalize_status
+
+
+def test_stats_counts_every_status_in_one_query(app, make_job):
+    make_job(status='UPLOADED')
+    make_job(status='UPLOADED', staff_viewed_at=datetime.utcnow())
+    make_job(status='PENDING')
+    make_job(status='REJECTED', staff_viewed_at=datetime.utcnow())
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', count_statement)
+    try:
+        stats = get_dashboard_stats()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+    assert len(statements) == 1, statements
+    assert stats['uploaded'] == 2
+    assert stats['pending'] == 1
+    assert stats['rejected'] == 1
+    assert stats['ready'] == 0
+    assert stats['unreviewed'] == 1
+    assert stats['total'] == 4
+
+
+def test_stats_empty_database(app):
+    stats = get_dashboard_stats()
+    assert stats['uploaded'] == 0
+    assert stats['total'] == 0
+
+
+def test_normalize_status():
+    assert normalize_status('pending') == 'PENDING'
+    assert normalize_status('bogus') == 'UPLOADED'
+    assert normalize_status(None) == 'UPLOADED'
+
+
+def test_api_stats_uses_aggregated_counts(staff_client, make_job):
+    make_job(status='UPLOADED')
+    make_job(status='PRINTING')
+
+    data = staff_client.get('/dashboard/api/stats?status=printing').get_json()
+
+    assert data['success'] is True
+    assert data['current_status'] == 'PRINTING'
+    assert data['stats']['uploaded'] == 1
+    assert data['stats']['printing'] == 1
+    assert len(data['jobs']) == 1
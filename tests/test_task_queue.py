@@ -0,0 +1,159 @@
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from app.extensions import db
+from app.models.job import Job
+from app.models.task import DeadLetterTask, QueuedTask
+from app.services.file_mover import queue_file_move
+from app.tasks import enqueue, task
+from app.tasks.queue import (
+    claim_tasks,
+    fail_task,
+    get_queue_stats,
+    recover_stale_tasks,
+    requeue_dead_letters,
+    retry_delay,
+)
+from app.tasks.worker import Worker
+
+calls = []
+
+
+@task(name='tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task(name='tests.explode', max_attempts=2)
+def explode():
+    raise RuntimeError('boom')
+
+
+@pytest.fixture
+def database_queue(app):
+    app.config['TASK_QUEUE_BACKEND'] = 'database'
+    app.config['TASK_RETRY_BASE_SECONDS'] = 0
+    calls.clear()
+    return app
+
+
+def test_inline_backend_runs_tasks_immediately(app):
+    calls.clear()
+
+    assert enqueue('tests.record', {'value': 1}) is None
+    assert calls == [1]
+
+
+def test_tasks_are_claimed_by_priority_then_age(database_queue):
+    low = enqueue('tests.record', {'value': 'low'}, priority=-10)
+    first = enqueue('tests.record', {'value': 'first'})
+    high = enqueue('tests.record', {'value': 'high'}, priority=10)
+    second = enqueue('tests.record', {'value': 'second'})
+    enqueue('tests.record', {'value': 'later'}, countdown=60)
+
+    claimed = claim_tasks('w1', limit=3)
+
+    assert [row.id for row in claimed] == [high, first, second]
+    assert all(row.attempts == 1 and row.locked_by == 'w1' for row in claimed)
+    assert [row.id for row in claim_tasks('w2', limit=5)] == [low]
+    assert claim_tasks('w3') == []
+
+
+def test_dedupe_key_collapses_queued_duplicates(database_queue):
+    first = enqueue('tests.record', {'value': 1}, dedupe_key='same')
+
+    assert enqueue('tests.record', {'value': 2}, dedupe_key='same') == first
+    assert QueuedTask.query.count() == 1
+
+
+def test_worker_runs_and_removes_tasks(database_queue):
+    for value in range(5):
+        enqueue('tests.record', {'value': value})
+
+    worker = Worker(database_queue, concurrency=1, poll_interval=0)
+    worker.run(drain=True)
+
+    assert sorted(calls) == [0, 1, 2, 3, 4]
+    assert worker.succeeded == 5
+    assert get_queue_stats() == {'queued': 0, 'running': 0, 'dead_letter': 0}
+
+
+def test_failures_back_off_then_dead_letter(database_queue):
+    database_queue.config['TASK_RETRY_BASE_SECONDS'] = 30
+    task_id = enqueue('tests.explode', max_attempts=2)
+    worker = Worker(database_queue, concurrency=1, poll_interval=0)
+
+    assert worker.process_next()
+    retry = db.session.get(QueuedTask, task_id)
+    assert retry.status == 'queued'
+    assert 'boom' in retry.last_error
+    assert retry.run_at > datetime.utcnow() + timedelta(seconds=25)
+    assert not worker.process_next()  # Not runnable until the backoff passes
+
+    (claimed,) = claim_tasks('w1', now=retry.run_at)
+    assert not fail_task(claimed, 'w1', 'boom again')
+    dead = DeadLetterTask.query.one()
+    assert (dead.task_id, dead.name, dead.attempts, dead.last_error) == (task_id, 'tests.explode', 2, 'boom again')
+    assert QueuedTask.query.count() == 0
+
+    assert requeue_dead_letters() == 1
+    assert get_queue_stats() == {'queued': 1, 'running': 0, 'dead_letter': 0}
+
+
+def test_unknown_tasks_are_dead_lettered_at_once(database_queue):
+    enqueue('tests.missing')
+
+    Worker(database_queue, concurrency=1, poll_interval=0).process_next()
+
+    assert "No task registered as 'tests.missing'" in DeadLetterTask.query.one().last_error
+
+
+def test_backoff_doubles_up_to_the_cap(app):
+    delays = [retry_delay(attempts, base_seconds=10, max_seconds=60) for attempts in (1, 2, 3, 4, 5)]
+
+    for delay, expected in zip(delays, [10, 20, 40, 60, 60]):
+        assert expected * 0.9 <= delay <= expected
+
+
+def test_tasks_of_lost_workers_are_requeued(database_queue):
+    task_id = enqueue('tests.record', {'value': 1})
+    claim_tasks('dead-worker')
+
+    assert recover_stale_tasks(timeout_seconds=60) == 0
+    assert recover_stale_tasks(timeout_seconds=60, now=datetime.utcnow() + timedelta(minutes=5)) == 1
+    row = db.session.get(QueuedTask, task_id)
+    assert (row.status, row.locked_by) == ('queued', None)
+
+
+def test_status_moves_go_through_the_queue(database_queue, make_job):
+    path = Path(database_queue.config['UPLOAD_FOLDER']) / 'queued.stl'
+    path.write_text('solid test')
+    job = make_job(file_path=str(path))
+
+    job.status = 'PENDING'
+    queue_file_move(job)
+    db.session.commit()
+
+    assert path.exists()  # Nothing moves until a worker runs the task
+    assert QueuedTask.query.filter_by(name='storage.settle_job_file').count() == 1
+    Worker(database_queue, concurrency=1, poll_interval=0).run(drain=True)
+    assert Path(db.session.get(Job, job.id).file_path).parent.name == 'Pending'
+
+
+def test_workers_leave_other_processes_moves_alone(database_queue, make_job):
+    from app.services.move_journal import begin_move, get_journal_dir
+
+    path = Path(database_queue.config['UPLOAD_FOLDER']) / 'live.stl'
+    path.write_text('solid test')
+    job = make_job(file_path=str(path))
+    move = begin_move(job.id, str(path), 'Uploaded', 'Pending')  # The server's move, not yet committed
+    enqueue('tests.record', {'value': 1})
+
+    Worker(database_queue, concurrency=1, poll_interval=0).run(drain=True)
+
+    assert calls == [1]
+    assert len(os.listdir(get_journal_dir(database_queue.config['APP_STORAGE_ROOT']))) == 1
+    assert Path(move.new_path).exists()
@@ -0,0 +1,79 @@
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from app.services.mesh_service import load_triangles
+from app.services.thumbnail_service import encode_png, get_thumbnail_path, render_triangles, thumbnail_worker
+
+CUBE_STL = os.path.join(os.path.dirname(__file__), 'test_cube.stl')
+CONTENT_HASH = 'ab' * 32
+
+
+def _decode_png(data):
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    width, height = struct.unpack('>II', data[16:24])
+    idat_length = struct.unpack('>I', data[33:37])[0]
+    raw = zlib.decompress(data[41:41 + idat_length])
+    rows = np.frombuffer(raw, dtype=np.uint8).reshape(height, 1 + width * 4)
+    return rows[:, 1:].reshape(height, width, 4)
+
+
+def test_render_cube_is_opaque_in_the_middle_and_clear_at_the_corners():
+    image = render_triangles(load_triangles(CUBE_STL), size=64)
+    decoded = _decode_png(encode_png(image))
+
+    assert decoded.shape == (64, 64, 4)
+    assert np.array_equal(decoded, image)
+    assert decoded[32, 32, 3] == 255
+    assert decoded[0, 0, 3] == 0
+    # Three visible faces get three different shades
+    assert len({tuple(pixel) for pixel in decoded[decoded[..., 3] == 255][:, :3]}) >= 3
+
+
+def test_worker_renders_in_a_process_pool_and_caches_by_hash(app):
+    app.config['THUMBNAIL_WORKERS'] = 1
+    try:
+        future = thumbnail_worker.submit(CUBE_STL, CONTENT_HASH)
+        output_path = future.result(timeout=120)
+    finally:
+        thumbnail_worker.shutdown()
+
+    assert output_path == get_thumbnail_path(CONTENT_HASH, app.config['APP_STORAGE_ROOT'])
+    with open(output_path, 'rb') as f:
+        assert _decode_png(f.read())[..., 3].any()
+    assert thumbnail_worker.submit(CUBE_STL, CONTENT_HASH) is None
+
+
+def test_rendering_can_be_disabled(app):
+    app.config['THUMBNAIL_WORKERS'] = 0
+    assert thumbnail_worker.submit(CUBE_STL, CONTENT_HASH) is None
+
+
+def test_thumbnails_are_served_with_long_lived_cache_headers(app, staff_client):
+    url = f'/dashboard/thumbnails/{CONTENT_HASH}.png'
+    missing = staff_client.get(url)
+    assert missing.status_code == 404
+    assert missing.headers['Cache-Control'] == 'no-store'
+
+    output_path = get_thumbnail_path(CONTENT_HASH, app.config['APP_STORAGE_ROOT'])
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'wb') as f:
+        f.write(encode_png(np.zeros((4, 4, 4), dtype=np.uint8)))
+
+    response = staff_client.get(url)
+    assert response.status_code == 200
+    assert response.mimetype == 'image/png'
+    assert 'immutable' in response.headers['Cache-Control']
+    assert 'max-age=31536000' in response.headers['Cache-Control']
+
+
+def test_thumbnail_names_must_be_content_hashes(staff_client):
+    assert staff_client.get('/dashboard/thumbnails/..%2Fsecret.png').status_code == 404
+
+
+def test_listing_links_thumbnails(staff_client, make_job):
+    make_job(status='UPLOADED', content_hash=CONTENT_HASH)
+    job = staff_client.get('/dashboard/api/stats').get_json()['jobs'][0]
+    assert job['thumbnail_url'] == f'/dashboard/thumbnails/{CONTENT_HASH}.png'
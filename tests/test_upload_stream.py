@@ -0,0 +1,80 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+from app.services import file_service
+from app.services.upload_service import HashingFileWriter, UploadTooLarge, get_staging_dir, stream_to_file
+
+FORM = {
+    'studentName': 'Jane Doe',
+    'studentEmail': 'jane@example.edu',
+    'printMethod': 'filament',
+    'colorPreference': 'red',
+}
+
+
+def _multipart(app, payload, filename='part.stl'):
+    return app.test_request_context(
+        '/submit', method='POST',
+        data={'file': (io.BytesIO(payload), filename)},
+        content_type='multipart/form-data'
+    )
+
+
+def test_multipart_file_streams_into_staging_with_hash(app):
+    payload = os.urandom(300 * 1024)
+    with _multipart(app, payload):
+        from flask import request
+        stream = request.files['file'].stream
+
+        assert isinstance(stream, HashingFileWriter)
+        assert os.path.dirname(stream.path) == get_staging_dir()
+        assert stream.size == len(payload)
+        assert stream.sha256 == hashlib.sha256(payload).hexdigest()
+
+
+def test_uncommitted_upload_is_removed_when_request_closes(app):
+    with _multipart(app, b'solid cube'):
+        from flask import request
+        staged_path = request.files['file'].stream.path
+        assert os.path.exists(staged_path)
+    assert not os.path.exists(staged_path)
+
+
+def test_oversized_file_is_rejected_mid_stream(app):
+    app.config['MAX_UPLOAD_FILE_BYTES'] = 100 * 1024
+    with _multipart(app, os.urandom(200 * 1024)):
+        from flask import request
+        with pytest.raises(UploadTooLarge):
+            request.files['file']
+    assert os.listdir(get_staging_dir()) == []
+
+
+def test_save_uploaded_file_commits_staged_file(app, monkeypatch):
+    monkeypatch.setattr(file_service, '_get_next_id', lambda: 'A1')
+    app.config['METADATA_EXPORT'] = 'sidecar'
+    payload = b'solid cube\nendsolid cube\n'
+    with _multipart(app, payload):
+        from flask import request
+        display_name, path, metadata_path, content_hash = file_service.save_uploaded_file(request.files['file'], FORM)
+
+    with open(path, 'rb') as f:
+        assert f.read() == payload
+    assert os.path.dirname(path) == app.config['UPLOAD_FOLDER']
+    assert os.listdir(get_staging_dir(app.config['APP_STORAGE_ROOT'])) == []
+    with open(metadata_path) as f:
+        metadata = f.read()
+    assert hashlib.sha256(payload).hexdigest() in metadata
+
+
+def test_stream_to_file_enforces_limit(tmp_path):
+    target = tmp_path / 'model.stl'
+    with pytest.raises(UploadTooLarge):
+        stream_to_file(io.BytesIO(b'x' * 1000), str(target), max_bytes=999, chunk_size=100)
+    assert list(tmp_path.iterdir()) == []
+
+    sha256, size = stream_to_file(io.BytesIO(b'x' * 999), str(target), max_bytes=999, chunk_size=100)
+    assert size == 999
+    assert sha256 == hashlib.sha256(b'x' * 999).hexdigest()
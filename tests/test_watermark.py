@@ -0,0 +1,51 @@
+from app.extensions import db
+from app.models.job import Job
+from app.services.watermark_service import get_watermark
+
+
+def test_job_writes_bump_version(app, make_job):
+    job = make_job(status='UPLOADED')
+    created = get_watermark()
+
+    job.notes = 'edited'
+    db.session.commit()
+    edited = get_watermark()
+
+    assert edited['version'] == created['version'] + 1
+    assert edited['jobs_created'] == created['jobs_created']
+
+
+def test_jobs_created_counts_inserts_only(app, make_job):
+    make_job(status='UPLOADED')
+    make_job(status='PENDING')
+    assert get_watermark()['jobs_created'] == 2
+
+
+def test_rolled_back_write_does_not_bump(app, make_job):
+    job = make_job(status='UPLOADED')
+    before = get_watermark()
+
+    job.status = 'PENDING'
+    db.session.flush()
+    db.session.rollback()
+
+    assert get_watermark() == before
+    assert db.session.get(Job, job.id).status == 'UPLOADED'
+
+
+def test_stats_response_carries_watermark(staff_client, make_job):
+    make_job(status='UPLOADED')
+    response = staff_client.get('/dashboard/api/stats')
+    data = response.get_json()
+
+    assert data['watermark']['jobs_created'] == 1
+    assert response.headers['X-Dashboard-Watermark'] == str(data['watermark']['version'])
+
+
+def test_etag_changes_with_watermark(staff_client, make_job):
+    job = make_job(status='UPLOADED')
+    first = staff_client.get('/dashboard/api/stats').headers['ETag']
+
+    staff_client.post(f'/dashboard/api/mark-reviewed/{job.id}')
+
+    assert staff_client.get('/dashboard/api/stats').headers['ETag'] != first